@@ -1,2 +1,12 @@
-from .client import AsyncHTTPClient
-from .rate_limiter import RateLimiter
+from typing import TYPE_CHECKING
+
+from osdatahub._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "AsyncHTTPClient": ".client",
+    "RateLimiter": ".rate_limiter",
+})
+
+if TYPE_CHECKING:
+    from .client import AsyncHTTPClient
+    from .rate_limiter import RateLimiter
@@ -5,10 +5,15 @@ from typing import Any, Dict, Optional
 import aiohttp
 
 from osdatahub.AsyncAPI.rate_limiter import RateLimiter
+from osdatahub.config import get_config
 
 _USER_AGENT_TAG = "osdatahub-python-async"
 
 
+def _or_default(value: Any, default: Any) -> Any:
+    return default if value is None else value
+
+
 class AsyncHTTPClient:
     """
     Reusable async HTTP client with connection pooling, rate limiting, and retry logic.
@@ -20,15 +25,18 @@ class AsyncHTTPClient:
     - Content-length validation
     - Proxy support
 
+    Settings that aren't given are read from the ClientConfig in use when the client is created (see
+    osdatahub.config).
+
     Args:
-        max_concurrent: Maximum concurrent requests (default: 5)
-        request_delay: Delay between requests in seconds (default: 0.1)
-        max_retries: Maximum retry attempts on failure (default: 3)
-        connector_limit: Total connection pool limit (default: 10)
-        connector_limit_per_host: Per-host connection limit (default: 5)
-        timeout: Request timeout in seconds (default: 30)
+        max_concurrent: Maximum concurrent requests (default: async_max_concurrent, 5)
+        request_delay: Delay between requests in seconds (default: async_request_delay, 0.1)
+        max_retries: Maximum retry attempts on failure (default: async_max_retries, 3)
+        connector_limit: Total connection pool limit (default: async_connector_limit, 30)
+        connector_limit_per_host: Per-host connection limit (default: async_connector_limit_per_host, 5)
+        timeout: Request timeout in seconds (default: async_timeout, 30)
         proxies: Proxy configuration dict (e.g., {"http": "...", "https": "..."})
-            Uses the "https" value for HTTPS requests, "http" for HTTP.
+            Uses the "https" value for HTTPS requests, "http" for HTTP. (default: proxies)
 
     Example::
 
@@ -38,21 +46,22 @@ class AsyncHTTPClient:
 
     def __init__(
         self,
-        max_concurrent: int = 5,
-        request_delay: float = 0.1,
-        max_retries: int = 3,
-        connector_limit: int = 30,
-        connector_limit_per_host: int = 5,
-        timeout: float = 30.0,
+        max_concurrent: Optional[int] = None,
+        request_delay: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        connector_limit: Optional[int] = None,
+        connector_limit_per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
         proxies: Optional[Dict[str, str]] = None,
     ) -> None:
-        self._max_concurrent = max_concurrent
-        self._request_delay = request_delay
-        self._max_retries = max_retries
-        self._connector_limit = connector_limit
-        self._connector_limit_per_host = connector_limit_per_host
-        self._timeout = timeout
-        self._proxies = proxies or {}
+        config = get_config()
+        self._max_concurrent = _or_default(max_concurrent, config.async_max_concurrent)
+        self._request_delay = _or_default(request_delay, config.async_request_delay)
+        self._max_retries = _or_default(max_retries, config.async_max_retries)
+        self._connector_limit = _or_default(connector_limit, config.async_connector_limit)
+        self._connector_limit_per_host = _or_default(connector_limit_per_host, config.async_connector_limit_per_host)
+        self._timeout = _or_default(timeout, config.async_timeout)
+        self._proxies = dict(_or_default(proxies, config.proxies))
 
         self._session: Optional[aiohttp.ClientSession] = None
         self._rate_limiter: Optional[RateLimiter] = None
@@ -1,2 +1,16 @@
-from .data_package import DataPackageDownload
-from .opendata import OpenDataDownload
+from typing import TYPE_CHECKING
+
+from osdatahub._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "DataPackageDownload": ".data_package",
+    "ContentStore": ".mirror",
+    "OpenDataDownload": ".opendata",
+    "DownloadTelemetry": ".telemetry",
+})
+
+if TYPE_CHECKING:
+    from .data_package import DataPackageDownload
+    from .mirror import ContentStore
+    from .opendata import OpenDataDownload
+    from .telemetry import DownloadTelemetry
@@ -0,0 +1,257 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import List, Optional, Tuple
+
+import aiohttp
+from tqdm import tqdm
+
+from osdatahub.config import get_config
+from osdatahub.DownloadsAPI.downloads_api import (_PART_SUFFIX, _DownloadObj, _hash_file, _Manifest,
+                                                  _parse_content_range, _Progress, _read_part_state, _remove_part,
+                                                  _retry_after, _write_part_state, remove_key)
+from osdatahub.DownloadsAPI.scheduler import get_scheduler
+from osdatahub.DownloadsAPI.telemetry import DownloadTelemetry
+
+_USER_AGENT_TAG = "osdatahub-python-async"
+
+
+class AsyncDownloadEngine:
+    """
+    Downloads many files concurrently on a single asyncio event loop, sharing one pooled aiohttp connector, instead
+    of using an OS thread per file.
+
+    Downloaded chunks are passed to a small pool of writer threads through a bounded queue per file, so a slow disk
+    holds back the network reads instead of chunks building up in memory, and the event loop never blocks on disk.
+    Files are written to ".part" files, resumed, checksummed and recorded in the output directory's manifest the same
+    way as the synchronous downloads.
+
+    Connections and bandwidth are taken from the process-wide DownloadScheduler, the same as the synchronous
+    downloads, so the scheduler's max_connections and max_bandwidth cover both, and a 429 response pauses both.
+
+    Args:
+        max_connections: Maximum number of files downloading at once, which is also capped by the scheduler's
+            max_connections (default: 50)
+        write_workers: Number of threads writing chunks to disk (default: 4)
+        buffer_chunks: Maximum number of chunks of each file waiting to be written (default: 4)
+        chunk_size: Size in bytes of the chunks read from the network (default: 65536)
+        max_retries: Maximum attempts for each file (default: 3)
+        read_timeout: Seconds to wait for a connection, or for data, before retrying a file (default: async_timeout
+            of the ClientConfig, 30)
+
+    Example::
+
+        from osdatahub import OpenDataDownload
+        import asyncio
+
+        product = OpenDataDownload("OpenZoomstack")
+        paths = asyncio.run(product.download_async("zoomstack", download_multiple=True, max_connections=100))
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 50,
+        write_workers: int = 4,
+        buffer_chunks: int = 4,
+        chunk_size: int = 65536,
+        max_retries: int = 3,
+        read_timeout: Optional[float] = None,
+    ) -> None:
+        config = get_config()
+        self._max_connections = max_connections
+        self._write_workers = write_workers
+        self._buffer_chunks = buffer_chunks
+        self._chunk_size = chunk_size
+        self._max_retries = max_retries
+        self._read_timeout = config.async_timeout if read_timeout is None else read_timeout
+        self._proxies = config.proxies
+
+    async def download(
+        self,
+        download_list: List[_DownloadObj],
+        output_dir: str,
+        overwrite: bool = False,
+        telemetry: Optional[DownloadTelemetry] = None,
+    ) -> Tuple[List[str], List[_DownloadObj]]:
+        """
+        Downloads files to a directory
+
+        Args:
+            download_list: The files to download
+            output_dir: Directory to save the files in
+            overwrite: Whether to overwrite existing files (default: False)
+            telemetry: Records the throughput, time to first byte, retries and 429 responses of each file
+
+        Returns:
+            The paths of the files that were downloaded, and the files that couldn't be
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        semaphore = asyncio.Semaphore(self._max_connections)
+        connector = aiohttp.TCPConnector(limit=self._max_connections, ttl_dns_cache=300)
+        # large files take longer than any total timeout, so only connecting and each read are limited
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self._read_timeout, sock_read=self._read_timeout)
+        pbar = tqdm(total=sum(d.size for d in download_list), unit="B", unit_scale=True, leave=True,
+                    desc=f"Downloading {len(download_list)} files from osdatahub")
+
+        with ThreadPoolExecutor(max_workers=self._write_workers) as writers, _Manifest.of(output_dir).batch():
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                             headers={"User-Agent": _USER_AGENT_TAG}) as session:
+                results = await asyncio.gather(
+                    *(self._download_file(session, semaphore, writers, d, output_dir, overwrite, pbar, telemetry)
+                      for d in download_list),
+                    return_exceptions=True,
+                )
+        pbar.close()
+
+        paths, missing_files = [], []
+        for d, result in zip(download_list, results):
+            if isinstance(result, BaseException):
+                logging.error(f"Failed to download {d.file_name}: {result}")
+                missing_files.append(d)
+            else:
+                paths.append(result)
+        return paths, missing_files
+
+    async def _download_file(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        writers: ThreadPoolExecutor,
+        d: _DownloadObj,
+        output_dir: str,
+        overwrite: bool,
+        pbar: tqdm,
+        telemetry: Optional[DownloadTelemetry],
+    ) -> str:
+        output_path = os.path.join(output_dir, d.file_name)
+        if d._skip(output_path, overwrite):
+            return output_path
+
+        progress = _Progress(d.file_name, d.size, pbar, telemetry, d.url)
+        async with semaphore:
+            for attempt in range(self._max_retries):
+                try:
+                    await self._fetch(session, writers, d, output_path, progress)
+                    progress.finish(output_path)
+                    return output_path
+                except aiohttp.ClientResponseError as e:
+                    if e.status == 429 and attempt < self._max_retries - 1:
+                        # slows down every download in the process, not just this one
+                        wait = _retry_after(e.headers)
+                        progress.throttled(wait)
+                        get_scheduler().pause(wait)
+                        continue
+                    progress.fail(e)
+                    raise
+                except (aiohttp.ClientError, asyncio.TimeoutError, IOError) as e:
+                    if attempt == self._max_retries - 1:
+                        progress.fail(e)
+                        raise
+                    progress.retry()
+                    logging.warning(f"Download of {d.file_name} failed ({e}). Resuming...")
+        return output_path
+
+    def _get_proxy(self, url: str) -> Optional[str]:
+        """Get the proxy of the ClientConfig the engine was created with for the given URL"""
+        return self._proxies.get("https" if url.startswith("https://") else "http")
+
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        writers: ThreadPoolExecutor,
+        d: _DownloadObj,
+        output_path: str,
+        progress: _Progress,
+    ) -> None:
+        """Downloads a file to its .part file, continuing from the end of it if possible, then completes it"""
+        loop = asyncio.get_running_loop()
+        part_path = output_path + _PART_SUFFIX
+        state = _read_part_state(part_path)
+        resumable = state is not None and "completed" not in state and os.path.isfile(part_path)
+        offset = os.path.getsize(part_path) if resumable else 0
+
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if state.get("etag"):
+                headers["If-Range"] = state["etag"]
+
+        scheduler = get_scheduler()
+        async with scheduler.async_connection():
+            requested = time.monotonic()
+            async with session.get(d.url, headers=headers, proxy=self._get_proxy(d.url)) as response:
+                progress.first_byte(time.monotonic() - requested)
+                if response.status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+                    _remove_part(part_path)
+                    raise IOError(f"the partial download of {d.file_name} is no longer valid")
+                response.raise_for_status()
+
+                if response.status == HTTPStatus.PARTIAL_CONTENT:
+                    start, expected_size = _parse_content_range(response.headers.get("Content-Range"))
+                    if start != offset or (state.get("size") and expected_size != state["size"]):
+                        _remove_part(part_path)
+                        raise IOError(f"the server returned an unexpected range for {d.file_name}")
+                    mode = "ab"
+                else:
+                    offset = 0
+                    expected_size = response.content_length
+                    if expected_size is None:
+                        expected_size = d.size or None
+                    _write_part_state(part_path, {"url": remove_key(d.url), "etag": response.headers.get("ETag"),
+                                                  "size": expected_size})
+                    mode = "wb"
+
+                hasher = hashlib.md5(usedforsecurity=False)
+                if offset:
+                    await loop.run_in_executor(writers, _hash_file, hasher, part_path, 0, offset)
+                progress.start(offset, expected_size)
+
+                current_size = offset
+                f = await loop.run_in_executor(writers, open, part_path, mode)
+                queue: asyncio.Queue = asyncio.Queue(maxsize=self._buffer_chunks)
+                writer = asyncio.create_task(self._write(queue, f, hasher, writers))
+                try:
+                    async for chunk in response.content.iter_chunked(self._chunk_size):
+                        await scheduler.async_throttle(len(chunk))
+                        # waits while the file's buffer is full
+                        await queue.put(chunk)
+                        current_size += len(chunk)
+                        progress.update(current_size)
+                finally:
+                    await queue.put(None)
+                    try:
+                        await writer
+                    finally:
+                        await loop.run_in_executor(writers, f.close)
+
+        if expected_size is not None and expected_size != current_size:
+            deficit = expected_size - current_size
+            raise IOError(f"incomplete read ({current_size} bytes read, {deficit} more expected)")
+        await loop.run_in_executor(writers, d._complete, part_path, output_path, hasher.hexdigest())
+
+    @staticmethod
+    async def _write(queue: asyncio.Queue, f, hasher, writers: ThreadPoolExecutor) -> None:
+        """Writes the chunks put on the queue, in order, until it receives None"""
+        loop = asyncio.get_running_loop()
+        error: Optional[Exception] = None
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                break
+            if error is None:
+                try:
+                    await loop.run_in_executor(writers, _write_chunk, f, hasher, chunk)
+                except Exception as e:
+                    # keeps emptying the queue so that the download doesn't wait on it forever
+                    error = e
+        if error is not None:
+            raise error
+
+
+def _write_chunk(f, hasher, chunk: bytes) -> None:
+    hasher.update(chunk)
+    f.write(chunk)
@@ -0,0 +1,155 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Union
+from urllib.parse import urlencode
+
+from osdatahub.cache import PersistentCache, default_cache_dir
+
+DEFAULT_TTLS = {
+    "products": 24 * 60 * 60,
+    "data_packages": 60 * 60,
+    "versions": 60 * 60,
+    "downloads": 60 * 60,
+}
+
+_MISSING = object()
+
+
+class CatalogueCache:
+    """
+    Caches the Downloads API catalogue (the lists of products and data packages, their details and versions, and the
+    files available to download) so that planning a download doesn't request them all again on every run.
+
+    Responses are kept in a SQLite database shared by every instance and process, for a time to live depending on
+    what they describe. Products rarely change, so are kept for a day by default, while data packages, their versions
+    and download listings are kept for an hour. API keys are hashed in the cache keys, so each key only sees its own
+    data packages, but cached listings can include download links containing the key, so the database is only made
+    readable by its owner.
+
+    Every download uses the process-wide catalogue returned by get_catalogue, which can be adjusted with
+    CatalogueCache.configure.
+
+    Args:
+        path (Union[str, Path], optional): Database file to keep the catalogue in. Defaults to "catalogue.sqlite" in
+            $OSDATAHUB_CACHE_DIR, or in ~/.cache/osdatahub if that isn't set
+        ttls (dict, optional): Seconds to keep each kind of response for ("products", "data_packages", "versions"
+            and "downloads"), overriding DEFAULT_TTLS. A ttl of 0 turns off caching of that kind. Defaults to None
+        enabled (bool, optional): Whether to cache responses at all. Defaults to True
+
+    Example::
+
+        from osdatahub.DownloadsAPI.catalogue import get_catalogue
+
+        get_catalogue().configure(ttls={"downloads": 10 * 60})
+        get_catalogue().clear()  # e.g. after ordering a new data package
+    """
+
+    def __init__(self,
+                 path: Union[str, Path, None] = None,
+                 ttls: Union[Dict[str, float], None] = None,
+                 enabled: bool = True):
+        self._lock = threading.Lock()
+        self._cache = None
+        self.path = None
+        self.ttls = dict(DEFAULT_TTLS)
+        self.enabled = True
+        self.configure(path, ttls, enabled)
+
+    def configure(self,
+                  path: Union[str, Path, None] = None,
+                  ttls: Union[Dict[str, float], None] = None,
+                  enabled: Union[bool, None] = None) -> None:
+        """
+        Changes the settings of the catalogue. Arguments left as None are unchanged
+
+        Args:
+            path (Union[str, Path], optional): Database file to keep the catalogue in
+            ttls (dict, optional): Seconds to keep each kind of response for. Kinds not given are unchanged
+            enabled (bool, optional): Whether to cache responses at all
+        """
+        if ttls is not None:
+            unknown = set(ttls) - set(DEFAULT_TTLS)
+            if unknown:
+                raise ValueError(f"ttls must only contain {list(DEFAULT_TTLS)}, got {sorted(unknown)}")
+        with self._lock:
+            if path is not None or self.path is None:
+                new_path = Path(path) if path is not None else default_cache_dir() / "catalogue.sqlite"
+                if new_path != self.path and self._cache is not None:
+                    self._cache.close()
+                    self._cache = None
+                self.path = new_path
+            if ttls is not None:
+                self.ttls.update(ttls)
+            if enabled is not None:
+                self.enabled = enabled
+
+    def fetch(self, kind: str, url: str, params: Union[dict, None], request: Callable[[], Any]) -> Any:
+        """
+        Returns the cached response to a request, or makes the request and caches its response
+
+        Args:
+            kind (str): What the response describes, which sets how long it is cached for
+            url (str): The endpoint requested
+            params (dict, optional): The query parameters of the request
+            request (Callable[[], Any]): Makes the request, returning its JSON serialisable response
+
+        Returns:
+            The response
+        """
+        ttl = self.ttls.get(kind, 0)
+        if not self.enabled or not ttl:
+            return request()
+        cache = self._open()
+        key = self._key(kind, url, params or {})
+        content = cache.get(key, _MISSING)
+        if content is _MISSING:
+            content = request()
+            cache.set(key, content, ttl=ttl)
+        return content
+
+    def clear(self) -> None:
+        """Removes every cached response"""
+        self._open().clear()
+
+    def close(self) -> None:
+        """Closes the database, which is opened again when next needed"""
+        with self._lock:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+
+    def _open(self) -> PersistentCache:
+        with self._lock:
+            if self._cache is None:
+                try:
+                    # the listings can describe what a key has access to, so are kept private to the user
+                    self._cache = PersistentCache(self.path, table="downloads_catalogue", mode=0o600)
+                    self._cache.purge()
+                except (sqlite3.Error, OSError) as e:
+                    # e.g. a read-only home directory, so the catalogue is only kept for this process
+                    logging.warning(f"Could not open the catalogue cache at {self.path} ({e}). Caching in memory")
+                    self._cache = PersistentCache(table="downloads_catalogue")
+            return self._cache
+
+    @staticmethod
+    def _key(kind: str, url: str, params: dict) -> str:
+        params = dict(params)
+        if params.get("key"):
+            params["key"] = hashlib.sha256(params["key"].encode()).hexdigest()
+        return f"{kind} {url}?{urlencode(sorted(params.items()))}"
+
+
+_catalogue = None
+_catalogue_lock = threading.Lock()
+
+
+def get_catalogue() -> CatalogueCache:
+    """Returns the catalogue cache shared by every download in the process, creating it on first use"""
+    global _catalogue
+    with _catalogue_lock:
+        if _catalogue is None:
+            _catalogue = CatalogueCache()
+        return _catalogue
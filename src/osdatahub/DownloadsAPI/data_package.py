@@ -1,15 +1,16 @@
-import functools
+import asyncio
 import logging
+import os
+import shutil
 from pathlib import Path
 from typing import Union
 
 import requests
-from typeguard import typechecked
-import osdatahub
 
+from osdatahub.typecheck import typechecked
 
-
-from .downloads_api import _DownloadObj, _DownloadsAPIBase
+from .downloads_api import DEFAULT_SEGMENT_SIZE, DEFAULT_SEGMENTS, _DownloadObj, _DownloadsAPIBase, _Manifest
+from .telemetry import DownloadTelemetry
 
 
 class DataPackageDownload(_DownloadsAPIBase):
@@ -23,6 +24,7 @@ class DataPackageDownload(_DownloadsAPIBase):
 
     """
     _ENDPOINT = _DownloadsAPIBase._ENDPOINT + "dataPackages"
+    _CATALOGUE_KIND = "data_packages"
 
     def __init__(self, key: str, product_id: str):
         super().__init__(product_id=product_id)
@@ -31,7 +33,8 @@ class DataPackageDownload(_DownloadsAPIBase):
     @classmethod
     def all_products(cls, key) -> list:
         """
-        Returns a list of all available data packages
+        Returns a list of all available data packages. Responses are cached, see
+        osdatahub.DownloadsAPI.catalogue.CatalogueCache
 
         Args:
             key (str): A valid OS API Key. Get a free key here - https://osdatahub.os.uk/
@@ -39,9 +42,7 @@ class DataPackageDownload(_DownloadsAPIBase):
         Returns: A list of dictionaries containing all available Data Packages
 
         """
-        response = osdatahub.get(cls._ENDPOINT, params={"key": key}, proxies=osdatahub.get_proxies())
-        response.raise_for_status()
-        content = response.json()
+        content = cls._get_catalogue(cls._CATALOGUE_KIND, cls._ENDPOINT, {"key": key})
         if not content:
             logging.warning(f"You have no premium data packages available. "
                             f"Make sure that you first ordered a data package at "
@@ -49,14 +50,12 @@ class DataPackageDownload(_DownloadsAPIBase):
         return content
 
     @property
-    @functools.lru_cache()
     def versions(self) -> list:
         """
-        Get all the available versions for the data package
+        Get all the available versions for the data package. Responses are cached, see
+        osdatahub.DownloadsAPI.catalogue.CatalogueCache
         """
-        response = osdatahub.get(self._endpoint(f"{self._id}/versions"), params={"key": self.key}, proxies=osdatahub.get_proxies())
-        response.raise_for_status()
-        return response.json()
+        return self._get_catalogue("versions", self._endpoint(f"{self._id}/versions"), {"key": self.key})
 
     @typechecked
     def product_list(self, version_id: str, return_downloadobj: bool = False) -> Union[list, dict]:
@@ -71,28 +70,34 @@ class DataPackageDownload(_DownloadsAPIBase):
         Returns:
             List of downloadable files from Downloads API
         """
-        endpoint = self._endpoint(f"{self._id}/versions/{version_id}")
-        params = {"key": self.key}
-        response = osdatahub.get(url=endpoint, params=params, proxies=osdatahub.get_proxies())
-        response.raise_for_status()
-        content = response.json()
+        content = self._get_catalogue("downloads", self._endpoint(f"{self._id}/versions/{version_id}"),
+                                      {"key": self.key})
         if not content:
             logging.warning(f"There are no premium data packages available with id={self.id} and "
                             f"version_id={version_id}. Make sure that you first ordered a data package at"
                             f"https://osdatahub.os.uk/downloads/premium")
         if return_downloadobj:
-            return [_DownloadObj(url=download["url"], file_name=download["fileName"], size=download["size"])
-                    for download in content["downloads"]]
+            return self.__download_objs(content)
 
         return content
 
+    @staticmethod
+    def __download_objs(content: dict) -> list:
+        return [_DownloadObj(url=download["url"], file_name=download["fileName"], size=download["size"],
+                             md5=download.get("md5"))
+                for download in content["downloads"]]
+
     @typechecked
     def download(self,
                  version_id: str,
                  output_dir: Union[str, Path] = ".",
                  file_name: Union[str, None] = None,
                  overwrite: bool = False,
-                 processes: Union[int, None] = None) -> list:
+                 processes: Union[int, None] = None,
+                 segments: int = DEFAULT_SEGMENTS,
+                 segment_size: int = DEFAULT_SEGMENT_SIZE,
+                 extract: Union[bool, str, list] = False,
+                 telemetry: Union[DownloadTelemetry, None] = None) -> list:
         """
         Downloads Data Package files to your local machine
 
@@ -102,17 +107,179 @@ class DataPackageDownload(_DownloadsAPIBase):
                 current working directory
             file_name (str, optional): name of the file(s) to download
             overwrite (bool, optional): whether to overwrite existing files. Defaults to False
-            processes (int, optional): Number of processes with which to download multiple files. Only relevant if
-                multiple files will be downloaded (and download_multiple is set to True)
+            processes (int, optional): Maximum number of files to download at once. Only relevant if multiple files
+                will be downloaded (and download_multiple is set to True). Defaults to the limit of the process-wide
+                DownloadScheduler
+            segments (int, optional): Number of connections to download each file larger than segment_size over. Set
+                to 1 to download every file over a single connection. Defaults to 4
+            segment_size (int, optional): Size in bytes of each segment of a large file. Defaults to 64MB
+            extract (Union[bool, str, list], optional): Whether to extract zip archives as they download, into a
+                directory named after each archive. Either True to extract everything, or glob pattern(s) selecting
+                the members to extract, e.g. "*.gpkg". Defaults to False
+            telemetry (DownloadTelemetry, optional): Records the throughput, time to first byte, retries and 429
+                responses of each file, and passes them to its callbacks. Defaults to None
         """
         if file_name is not None:
             url = f'{self._endpoint(f"{self.id}/versions/{version_id}/downloads")}?fileName={file_name}&key={self.key}'
-            return [_DownloadObj(url=url, file_name=file_name, size=0).download(output_dir=output_dir,
-                                                                                overwrite=overwrite)]
+            download_list = _DownloadObj(url=url, file_name=file_name, size=0)
         else:
             download_list = self.product_list(version_id, return_downloadobj=True)
-            return super()._download(download_list=download_list,
-                                     output_dir=output_dir,
-                                     overwrite=overwrite,
-                                     download_multiple=True,
-                                     processes=processes)
+        return super()._download(download_list=download_list,
+                                 output_dir=output_dir,
+                                 overwrite=overwrite,
+                                 download_multiple=True,
+                                 processes=processes,
+                                 segments=segments,
+                                 segment_size=segment_size,
+                                 extract=extract,
+                                 group=self.id,
+                                 telemetry=telemetry)
+
+    async def download_async(self,
+                             version_id: str,
+                             output_dir: Union[str, Path] = ".",
+                             overwrite: bool = False,
+                             max_connections: int = 50,
+                             write_workers: int = 4,
+                             telemetry: Union[DownloadTelemetry, None] = None) -> list:
+        """
+        Downloads every Data Package file of a version to your local machine using asyncio, so that many files can
+        download at once without a thread each. Requires aiohttp (pip install osdatahub[async])
+
+        Args:
+            version_id (str): The version id of the data package to download
+            output_dir (Union[str, Path], optional): the path where the downloaded files will be saved. Defaults to
+                current working directory
+            overwrite (bool, optional): whether to overwrite existing files. Defaults to False
+            max_connections (int, optional): Maximum number of files to download at once, also capped by the
+                process-wide DownloadScheduler. Defaults to 50
+            write_workers (int, optional): Number of threads writing the files to disk. Defaults to 4
+            telemetry (DownloadTelemetry, optional): Records the throughput, time to first byte, retries and 429
+                responses of each file, and passes them to its callbacks. Defaults to None
+        """
+        download_list = await asyncio.to_thread(self.product_list, version_id, return_downloadobj=True)
+        return await super()._download_async(download_list=download_list,
+                                             output_dir=output_dir,
+                                             overwrite=overwrite,
+                                             max_connections=max_connections,
+                                             write_workers=write_workers,
+                                             telemetry=telemetry)
+
+    @typechecked
+    def sync(self,
+             output_dir: Union[str, Path] = ".",
+             version_id: Union[str, None] = None,
+             apply_changes: bool = False,
+             match_names: bool = False,
+             processes: Union[int, None] = None,
+             segments: int = DEFAULT_SEGMENTS,
+             segment_size: int = DEFAULT_SEGMENT_SIZE,
+             telemetry: Union[DownloadTelemetry, None] = None) -> list:
+        """
+        Brings a local copy of a version of the Data Package up to date, downloading only what has changed.
+
+        Each version is kept in its own directory within output_dir, named after the version id, with a manifest of
+        the files, sizes and MD5 checksums it holds. Files which are identical to a file in a version that has already
+        been synced are hardlinked from it (or copied, if the directories are on different drives) instead of being
+        downloaded again, so only new and changed files are downloaded. Files are matched on their MD5 checksum, so
+        files listed without one are downloaded unless match_names is True.
+
+        Args:
+            output_dir (Union[str, Path], optional): The directory holding the synced versions. Defaults to current
+                working directory
+            version_id (str, optional): The version to sync. Defaults to the most recent version
+            apply_changes (bool, optional): If the version is a change-only update (COU), layer its files over the
+                files of the most recent version synced before it, so that its directory holds the complete data.
+                Records within the files aren't merged. Defaults to False
+            match_names (bool, optional): Reuse a file listed without an MD5 checksum if a synced version has a file
+                of the same name and size. A file changed without changing size would then not be downloaded.
+                Defaults to False
+            processes (int, optional): Maximum number of files to download at once
+            segments (int, optional): Number of connections to download each file larger than segment_size over.
+                Defaults to 4
+            segment_size (int, optional): Size in bytes of each segment of a large file. Defaults to 64MB
+            telemetry (DownloadTelemetry, optional): Records the throughput, time to first byte, retries and 429
+                responses of each file, and passes them to its callbacks. Defaults to None
+
+        Returns:
+            list: The paths of every file in the synced version's directory
+        """
+        versions = sorted(self.versions, key=lambda version: version.get("createdOn", ""))
+        version_ids = [str(version["id"]) for version in versions]
+        if version_id is None:
+            if not version_ids:
+                raise ValueError(f"There are no versions of data package {self.id} to sync")
+            version_id = version_ids[-1]
+
+        content = self.product_list(version_id)
+        target_dir = os.path.join(output_dir, version_id)
+        os.makedirs(target_dir, exist_ok=True)
+        manifest = _Manifest.of(target_dir)
+
+        # earlier versions that have been synced, most recent first
+        earlier_ids = version_ids[:version_ids.index(version_id)] if version_id in version_ids else version_ids
+        earlier_dirs = [os.path.join(output_dir, earlier_id) for earlier_id in reversed(earlier_ids)
+                        if os.path.isfile(os.path.join(output_dir, earlier_id, _Manifest.FILE_NAME))]
+        by_checksum, by_name = {}, {}
+        for earlier_dir in earlier_dirs:
+            earlier_manifest = _Manifest.of(earlier_dir)
+            for file_name, entry in earlier_manifest.files().items():
+                if earlier_manifest.is_verified(file_name):
+                    path = os.path.join(earlier_dir, file_name)
+                    by_checksum.setdefault((entry["md5"], entry["size"]), (path, entry["md5"]))
+                    by_name.setdefault((file_name, entry["size"]), (path, entry["md5"]))
+
+        with manifest.batch():
+            download_list = self.__download_objs(content)
+            to_download = []
+            for download in download_list:
+                if manifest.is_verified(download.file_name, download.size, download.md5):
+                    continue
+                if download.md5:
+                    source = by_checksum.get((download.md5.lower(), download.size))
+                elif match_names:
+                    source = by_name.get((download.file_name, download.size))
+                else:
+                    # without a checksum, a change to the file can't be ruled out
+                    source = None
+                if source is None:
+                    to_download.append(download)
+                else:
+                    self.__link(source[0], os.path.join(target_dir, download.file_name))
+                    manifest.add(download.file_name, download.size, source[1])
+
+            if apply_changes and self.__is_change_only(content) and earlier_dirs:
+                changed = {download.file_name for download in download_list}
+                base_manifest = _Manifest.of(earlier_dirs[0])
+                for file_name, entry in base_manifest.files().items():
+                    if file_name not in changed and not manifest.is_verified(file_name, entry["size"], entry["md5"]):
+                        self.__link(os.path.join(earlier_dirs[0], file_name), os.path.join(target_dir, file_name))
+                        manifest.add(file_name, entry["size"], entry["md5"])
+
+            logging.info(f"Syncing version {version_id} of data package {self.id}: {len(to_download)} of "
+                         f"{len(download_list)} files need downloading")
+            if to_download:
+                super()._download(download_list=to_download,
+                                  output_dir=target_dir,
+                                  overwrite=True,
+                                  download_multiple=True,
+                                  processes=processes,
+                                  segments=segments,
+                                  segment_size=segment_size,
+                                  group=self.id,
+                                  telemetry=telemetry)
+        return [os.path.join(target_dir, file_name) for file_name in manifest.files()]
+
+    @staticmethod
+    def __is_change_only(content: dict) -> bool:
+        supply_type = str(content.get("supplyType", "")).lower()
+        return "change" in supply_type or supply_type == "cou"
+
+    @staticmethod
+    def __link(source: str, destination: str) -> None:
+        if os.path.isfile(destination):
+            os.remove(destination)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
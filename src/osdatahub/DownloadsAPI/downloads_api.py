@@ -1,7 +1,10 @@
-import functools
+import contextlib
+import hashlib
 import json
 import logging
 import os
+import sys
+import threading
 import time
 from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -9,85 +12,589 @@ from datetime import datetime
 from http import HTTPStatus
 from multiprocessing import cpu_count
 from pathlib import Path
-from typing import List, Union
+from typing import Iterator, List, Union
 
-import requests
 from requests.exceptions import HTTPError
 from tqdm import tqdm
 
 import osdatahub
+from osdatahub.DownloadsAPI.catalogue import get_catalogue
+from osdatahub.DownloadsAPI.extract import (StreamingZipExtractor, extract_archive, extraction_dir, is_extracted,
+                                            member_filter)
+from osdatahub.DownloadsAPI.mirror import ContentStore
+from osdatahub.DownloadsAPI.scheduler import get_scheduler
+from osdatahub.DownloadsAPI.telemetry import DownloadTelemetry, TqdmReporter
+from osdatahub.requests_wrapper import _request
 
 retries = 3
+DEFAULT_SEGMENTS = 4
+DEFAULT_SEGMENT_SIZE = 64 * 1024 ** 2  # 64MB
 
 
 class _DownloadObj:
     """ Helper class to download a file from Downloads API
 
+    Files are downloaded to a ".part" file alongside the output path, which is only renamed once it is complete. If a
+    download is interrupted, the next attempt continues from the end of the ".part" file with an HTTP Range request,
+    as long as the file on the server still has the same ETag.
+
+    Files larger than a segment are downloaded over several connections at once, each requesting one segment and
+    writing it at its offset in the preallocated ".part" file. Completed segments are recorded, so an interrupted
+    segmented download only fetches the segments it was missing.
+
+    The MD5 checksum of the file is calculated as it is downloaded and checked against the one listed by the API.
+    Verified files are recorded in a manifest in the output directory, so later downloads skip them without reading
+    them again.
+
     Args:
         url (str): Direct url for the download file
         file_name (str): Name of the file to be downloaded
+        size (int): Size of the file in bytes, or 0 if it isn't known
+        md5 (str, optional): MD5 checksum of the file, if it is known. Defaults to None
     """
 
-    def __init__(self, url: str, file_name: str, size: int):
+    def __init__(self, url: str, file_name: str, size: int, md5: Union[str, None] = None):
         self.url = url
         self.file_name = file_name
         self.size = size
+        self.md5 = md5
 
     def download(self, 
                  output_dir: Union[str, Path], 
                  overwrite: bool = False, 
-                 pbar: Union[tqdm, None] = None) -> str:
+                 pbar: Union[tqdm, None] = None,
+                 segments: int = DEFAULT_SEGMENTS,
+                 segment_size: int = DEFAULT_SEGMENT_SIZE,
+                 extractor: Union[StreamingZipExtractor, None] = None,
+                 telemetry: Union[DownloadTelemetry, None] = None) -> str:
         """
-        Downloads file to given directory
+        Downloads file to given directory, resuming any earlier download of it that was interrupted
 
         Args:
             output_dir (Union[str, Path]): Directory to save the downloaded file
             overwrite (bool, optional): whether to overwrite an existing file. Defaults to False
             pbar (tqdm, optional): tqdm progress bar to update in the event of downloading multiple files at once
+            segments (int, optional): Number of connections to download a file larger than segment_size over. Set to
+                1 to always use a single connection. Defaults to 4
+            segment_size (int, optional): Size in bytes of each segment requested. Defaults to 64MB
+            extractor (StreamingZipExtractor, optional): Fed the file as it is downloaded. A segmented download
+                feeds it each segment once every segment before it has arrived
+            telemetry (DownloadTelemetry, optional): Records the throughput, time to first byte, retries and 429
+                responses of the download
         """
         output_path = os.path.join(output_dir, self.file_name)
-
-        if os.path.isfile(output_path) and not overwrite:
-            logging.warning(f"Overwrite is set to False and there is a file already in the location {output_path}. "
-                            f"Skipping download...")
+        if self._skip(output_path, overwrite):
             return output_path
 
-        for _ in range(retries):
+        progress = _Progress(self.file_name, self.size, pbar, telemetry, self.url)
+        segmented = segments > 1 and bool(self.size) and self.size > segment_size
+        for attempt in range(retries):
             try:
-                header = {'User-Agent': 'osdatahub-python'}
-                response = requests.get(
-                    self.url, stream=True, headers=header, proxies=osdatahub.get_proxies())
-                response.raise_for_status()
-                expected_size = int(response.headers.get('content-length'))
-                current_size = 0
-                chunk_size = 1048576  # 1024 ** 2 -> 1MB
-                if response.status_code == 200:
-                    with open(output_path, 'wb') as f:
-                        if not pbar:
-                            pbar = tqdm(
-                                total=expected_size, desc=self.file_name, unit="B", unit_scale=True, leave=True)
-                        for chunk in response.iter_content(chunk_size=chunk_size):
-                            current_size += len(chunk)
-                            f.write(chunk)
-                            f.flush()
-                            pbar.update(chunk_size)
-                        if expected_size != current_size:
-                            deficit = expected_size - current_size
-                            raise IOError(
-                                f'incomplete read ({current_size} bytes read, {deficit} more expected)'
-                            )
-                        pbar.write(
-                            f"Finished downloading {self.file_name} to {output_path}")
+                if segmented:
+                    # falls back to a single connection if the server doesn't support range requests
+                    segmented = self._download_segments(output_path, progress, segments, segment_size, extractor)
+                if not segmented:
+                    self._download_part(output_path, progress, extractor)
                 break
 
             except HTTPError as exc:
-                if int(exc.response.status_code) == 429:
-                    time.sleep(20)
+                if int(exc.response.status_code) == 429 and attempt < retries - 1:
+                    # slows down every download in the process, rather than just this one
+                    wait = _retry_after(exc.response.headers)
+                    progress.throttled(wait)
+                    get_scheduler().pause(wait)
                     continue
+                progress.fail(exc)
                 raise
 
+            except IOError as exc:
+                # connection dropped, the file was cut short or its checksum was wrong, so try again from the end of
+                # the .part file (which is deleted if its checksum was wrong)
+                if attempt == retries - 1:
+                    progress.fail(exc)
+                    raise
+                progress.retry()
+                logging.warning(f"Download of {self.file_name} failed ({exc}). Resuming...")
+
+        progress.finish(output_path)
         return output_path
 
+    def _skip(self, output_path: str, overwrite: bool) -> bool:
+        """Whether the file has already been downloaded to output_path and shouldn't be overwritten"""
+        if overwrite:
+            return False
+
+        if _Manifest.of(os.path.dirname(output_path)).is_verified(self.file_name, self.size, self.md5):
+            logging.info(f"{output_path} has already been downloaded and verified. Skipping download...")
+            return True
+
+        if os.path.isfile(output_path):
+            existing_size = os.path.getsize(output_path)
+            if not self.size or existing_size == self.size:
+                logging.warning(f"Overwrite is set to False and there is a file already in the location {output_path}. "
+                                f"Skipping download...")
+                return True
+            logging.warning(f"The file in the location {output_path} is {existing_size} bytes but {self.size} bytes "
+                            f"were expected. Downloading it again...")
+        return False
+
+    def _download_part(self, output_path: str, progress: "_Progress",
+                       extractor: Union[StreamingZipExtractor, None] = None) -> None:
+        """
+        Downloads the file to its .part file, continuing from the end of it if possible, then moves it to output_path
+        """
+        part_path = output_path + _PART_SUFFIX
+        state = _read_part_state(part_path)
+        # a segmented download's .part file is preallocated, so its size says nothing about what was downloaded
+        resumable = state is not None and "completed" not in state and os.path.isfile(part_path)
+        offset = os.path.getsize(part_path) if resumable else 0
+
+        header = {}
+        if offset:
+            header["Range"] = f"bytes={offset}-"
+            if state.get("etag"):
+                # the server ignores the range, and sends the whole file, if it has changed since
+                header["If-Range"] = state["etag"]
+
+        scheduler = get_scheduler()
+        with scheduler.connection(), \
+                _request('GET', self.url, stream=True, headers=header) as response:
+            progress.first_byte(response.elapsed.total_seconds())
+            if response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+                _remove_part(part_path)
+                raise IOError(f"the partial download of {self.file_name} is no longer valid")
+            response.raise_for_status()
+
+            if response.status_code == HTTPStatus.PARTIAL_CONTENT:
+                start, expected_size = _parse_content_range(response.headers.get("content-range"))
+                if start != offset or (state.get("size") and expected_size != state["size"]):
+                    _remove_part(part_path)
+                    raise IOError(f"the server returned an unexpected range for {self.file_name}")
+                mode = "ab"
+            else:
+                offset = 0
+                content_length = response.headers.get("content-length")
+                expected_size = int(content_length) if content_length is not None else (self.size or None)
+                _write_part_state(part_path, {"url": remove_key(self.url), "etag": response.headers.get("etag"),
+                                              "size": expected_size})
+                mode = "wb"
+
+            current_size = offset
+            chunk_size = 1048576  # 1024 ** 2 -> 1MB
+            hasher = hashlib.md5(usedforsecurity=False)
+            if extractor is not None:
+                extractor.reset()
+            if offset:
+                # a resumed download's extractor catches up on the bytes already on disk
+                _hash_file(hasher, part_path, 0, offset, extractor)
+            progress.start(offset, expected_size)
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    scheduler.throttle(len(chunk))
+                    current_size += len(chunk)
+                    hasher.update(chunk)
+                    f.write(chunk)
+                    if extractor is not None:
+                        extractor.feed(chunk)
+                    f.flush()
+                    progress.update(current_size)
+
+        if expected_size is not None and expected_size != current_size:
+            deficit = expected_size - current_size
+            raise IOError(
+                f'incomplete read ({current_size} bytes read, {deficit} more expected)'
+            )
+        self._complete(part_path, output_path, hasher.hexdigest())
+
+    def _download_segments(self, output_path: str, progress: "_Progress", segments: int, segment_size: int,
+                           extractor: Union[StreamingZipExtractor, None] = None) -> bool:
+        """
+        Downloads the file to its .part file in segments over several connections, then moves it to output_path.
+        Returns False, without downloading anything, if the server doesn't support range requests
+        """
+        part_path = output_path + _PART_SUFFIX
+        ranges = [(start, min(start + segment_size, self.size) - 1) for start in range(0, self.size, segment_size)]
+        state = _read_part_state(part_path)
+        if state is None or state.get("size") != self.size or not os.path.isfile(part_path):
+            state = {"url": remove_key(self.url), "etag": None, "size": self.size, "completed": []}
+        elif "completed" not in state:
+            # carry on from a single connection download, keeping the segments it already finished
+            written = os.path.getsize(part_path)
+            state["completed"] = [start for start, end in ranges if end < written]
+        elif state.get("segment_size") != segment_size:
+            state["completed"] = []
+        state["segment_size"] = segment_size
+        completed = set(state["completed"])
+
+        if not os.path.isfile(part_path):
+            open(part_path, "wb").close()
+        with open(part_path, "r+b") as f:
+            f.truncate(self.size)
+        _write_part_state(part_path, state)
+
+        lock = threading.Lock()
+        scheduler = get_scheduler()
+        hasher = hashlib.md5(usedforsecurity=False)
+        hashed = 0
+        if extractor is not None:
+            extractor.reset()
+
+        def hash_completed() -> None:
+            # segments finish out of order, so each is hashed (and extracted) once every segment before it has been
+            nonlocal hashed
+            while hashed < self.size and hashed in completed:
+                end = min(hashed + segment_size, self.size)
+                _hash_file(hasher, part_path, hashed, end, extractor)
+                hashed = end
+
+        def fetch(start: int, end: int) -> None:
+            header = {'Range': f"bytes={start}-{end}"}
+            if state["etag"]:
+                header["If-Range"] = state["etag"]
+            with scheduler.connection(), \
+                    _request('GET', self.url, stream=True, headers=header) as response:
+                progress.first_byte(response.elapsed.total_seconds())
+                response.raise_for_status()
+                etag = response.headers.get("etag")
+                with lock:
+                    if state["etag"] is None:
+                        state["etag"] = etag
+                    elif etag != state["etag"]:
+                        raise _FileChanged(f"{self.file_name} changed on the server during the download")
+                if response.status_code != HTTPStatus.PARTIAL_CONTENT:
+                    raise _RangesNotSupported()
+                first, total = _parse_content_range(response.headers.get("content-range"))
+                if first != start or total != self.size:
+                    raise IOError(f"the server returned bytes {first} onwards of {total} for {self.file_name}, "
+                                  f"but bytes {start}-{end} of {self.size} were requested")
+
+                written = 0
+                with open(part_path, "r+b") as f:
+                    f.seek(start)
+                    for chunk in response.iter_content(chunk_size=1048576):
+                        scheduler.throttle(len(chunk))
+                        f.write(chunk)
+                        written += len(chunk)
+                        progress.advance(len(chunk))
+            if written != end - start + 1:
+                raise IOError(f'incomplete segment ({written} bytes read, {end - start + 1} expected)')
+            with lock:
+                state["completed"].append(start)
+                _write_part_state(part_path, state)
+                completed.add(start)
+                hash_completed()
+
+        hash_completed()
+        progress.start(sum(end - start + 1 for start, end in ranges if start in completed), self.size)
+        try:
+            with ThreadPoolExecutor(max_workers=segments) as executor:
+                futures = [executor.submit(fetch, start, end) for start, end in ranges if start not in completed]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        except _RangesNotSupported:
+            _remove_part(part_path)
+            return False
+        except _FileChanged:
+            _remove_part(part_path)
+            raise
+
+        if os.path.getsize(part_path) != self.size or hashed != self.size:
+            raise IOError(f"the segmented download of {self.file_name} is incomplete")
+        self._complete(part_path, output_path, hasher.hexdigest())
+        return True
+
+    def _complete(self, part_path: str, output_path: str, md5: str) -> None:
+        """
+        Checks the checksum of a downloaded .part file, then moves it to output_path and adds it to the manifest
+        """
+        if self.md5 and md5 != self.md5.lower():
+            _remove_part(part_path)
+            raise IOError(f"checksum mismatch for {self.file_name} (expected MD5 {self.md5}, got {md5})")
+        os.replace(part_path, output_path)
+        _remove_part(part_path, state_only=True)
+        _Manifest.of(os.path.dirname(output_path)).add(self.file_name, os.path.getsize(output_path), md5)
+
+
+class _RangesNotSupported(Exception):
+    """Raised when a server responds to a range request with the whole file"""
+
+
+class _FileChanged(IOError):
+    """Raised when a file's ETag changes part way through downloading it"""
+
+
+_PART_SUFFIX = ".part"
+
+
+def _read_part_state(part_path: str) -> Union[dict, None]:
+    """Reads the ETag and size recorded for a partial download, if there is a valid record of them"""
+    try:
+        with open(part_path + ".json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_part_state(part_path: str, state: dict) -> None:
+    temp_path = part_path + ".json.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(temp_path, part_path + ".json")
+
+
+def _remove_part(part_path: str, state_only: bool = False) -> None:
+    paths = [part_path + ".json"] if state_only else [part_path, part_path + ".json"]
+    for path in paths:
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def _retry_after(headers, default: float = 20) -> float:
+    """Reads how long to wait from a 429 response's Retry-After header, if it has one in seconds"""
+    try:
+        return float((headers or {}).get("Retry-After", default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _hash_file(hasher, path: str, start: int, end: int,
+               extractor: Union[StreamingZipExtractor, None] = None) -> None:
+    """Adds bytes start to end (exclusive) of a file to a hash, and feeds them to the extractor if one is given"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(remaining, 1048576))
+            if not block:
+                raise IOError(f"{path} is shorter than expected")
+            hasher.update(block)
+            if extractor is not None:
+                extractor.feed(block)
+            remaining -= len(block)
+
+
+class _Manifest:
+    """
+    Record of the files in a directory that have been downloaded and had their checksum verified, kept in a
+    ".osdatahub_manifest.json" file in the directory. There is one instance per directory, shared between threads.
+
+    Each file added is written to the manifest file straight away, unless a batch is open, in which case the file is
+    only rewritten every FLUSH_EVERY files or FLUSH_INTERVAL seconds, and when the batch closes. Writes hold a lock
+    file and merge in the entries on disk, so processes downloading into the same directory keep each other's entries
+    """
+    FILE_NAME = ".osdatahub_manifest.json"
+    FLUSH_EVERY = 100
+    FLUSH_INTERVAL = 5.0
+    _manifests = {}
+    _manifests_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._files = {}
+        self._pending = {}
+        self._batches = 0
+        self._mtime = None
+        self._written = time.monotonic()
+
+    @classmethod
+    def of(cls, directory: Union[str, Path]) -> "_Manifest":
+        path = os.path.abspath(os.path.join(directory, cls.FILE_NAME))
+        with cls._manifests_lock:
+            manifest = cls._manifests.setdefault(path, cls(path))
+        manifest._reload()
+        return manifest
+
+    def _reload(self) -> None:
+        """Reads the manifest file again if it has changed since it was last read or written"""
+        with self._lock:
+            mtime = os.stat(self.path).st_mtime_ns if os.path.isfile(self.path) else None
+            if mtime == self._mtime:
+                return
+            try:
+                with open(self.path) as f:
+                    self._files = json.load(f)["files"]
+            except (OSError, ValueError, KeyError):
+                self._files = {}
+            # files added since the last write aren't in the file yet
+            self._files.update(self._pending)
+            self._mtime = mtime
+
+    def get(self, file_name: str) -> Union[dict, None]:
+        """Returns the size and md5 recorded for a file, or None if it hasn't been verified"""
+        with self._lock:
+            return self._files.get(file_name)
+
+    def files(self) -> dict:
+        """Returns the size and md5 recorded for every file"""
+        with self._lock:
+            return dict(self._files)
+
+    def is_verified(self, file_name: str, size: int = 0, md5: Union[str, None] = None) -> bool:
+        """
+        Whether the file has been downloaded and verified, is still the size it was then, and, if they are given,
+        matches the expected size and md5
+        """
+        with self._lock:
+            entry = self._files.get(file_name)
+        if entry is None or (size and entry["size"] != size) or (md5 and entry["md5"] != md5.lower()):
+            return False
+        path = os.path.join(os.path.dirname(self.path), file_name)
+        return os.path.isfile(path) and os.path.getsize(path) == entry["size"]
+
+    def add(self, file_name: str, size: int, md5: str) -> None:
+        with self._lock:
+            self._files[file_name] = self._pending[file_name] = {"size": size, "md5": md5}
+            if (not self._batches or len(self._pending) >= self.FLUSH_EVERY
+                    or time.monotonic() - self._written >= self.FLUSH_INTERVAL):
+                self._write()
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["_Manifest"]:
+        """Defers writing the files added within the with block, so that a download of many files doesn't rewrite the
+        whole manifest for each of them. Batches can be nested, and are written when the outermost one closes"""
+        with self._lock:
+            self._batches += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batches -= 1
+                if not self._batches and self._pending:
+                    self._write()
+
+    def _write(self) -> None:
+        """Writes the manifest file, merged with any entries other processes have written. Must be called holding
+        the lock"""
+        with _file_lock(self.path + ".lock"):
+            try:
+                with open(self.path) as f:
+                    files = json.load(f)["files"]
+            except (OSError, ValueError, KeyError):
+                files = {}
+            # only the files added since the last write replace the entries on disk, which may be newer than the
+            # other entries held in memory
+            files.update(self._pending)
+            temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"files": files}, f)
+            os.replace(temp_path, self.path)
+            self._mtime = os.stat(self.path).st_mtime_ns
+        self._files = files
+        self._written = time.monotonic()
+        self._pending.clear()
+
+
+@contextlib.contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Holds an exclusive lock on a lock file, shared between processes, until the block exits"""
+    with open(path, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _parse_content_range(content_range: Union[str, None]) -> tuple:
+    """Parses a Content-Range header such as "bytes 100-199/1000" into its first byte and the total size"""
+    if not content_range:
+        raise IOError("the server did not return a Content-Range for a partial download")
+    byte_range, _, total = content_range.replace("bytes ", "").partition("/")
+    return int(byte_range.split("-")[0]), int(total) if total != "*" else None
+
+
+class _Progress:
+    """Reports the progress of a single file to the download telemetry, and to a tqdm progress bar, which is created
+    on first use if the file isn't part of a larger download. Bytes are only counted once, however many times the
+    download is resumed"""
+
+    def __init__(self,
+                 file_name: str,
+                 size: Union[int, None] = None,
+                 pbar: Union[tqdm, None] = None,
+                 telemetry: Union[DownloadTelemetry, None] = None,
+                 url: Union[str, None] = None):
+        self.telemetry = telemetry
+        self.reporter = TqdmReporter(pbar)
+        self.stats = (telemetry or DownloadTelemetry()).file(file_name, size, remove_key(url) if url else None)
+        self._lock = threading.Lock()
+
+    def _emit(self, event: str) -> None:
+        if self.telemetry is not None:
+            self.telemetry.emit(event, self.stats)
+        self.reporter(event, self.stats)
+
+    def start(self, position: int, total: Union[int, None]) -> None:
+        """Sets how much of the file there is before a request starts receiving the rest"""
+        with self._lock:
+            self.stats.position = position
+            self.stats.size = total or self.stats.size
+            event = "start" if self.stats.started is None else "progress"
+            if self.stats.started is None:
+                self.stats.started = time.monotonic()
+        self._emit(event)
+
+    def first_byte(self, seconds: float) -> None:
+        """Records a response arriving the given number of seconds after its request was sent"""
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.first_byte_times.append(seconds)
+        self._emit("first_byte")
+
+    def update(self, position: int) -> None:
+        """Sets the number of bytes of the file downloaded so far"""
+        with self._lock:
+            self.stats.received += max(position - self.stats.position, 0)
+            self.stats.position = position
+        self._emit("progress")
+
+    def advance(self, size: int) -> None:
+        """Adds to the number of bytes of the file downloaded so far"""
+        with self._lock:
+            self.stats.received += size
+            self.stats.position += size
+        self._emit("progress")
+
+    def retry(self) -> None:
+        with self._lock:
+            self.stats.retries += 1
+        self._emit("retry")
+
+    def throttled(self, seconds: float) -> None:
+        with self._lock:
+            self.stats.throttled += 1
+            self.stats.throttle_wait += seconds
+        self._emit("throttled")
+
+    def finish(self, path: str) -> None:
+        with self._lock:
+            self.stats.finished = time.monotonic()
+            self.stats.path = path
+        self._emit("finish")
+
+    def fail(self, error: BaseException) -> None:
+        with self._lock:
+            self.stats.finished = time.monotonic()
+            self.stats.error = str(error)
+        self._emit("error")
+
 
 def remove_key(url: str):
     """Remove key from url
@@ -129,6 +636,8 @@ class _DownloadsAPIBase(ABC):
 
     """
     _ENDPOINT = f"https://api.os.uk/downloads/v1/"
+    # how long the catalogue cache keeps the details of the product or data package
+    _CATALOGUE_KIND = "products"
 
     def __init__(self, product_id: str):
         self._id = product_id
@@ -150,28 +659,43 @@ class _DownloadsAPIBase(ABC):
         return self._id
 
     @property
-    @functools.lru_cache()
     def details(self) -> dict:
         """
-        Calls endpoint to return details about the product or data package
+        Calls endpoint to return details about the product or data package. Responses are cached, see
+        osdatahub.DownloadsAPI.catalogue.CatalogueCache
         """
-        response = osdatahub.get(self._endpoint(
-            self._id), proxies=osdatahub.get_proxies())
-        response.raise_for_status()
-        return response.json()
+        return self._get_catalogue(self._CATALOGUE_KIND, self._endpoint(self._id))
 
     @classmethod
     def all_products(cls, **kwargs) -> list:
         """
-        Returns a list of all available products of the product type
+        Returns a list of all available products of the product type. Responses are cached, see
+        osdatahub.DownloadsAPI.catalogue.CatalogueCache
 
         Returns: list of dictionaries containing all products available to download
 
         """
-        response = osdatahub.get(
-            cls._ENDPOINT, proxies=osdatahub.get_proxies())
-        response.raise_for_status()
-        return response.json()
+        return cls._get_catalogue(cls._CATALOGUE_KIND, cls._ENDPOINT)
+
+    @staticmethod
+    def _get_catalogue(kind: str, url: str, params: Union[dict, None] = None) -> Union[list, dict]:
+        """
+        Requests part of the Downloads API catalogue, unless the catalogue cache already has it
+
+        Args:
+            kind (str): What is requested, which sets how long it is cached for, see CatalogueCache
+            url (str): The endpoint to request
+            params (dict, optional): The query parameters. Defaults to None
+
+        Returns:
+            The JSON response
+        """
+        def request() -> Union[list, dict]:
+            response = osdatahub.get(url=url, params=params)
+            response.raise_for_status()
+            return response.json()
+
+        return get_catalogue().fetch(kind, url, params, request)
 
     @abstractmethod
     def product_list(self):
@@ -187,7 +711,13 @@ class _DownloadsAPIBase(ABC):
                   output_dir: Union[str, Path], 
                   overwrite: bool = False,
                   download_multiple: bool = False, 
-                  processes: Union[int, None] = None) -> list:
+                  processes: Union[int, None] = None,
+                  segments: int = DEFAULT_SEGMENTS,
+                  segment_size: int = DEFAULT_SEGMENT_SIZE,
+                  extract: Union[bool, str, list] = False,
+                  group: Union[str, None] = None,
+                  telemetry: Union[DownloadTelemetry, None] = None,
+                  store: Union[ContentStore, None] = None) -> list:
         """
         Downloads product/datapackage to the given directory. Can download a single format or can download multiple
         formats in parallel
@@ -200,8 +730,20 @@ class _DownloadsAPIBase(ABC):
                 Defaults to False
              download_multiple (bool, optional): Whether to download multiple files, generally the same data but in
                 different formats. Defaults to False
-             processes (int, optional): If downloading multiple files, the number of parallel processes to be used.
-                defaults to the machine's CPU count
+             processes (int, optional): If downloading multiple files, the most to download at once. Files are queued
+                on the process-wide DownloadScheduler, which also limits the total number of files and connections.
+                Defaults to None (only limited by the scheduler)
+             segments (int, optional): Number of connections to download each file larger than segment_size over.
+                Defaults to 4
+             segment_size (int, optional): Size in bytes of each segment of a large file. Defaults to 64MB
+             extract (Union[bool, str, list], optional): Whether to extract downloaded zip archives, either True for
+                every member or glob pattern(s) selecting members. Defaults to False
+             group (str, optional): The product being downloaded, so the scheduler can share connections fairly
+                between products. Defaults to None
+             telemetry (DownloadTelemetry, optional): Records the throughput, time to first byte, retries and 429
+                responses of each file. Defaults to None
+             store (ContentStore, optional): Content store to take files from instead of downloading them when it
+                has them, and to add downloaded files to. Only used for files with a known MD5. Defaults to None
         """
         if isinstance(download_list, list) and len(download_list) == 0:
             raise Exception(
@@ -214,39 +756,112 @@ class _DownloadsAPIBase(ABC):
         if not os.path.isdir(output_dir):
             os.makedirs(output_dir)
 
-        # downloads in parallel if multiple files need to be downloaded
-        if isinstance(download_list, list) and len(download_list) > 1 and download_multiple:
-            if not processes:
-                processes = cpu_count()
-            with ThreadPoolExecutor(max_workers=processes) as executor:
-                pbar = tqdm(total=sum([d.size for d in download_list]), unit="B", unit_scale=True, leave=True,
-                            desc=f"Downloaded 0/{len(download_list)} files from osdatahub")
-
-                processed_downloads = {}
-                num_downloads_completed = 0
-                results = []
-                missing_files = []
-
-                for p in download_list:
-                    future = executor.submit(
-                        p.download, output_dir, overwrite, pbar)
-                    processed_downloads[future] = p
-
-                for future in as_completed(processed_downloads):
-                    info = processed_downloads[future]
-                    try:
-                        results.append(future.result())
-                        num_downloads_completed += 1
-                        pbar.set_description(
-                            f"Downloaded {num_downloads_completed}/{len(download_list)} files from osdatahub")
-                    except Exception:
-                        missing_files.append(info)
-
-                save_missing_files(missing_files, output_dir)
-        else:
-            # download single file
-            d = download_list[0] if isinstance(
-                download_list, list) else download_list
-            results = [d.download(output_dir, overwrite)]
+        manifest = _Manifest.of(output_dir)
+        include = member_filter(extract)
+        # archives are extracted in their own pool, so extracting one doesn't hold up downloading the others
+        extract_workers = processes or cpu_count()
+        extract_executor = ThreadPoolExecutor(max_workers=extract_workers) if include else None
+        extractions = {}
+
+        def download(d: _DownloadObj, pbar: Union[tqdm, None] = None) -> str:
+            is_archive = include is not None and d.file_name.lower().endswith(".zip")
+            extractor = None
+            if is_archive:
+                extractor = StreamingZipExtractor(extraction_dir(os.path.join(output_dir, d.file_name)), include)
+            output_path = os.path.join(output_dir, d.file_name)
+            mirrored = store is not None and d.md5
+            skipped = d._skip(output_path, overwrite)
+            if mirrored and not skipped and store.materialise(d.md5, d.size, output_path):
+                logging.info(f"Linked {d.file_name} to {output_path} from the content store")
+                manifest.add(d.file_name, d.size, d.md5.lower())
+                path = output_path
+            else:
+                path = d.download(output_dir, overwrite, pbar, segments, segment_size, extractor, telemetry)
+                if mirrored:
+                    store.add(path, d.md5, d.size, verified=manifest.is_verified(d.file_name, d.size, d.md5))
+            # archives taken from the store, or already downloaded, weren't streamed through the extractor, so are
+            # extracted from disk unless an earlier run already extracted them
+            if is_archive and not extractor.close() and not (skipped and is_extracted(path, include)):
+                extractions[d] = extract_archive(path, include, extract_executor, extract_workers)
+            return path
+
+        try:
+            with manifest.batch():
+                # downloads in parallel if multiple files need to be downloaded
+                if isinstance(download_list, list) and len(download_list) > 1 and download_multiple:
+                    pbar = tqdm(total=sum([d.size for d in download_list]), unit="B", unit_scale=True, leave=True,
+                                desc=f"Downloaded 0/{len(download_list)} files from osdatahub")
+
+                    processed_downloads = {}
+                    num_downloads_completed = 0
+                    results = []
+                    missing_files = []
+
+                    scheduler = get_scheduler()
+                    for p in download_list:
+                        future = scheduler.submit(download, p, pbar, size=p.size, group=group, max_running=processes)
+                        processed_downloads[future] = p
+
+                    for future in as_completed(processed_downloads):
+                        info = processed_downloads[future]
+                        try:
+                            results.append(future.result())
+                            num_downloads_completed += 1
+                            pbar.set_description(
+                                f"Downloaded {num_downloads_completed}/{len(download_list)} files from osdatahub")
+                        except Exception:
+                            missing_files.append(info)
+
+                    for info, futures in extractions.items():
+                        try:
+                            for future in futures:
+                                future.result()
+                        except Exception as exc:
+                            logging.error(f"Failed to extract {info.file_name}: {exc}")
+                            missing_files.append(info)
+
+                    save_missing_files(missing_files, output_dir)
+                else:
+                    # download single file
+                    d = download_list[0] if isinstance(
+                        download_list, list) else download_list
+                    results = [download(d)]
+                    for futures in extractions.values():
+                        for future in futures:
+                            future.result()
+        finally:
+            if extract_executor is not None:
+                extract_executor.shutdown()
+
+        return results
+
+    @staticmethod
+    async def _download_async(download_list: List[_DownloadObj],
+                              output_dir: Union[str, Path],
+                              overwrite: bool = False,
+                              max_connections: int = 50,
+                              write_workers: int = 4,
+                              telemetry: Union[DownloadTelemetry, None] = None) -> list:
+        """
+        Downloads product/datapackage files to the given directory on an asyncio event loop. Requires aiohttp
 
+        Args:
+             download_list (list): The DownloadObj objects representing the files to download
+             output_dir (Union[str, Path]): path to directory where the files will be saved to
+             overwrite (bool, optional): Whether to overwrite any existing files with the same name and path.
+                Defaults to False
+             max_connections (int, optional): Maximum number of files to download at once, also capped by the
+                process-wide DownloadScheduler. Defaults to 50
+             write_workers (int, optional): Number of threads writing the files to disk. Defaults to 4
+             telemetry (DownloadTelemetry, optional): Records the throughput, time to first byte, retries and 429
+                responses of each file. Defaults to None
+        """
+        from osdatahub.DownloadsAPI.async_downloads import AsyncDownloadEngine
+
+        if len(download_list) == 0:
+            raise Exception(
+                "Argument \"download_list\" is empty. Please provide at least one DownloadObj to download")
+        engine = AsyncDownloadEngine(max_connections=max_connections, write_workers=write_workers)
+        results, missing_files = await engine.download(download_list, str(output_dir), overwrite, telemetry)
+        save_missing_files(missing_files, output_dir)
         return results
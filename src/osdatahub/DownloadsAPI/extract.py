@@ -0,0 +1,251 @@
+import fnmatch
+import os
+import struct
+import zipfile
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List, Union
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_LOCAL_HEADER_SIGNATURE = 0x04034b50
+# the central directory (or its end record) follows the last member
+_CENTRAL_DIRECTORY_SIGNATURES = (0x02014b50, 0x06054b50, 0x06064b50)
+_STORED, _DEFLATED = 0, 8
+
+
+def member_filter(extract: Union[bool, str, Iterable[str]]) -> Union[Callable[[str], bool], None]:
+    """
+    Converts the extract argument of the download methods into a function selecting which archive members to extract
+
+    Args:
+        extract (Union[bool, str, Iterable[str]]): True to extract every member, or glob pattern(s) matched against
+            the members' paths within the archive, e.g. "*.gpkg"
+
+    Returns:
+        A function returning whether to extract a member, or None if nothing should be extracted
+    """
+    if extract is False or extract is None:
+        return None
+    if extract is True:
+        return lambda name: True
+    patterns = [extract] if isinstance(extract, str) else list(extract)
+    return lambda name: any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def extraction_dir(archive_path: Union[str, Path]) -> str:
+    """The directory an archive is extracted into: a directory beside it, named after it"""
+    return os.path.splitext(archive_path)[0]
+
+
+def is_extracted(archive_path: Union[str, Path], include: Callable[[str], bool]) -> bool:
+    """
+    Whether every selected member of an archive is already in its extraction_dir, with the size recorded in the
+    archive. Only the archive's central directory is read
+
+    Args:
+        archive_path (Union[str, Path]): The zip archive
+        include (Callable[[str], bool]): Selects which members to check, see member_filter
+    """
+    destination = extraction_dir(archive_path)
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            members = [info for info in archive.infolist() if not info.is_dir() and include(info.filename)]
+    except (OSError, zipfile.BadZipFile):
+        return False
+    for info in members:
+        path = os.path.join(destination, info.filename)
+        if not os.path.isfile(path) or os.path.getsize(path) != info.file_size:
+            return False
+    return True
+
+
+class StreamingZipExtractor:
+    """
+    Extracts members of a zip archive from its bytes as they are downloaded, so there is no need to read the archive
+    back from disk once it has been downloaded.
+
+    This relies on each member's local header recording its compressed size. Archives written with data descriptors
+    (sizes recorded after the data), encrypted or ZIP64 members, or compression methods other than stored and deflate
+    can't be streamed. If one is found the extractor gives up, and close returns False so that the archive can be
+    extracted once it has been downloaded.
+
+    Args:
+        destination (Union[str, Path]): Directory to extract members into
+        include (Callable[[str], bool]): Selects which members to extract, see member_filter
+    """
+
+    def __init__(self, destination: Union[str, Path], include: Callable[[str], bool]):
+        self.destination = os.path.abspath(destination)
+        self.include = include
+        self.reset()
+
+    def reset(self) -> None:
+        """Starts again from the beginning of the archive, e.g. because its download restarted"""
+        self._discard_member()
+        self._buffer = bytearray()
+        self._remaining = 0
+        self._member = None
+        self._file = None
+        self.extracted = []
+        self.finished = False
+        self.failed = False
+
+    def feed(self, chunk: bytes) -> None:
+        """Processes the next chunk of the archive"""
+        if self.finished or self.failed:
+            return
+        self._buffer += chunk
+        try:
+            while self._step():
+                pass
+        except (OSError, zlib.error):
+            self._fail()
+
+    def close(self) -> bool:
+        """
+        Finishes extracting
+
+        Returns:
+            bool: Whether every selected member was extracted from the stream. If not, the archive needs extracting
+            from disk
+        """
+        self._discard_member()
+        self._buffer = bytearray()
+        return self.finished and not self.failed
+
+    def _step(self) -> bool:
+        """Processes as much of the buffer as possible. Returns whether to keep going"""
+        if self._member is not None:
+            return self._read_data()
+        if len(self._buffer) < 4:
+            return False
+        signature = struct.unpack_from("<I", self._buffer)[0]
+        if signature in _CENTRAL_DIRECTORY_SIGNATURES:
+            self.finished = True
+            self._buffer = bytearray()
+            return False
+        if signature != _LOCAL_HEADER_SIGNATURE:
+            self._fail()
+            return False
+        return self._read_header()
+
+    def _read_header(self) -> bool:
+        if len(self._buffer) < _LOCAL_HEADER.size:
+            return False
+        (_, _, flags, method, _, _, crc, compressed_size, size, name_length,
+         extra_length) = _LOCAL_HEADER.unpack_from(self._buffer)
+        header_length = _LOCAL_HEADER.size + name_length + extra_length
+        if len(self._buffer) < header_length:
+            return False
+        encoding = "utf-8" if flags & 0x800 else "cp437"
+        name = bytes(self._buffer[_LOCAL_HEADER.size:_LOCAL_HEADER.size + name_length]).decode(encoding)
+        # bit 0: encrypted, bit 3: sizes are in a data descriptor after the data
+        if flags & 0x9 or method not in (_STORED, _DEFLATED) or 0xFFFFFFFF in (compressed_size, size):
+            self._fail()
+            return False
+        del self._buffer[:header_length]
+
+        path = self._member_path(name)
+        if path is None:
+            self._fail()
+            return False
+        self._member = {"name": name, "path": path, "method": method, "crc": crc, "size": size,
+                        "selected": self.include(name) and not name.endswith("/"), "crc_so_far": 0, "written": 0}
+        self._remaining = compressed_size
+        if self._member["selected"]:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._file = open(path + ".part", "wb")
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if method == _DEFLATED else None
+        return True
+
+    def _read_data(self) -> bool:
+        if not self._buffer and self._remaining:
+            return False
+        size = min(self._remaining, len(self._buffer))
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self._remaining -= size
+        member = self._member
+        if member["selected"]:
+            if self._decompressor is not None:
+                data = self._decompressor.decompress(data)
+                if not self._remaining:
+                    data += self._decompressor.flush()
+            self._write(data)
+        if not self._remaining:
+            self._finish_member()
+        return True
+
+    def _write(self, data: bytes) -> None:
+        member = self._member
+        member["crc_so_far"] = zlib.crc32(data, member["crc_so_far"])
+        member["written"] += len(data)
+        self._file.write(data)
+
+    def _finish_member(self) -> None:
+        member = self._member
+        if member["selected"]:
+            self._file.close()
+            self._file = None
+            if member["crc_so_far"] != member["crc"] or member["written"] != member["size"]:
+                self._fail()
+                return
+            os.replace(member["path"] + ".part", member["path"])
+            self.extracted.append(member["path"])
+        self._member = None
+
+    def _member_path(self, name: str) -> Union[str, None]:
+        """The path to extract a member to, or None if it would be outside the destination directory"""
+        path = os.path.abspath(os.path.join(self.destination, name))
+        if os.path.isabs(name) or os.path.commonpath([path, self.destination]) != self.destination:
+            return None
+        return path
+
+    def _discard_member(self) -> None:
+        if getattr(self, "_file", None) is not None:
+            self._file.close()
+            if os.path.isfile(self._file.name):
+                os.remove(self._file.name)
+            self._file = None
+        self._member = None
+
+    def _fail(self) -> None:
+        self._discard_member()
+        self._buffer = bytearray()
+        self.failed = True
+
+
+def extract_archive(archive_path: Union[str, Path],
+                    include: Callable[[str], bool],
+                    executor: ThreadPoolExecutor,
+                    workers: int) -> List[Future]:
+    """
+    Extracts the selected members of a downloaded zip archive into its extraction_dir, split between up to `workers`
+    tasks on the executor. Members are balanced between the tasks by size
+
+    Args:
+        archive_path (Union[str, Path]): The zip archive
+        include (Callable[[str], bool]): Selects which members to extract, see member_filter
+        executor (ThreadPoolExecutor): The pool to run the extraction tasks in
+        workers (int): Maximum number of tasks to split the archive between
+
+    Returns:
+        list: A future for each task, each resulting in the list of paths it extracted
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        members = sorted((info for info in archive.infolist() if not info.is_dir() and include(info.filename)),
+                         key=lambda info: info.file_size, reverse=True)
+    groups = [[] for _ in range(max(1, min(workers, len(members))))]
+    sizes = [0] * len(groups)
+    for info in members:
+        smallest = sizes.index(min(sizes))
+        groups[smallest].append(info.filename)
+        sizes[smallest] += info.file_size
+    return [executor.submit(_extract_members, archive_path, names) for names in groups if names]
+
+
+def _extract_members(archive_path: Union[str, Path], names: List[str]) -> List[str]:
+    # each task opens the archive itself, so that tasks don't share a file position
+    with zipfile.ZipFile(archive_path) as archive:
+        return [archive.extract(name, extraction_dir(archive_path)) for name in names]
@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import Union
+
+from osdatahub.cache import default_cache_dir
+
+# ioctl request cloning one file's extents into another (Linux: Btrfs, XFS, OCFS2 and others)
+_FICLONE = 0x40049409
+
+
+class ContentStore:
+    """
+    A local store of downloaded files, kept once each under their MD5 checksum and size, so that downloading the
+    same product to several directories, or a new version of it that shares files with the last, doesn't download
+    or store the files again.
+
+    Files are copied out of the store as reflinks (copy-on-write clones) where the file system supports them, and
+    otherwise as hardlinks, falling back to copying when the store is on a different device. Hardlinked files share
+    their contents with the store, so they should be treated as read-only: editing one in place edits every copy.
+
+    Args:
+        path (Union[str, Path], optional): Directory of the store. Defaults to "mirror" in $OSDATAHUB_CACHE_DIR, or in
+            ~/.cache/osdatahub if that isn't set
+
+    Example::
+
+        from osdatahub import OpenDataDownload
+
+        # the second download is linked from the store, without using the network
+        OpenDataDownload("OpenRoads").download("project_a", file_format="GeoPackage", mirror=True)
+        OpenDataDownload("OpenRoads").download("project_b", file_format="GeoPackage", mirror=True)
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path is not None else default_cache_dir() / "mirror"
+
+    def object_path(self, md5: str, size: int) -> Path:
+        """The path a file with the given checksum and size is stored at"""
+        md5 = md5.lower()
+        return self.path / "objects" / md5[:2] / f"{md5}-{size}"
+
+    def has(self, md5: str, size: int) -> bool:
+        """Whether the store has a file with the given checksum and size"""
+        path = self.object_path(md5, size)
+        return path.is_file() and path.stat().st_size == size
+
+    def add(self, path: Union[str, Path], md5: str, size: int, verified: bool = False) -> bool:
+        """
+        Adds a file to the store, linking it in if possible rather than copying it. Nothing is done if the store
+        already has the file
+
+        Args:
+            path (Union[str, Path]): The file to add
+            md5 (str): The file's expected MD5 checksum
+            size (int): The file's expected size in bytes
+            verified (bool, optional): Whether the file is already known to match md5, so it needn't be read to
+                check. Defaults to False
+
+        Returns:
+            bool: Whether the file is in the store. False if it didn't match md5 and size
+        """
+        if self.has(md5, size):
+            return True
+        if os.path.getsize(path) != size or (not verified and _md5(path) != md5.lower()):
+            logging.warning(f"Not adding {path} to the content store as it doesn't match its expected checksum")
+            return False
+        object_path = self.object_path(md5, size)
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        # other processes may be adding the same file, so it is only moved into place once complete
+        temp_path = f"{object_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            _link(path, temp_path, reflink=False)
+            os.replace(temp_path, object_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return True
+
+    def materialise(self, md5: str, size: int, destination: Union[str, Path]) -> bool:
+        """
+        Creates destination from the stored file with the given checksum and size, replacing any file already there
+
+        Args:
+            md5 (str): The file's MD5 checksum
+            size (int): The file's size in bytes
+            destination (Union[str, Path]): Where to create the file
+
+        Returns:
+            bool: Whether the file was in the store
+        """
+        if not self.has(md5, size):
+            return False
+        temp_path = f"{destination}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            _link(self.object_path(md5, size), temp_path, reflink=True)
+            os.replace(temp_path, destination)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return True
+
+
+def _link(source: Union[str, Path], destination: str, reflink: bool) -> None:
+    """Creates destination as a reflink of source if asked and possible, otherwise a hardlink, otherwise a copy"""
+    if reflink and _reflink(source, destination):
+        return
+    try:
+        os.link(source, destination)
+    except OSError:
+        # e.g. a different device, or a file system without hardlinks
+        shutil.copyfile(source, destination)
+
+
+def _reflink(source: Union[str, Path], destination: str) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        return True
+    except OSError:
+        if os.path.exists(destination):
+            os.remove(destination)
+        return False
+
+
+def _md5(path: Union[str, Path]) -> str:
+    hasher = hashlib.md5(usedforsecurity=False)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
@@ -1,13 +1,15 @@
+import asyncio
 from pathlib import Path
 from typing import Union
 
 import requests
-from typeguard import typechecked
 
-import osdatahub
 from osdatahub.codes import AREA_CODES
+from osdatahub.typecheck import typechecked
 
-from .downloads_api import _DownloadObj, _DownloadsAPIBase
+from .downloads_api import DEFAULT_SEGMENT_SIZE, DEFAULT_SEGMENTS, _DownloadObj, _DownloadsAPIBase
+from .mirror import ContentStore
+from .telemetry import DownloadTelemetry
 
 
 class OpenDataDownload(_DownloadsAPIBase):
@@ -56,13 +58,13 @@ class OpenDataDownload(_DownloadsAPIBase):
         if area:
             params.update({"area": area})
 
-        response = osdatahub.get(url=self._endpoint(f"{self._id}/downloads"), params=params, proxies=osdatahub.get_proxies())
-        response.raise_for_status()
+        content = self._get_catalogue("downloads", self._endpoint(f"{self._id}/downloads"), params)
         if return_downloadobj:
-            return [_DownloadObj(url=download["url"], file_name=download["fileName"], size=download["size"])
-                    for download in response.json()]
+            return [_DownloadObj(url=download["url"], file_name=download["fileName"], size=download["size"],
+                                 md5=download.get("md5"))
+                    for download in content]
         else:
-            return response.json()
+            return content
 
     def download(self, 
                  output_dir: Union[str, Path] = ".",
@@ -72,7 +74,12 @@ class OpenDataDownload(_DownloadsAPIBase):
                  area: Union[str, None] = None,
                  download_multiple: bool = False,
                  overwrite: bool = False,
-                 processes: Union[int, None] = None) -> list:
+                 processes: Union[int, None] = None,
+                 segments: int = DEFAULT_SEGMENTS,
+                 segment_size: int = DEFAULT_SEGMENT_SIZE,
+                 extract: Union[bool, str, list] = False,
+                 telemetry: Union[DownloadTelemetry, None] = None,
+                 mirror: Union[bool, str, Path, ContentStore] = False) -> list:
         """
         Downloads Product files to your local machine
 
@@ -87,8 +94,20 @@ class OpenDataDownload(_DownloadsAPIBase):
             download_multiple (bool, optional): whether to download multiple files if multiple products are within your
                 search criteria. Defaults to False
             overwrite (bool, optional): whether to overwrite existing files. Defaults to False
-            processes (int, optional): Number of processes with which to download multiple files. Only relevant if
-                multiple files will be downloaded (and download_multiple is set to True)
+            processes (int, optional): Maximum number of files to download at once. Only relevant if multiple files
+                will be downloaded (and download_multiple is set to True). Defaults to the limit of the process-wide
+                DownloadScheduler
+            segments (int, optional): Number of connections to download each file larger than segment_size over. Set
+                to 1 to download every file over a single connection. Defaults to 4
+            segment_size (int, optional): Size in bytes of each segment of a large file. Defaults to 64MB
+            extract (Union[bool, str, list], optional): Whether to extract zip archives as they download, into a
+                directory named after each archive. Either True to extract everything, or glob pattern(s) selecting
+                the members to extract, e.g. "*.gpkg". Defaults to False
+            telemetry (DownloadTelemetry, optional): Records the throughput, time to first byte, retries and 429
+                responses of each file, and passes them to its callbacks. Defaults to None
+            mirror (Union[bool, str, Path, ContentStore], optional): Whether to keep the files in a content store
+                shared between directories, linking them into output_dir instead of downloading them again. Either
+                True for the default store, the directory of a store, or a ContentStore. Defaults to False
         """
         download_list = self.product_list(file_name=file_name, file_format=file_format, file_subformat=file_subformat,
                                           area=area, return_downloadobj=True)
@@ -96,4 +115,63 @@ class OpenDataDownload(_DownloadsAPIBase):
                                  output_dir=output_dir,
                                  overwrite=overwrite,
                                  download_multiple=download_multiple,
-                                 processes=processes)
+                                 processes=processes,
+                                 segments=segments,
+                                 segment_size=segment_size,
+                                 extract=extract,
+                                 group=self.id,
+                                 telemetry=telemetry,
+                                 store=self.__store(mirror))
+
+    async def download_async(self,
+                             output_dir: Union[str, Path] = ".",
+                             file_name: Union[str, None] = None,
+                             file_format: Union[str, None] = None,
+                             file_subformat: Union[str, None] = None,
+                             area: Union[str, None] = None,
+                             download_multiple: bool = False,
+                             overwrite: bool = False,
+                             max_connections: int = 50,
+                             write_workers: int = 4,
+                             telemetry: Union[DownloadTelemetry, None] = None) -> list:
+        """
+        Downloads Product files to your local machine using asyncio, so that many files (e.g. a product split into
+        tiles) can download at once without a thread each. Requires aiohttp (pip install osdatahub[async])
+
+        Args:
+            output_dir (Union[str, Path], optional): the path where the downloaded files will be saved. Defaults to
+                current working directory
+            file_name (str, optional): name of the file(s) to download
+            file_format (str, optional): format of the file(s) to download
+            file_subformat (str, optional): subformat of the file(s) to download
+            area (str, optional): The area that the file must cover. Available values can be found in
+                osdatahub.codes.AREA_CODES
+            download_multiple (bool, optional): whether to download multiple files if multiple products are within your
+                search criteria. Defaults to False
+            overwrite (bool, optional): whether to overwrite existing files. Defaults to False
+            max_connections (int, optional): Maximum number of files to download at once, also capped by the
+                process-wide DownloadScheduler. Defaults to 50
+            write_workers (int, optional): Number of threads writing the files to disk. Defaults to 4
+            telemetry (DownloadTelemetry, optional): Records the throughput, time to first byte, retries and 429
+                responses of each file, and passes them to its callbacks. Defaults to None
+        """
+        download_list = await asyncio.to_thread(self.product_list, file_name=file_name, file_format=file_format,
+                                                file_subformat=file_subformat, area=area, return_downloadobj=True)
+        if len(download_list) > 1 and not download_multiple:
+            raise Exception("Argument \"download_list\" contains more than 1 object to download, but argument "
+                            "\"download_multiple\" is set to False. Please pass only 1 download or set "
+                            "\"download_multiple\" to True.")
+        return await super()._download_async(download_list=download_list,
+                                             output_dir=output_dir,
+                                             overwrite=overwrite,
+                                             max_connections=max_connections,
+                                             write_workers=write_workers,
+                                             telemetry=telemetry)
+
+    @staticmethod
+    def __store(mirror: Union[bool, str, Path, ContentStore]) -> Union[ContentStore, None]:
+        if isinstance(mirror, ContentStore):
+            return mirror
+        if mirror is False:
+            return None
+        return ContentStore(None if mirror is True else mirror)
@@ -0,0 +1,288 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Union
+
+ORDERS = ("largest", "smallest")
+_UNCHANGED = object()
+
+
+class DownloadScheduler:
+    """
+    Schedules the files and connections of every download in the process, so that downloading several products at
+    once shares one set of limits instead of each product having its own pool of threads.
+
+    The scheduler provides:
+
+    1. A cap on the number of files being downloaded, and on the number of open connections (a segmented download
+       uses several connections for one file)
+    2. A cap on the total bandwidth used, shared between connections with a token bucket
+    3. Ordering of queued files, either largest first (so the longest download starts first) or smallest first (so
+       the most files finish soonest), taking turns between products so that one large product doesn't hold up the
+       others
+    4. A shared back off: when the API responds with 429 (Too Many Requests) no new connections start until the
+       pause is over, and the connection cap is halved, growing back by one with each successful request
+
+    Every download uses the process-wide scheduler returned by get_scheduler, which can be adjusted with
+    DownloadScheduler.configure. The AsyncDownloadEngine takes its connections and bandwidth from the same scheduler,
+    through async_connection and async_throttle, so synchronous and asynchronous downloads share the limits.
+
+    Args:
+        max_connections (int, optional): Maximum number of open connections, and of files downloading at once.
+            Defaults to 8
+        max_bandwidth (float, optional): Maximum total download rate in bytes per second. Defaults to None (no limit)
+        order (str, optional): Which queued files to download first, either "largest" or "smallest". Defaults to
+            "largest"
+
+    Example::
+
+        from osdatahub.DownloadsAPI.scheduler import get_scheduler
+
+        get_scheduler().configure(max_connections=16, max_bandwidth=50 * 1024 ** 2)
+    """
+    ASYNC_POLL_INTERVAL = 0.05
+
+    def __init__(self, max_connections: int = 8, max_bandwidth: Union[float, None] = None, order: str = "largest"):
+        self._condition = threading.Condition()
+        self._queues: Dict[Any, list] = {}
+        self._groups: deque = deque()
+        self._running: Dict[Any, int] = {}
+        self._running_total = 0
+        self._workers = 0
+        self._sequence = itertools.count()
+        self._active_connections = 0
+        self._resume_time = 0.0
+        self._bucket_lock = threading.Lock()
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+        self.max_connections = 0
+        self._connection_limit = 0
+        self.max_bandwidth = None
+        self.order = "largest"
+        self.configure(max_connections, max_bandwidth, order)
+
+    def configure(self,
+                  max_connections: Union[int, None] = None,
+                  max_bandwidth: Union[float, None] = _UNCHANGED,
+                  order: Union[str, None] = None) -> None:
+        """
+        Changes the limits of the scheduler. Arguments that aren't given are unchanged
+
+        Args:
+            max_connections (int, optional): Maximum number of open connections, and of files downloading at once
+            max_bandwidth (float, optional): Maximum total download rate in bytes per second. None or 0 removes the
+                limit
+            order (str, optional): Which queued files to download first, either "largest" or "smallest"
+        """
+        if max_connections is not None and max_connections < 1:
+            raise ValueError(f"max_connections must be at least 1, got {max_connections}")
+        if max_bandwidth is not _UNCHANGED and max_bandwidth is not None and max_bandwidth < 0:
+            raise ValueError(f"max_bandwidth must not be negative, got {max_bandwidth}")
+        if order is not None and order not in ORDERS:
+            raise ValueError(f"order must be one of {ORDERS}, got {order}")
+        with self._condition:
+            if max_connections is not None:
+                self.max_connections = max_connections
+                self._connection_limit = max_connections
+            if order is not None and order != self.order:
+                self.order = order
+                for queue in self._queues.values():
+                    queue[:] = [(-size, sequence, job) for size, sequence, job in queue]
+                    heapq.heapify(queue)
+            self._condition.notify_all()
+        if max_bandwidth is _UNCHANGED:
+            return
+        with self._bucket_lock:
+            self.max_bandwidth = max_bandwidth or None
+            self._tokens = max_bandwidth or 0.0
+            self._last_refill = time.monotonic()
+
+    def submit(self,
+               fn: Callable,
+               *args,
+               size: int = 0,
+               group: Any = None,
+               max_running: Union[int, None] = None,
+               **kwargs) -> Future:
+        """
+        Queues a file download
+
+        Args:
+            fn (Callable): Function downloading the file, called with args and kwargs
+            size (int, optional): Size of the file in bytes, used to order the queue. Defaults to 0
+            group (Any, optional): The product the file belongs to. Queued files are taken from each group in turn.
+                Defaults to None
+            max_running (int, optional): Maximum number of files from this group to download at once. Defaults to
+                None (only limited by max_connections)
+
+        Returns:
+            Future: The result of fn
+        """
+        future = Future()
+        job = (fn, args, kwargs, future, group, max_running)
+        with self._condition:
+            priority = -size if self.order == "largest" else size
+            queue = self._queues.setdefault(group, [])
+            if not queue:
+                self._groups.append(group)
+            heapq.heappush(queue, (priority, next(self._sequence), job))
+            if self._workers < self.max_connections:
+                self._workers += 1
+                threading.Thread(target=self._work, daemon=True, name="osdatahub-download").start()
+            self._condition.notify_all()
+        return future
+
+    def _next_job(self) -> Union[tuple, None]:
+        """Takes the next job that may start, moving its group to the back of the line. Called with the lock held"""
+        if self._running_total >= self.max_connections:
+            return None
+        for _ in range(len(self._groups)):
+            group = self._groups[0]
+            self._groups.rotate(-1)
+            queue = self._queues[group]
+            max_running = queue[0][2][5]
+            if max_running is not None and self._running.get(group, 0) >= max_running:
+                continue
+            job = heapq.heappop(queue)[2]
+            if not queue:
+                del self._queues[group]
+                self._groups.remove(group)
+            return job
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    self._condition.wait()
+                    job = self._next_job()
+                fn, args, kwargs, future, group, _ = job
+                self._running[group] = self._running.get(group, 0) + 1
+                self._running_total += 1
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as exc:
+                        future.set_exception(exc)
+            finally:
+                with self._condition:
+                    self._running[group] -= 1
+                    self._running_total -= 1
+                    self._condition.notify_all()
+
+    @contextmanager
+    def connection(self) -> Iterator[None]:
+        """
+        Waits for a free connection, and for any pause to end, then holds the connection until the block exits
+        """
+        with self._condition:
+            wait = self._try_connect()
+            while wait is not None:
+                self._condition.wait(wait or None)
+                wait = self._try_connect()
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            self._disconnect(succeeded)
+
+    @asynccontextmanager
+    async def async_connection(self) -> AsyncIterator[None]:
+        """
+        The same as connection, for use on an asyncio event loop. Waits without blocking the loop, checking for a
+        free connection every ASYNC_POLL_INTERVAL seconds
+        """
+        while True:
+            with self._condition:
+                wait = self._try_connect()
+            if wait is None:
+                break
+            await asyncio.sleep(wait or self.ASYNC_POLL_INTERVAL)
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            self._disconnect(succeeded)
+
+    def _try_connect(self) -> Union[float, None]:
+        """
+        Takes a connection if one is free and there is no pause. Otherwise returns how long the pause has left, or 0
+        if waiting for a connection. Called with the lock held
+        """
+        wait = self._resume_time - time.monotonic()
+        if wait > 0:
+            return wait
+        if self._active_connections >= self._connection_limit:
+            return 0
+        self._active_connections += 1
+        return None
+
+    def _disconnect(self, succeeded: bool) -> None:
+        with self._condition:
+            self._active_connections -= 1
+            if succeeded:
+                self._connection_limit = min(self.max_connections, self._connection_limit + 1)
+            self._condition.notify_all()
+
+    def throttle(self, size: int) -> None:
+        """Accounts for size bytes having been received, sleeping if that goes over the bandwidth cap"""
+        wait = self._take_tokens(size)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def async_throttle(self, size: int) -> None:
+        """The same as throttle, for use on an asyncio event loop"""
+        wait = self._take_tokens(size)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _take_tokens(self, size: int) -> float:
+        """Takes size bytes from the bandwidth bucket, returning how long to wait for it to refill"""
+        with self._bucket_lock:
+            if not self.max_bandwidth:
+                return 0
+            now = time.monotonic()
+            self._tokens = min(self.max_bandwidth, self._tokens + (now - self._last_refill) * self.max_bandwidth)
+            self._last_refill = now
+            self._tokens -= size
+            return -self._tokens / self.max_bandwidth if self._tokens < 0 else 0
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops any new connections from starting for the given number of seconds and halves the connection cap,
+        e.g. after a 429 (Too Many Requests) response
+
+        Args:
+            seconds: How long to pause for
+        """
+        with self._condition:
+            self._resume_time = max(self._resume_time, time.monotonic() + seconds)
+            self._connection_limit = max(1, self._connection_limit // 2)
+            self._condition.notify_all()
+
+    @property
+    def connection_limit(self) -> int:
+        """The current connection cap, which is lowered after a 429 response and recovers with successful requests"""
+        return self._connection_limit
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> DownloadScheduler:
+    """Returns the scheduler shared by every download in the process, creating it on first use"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = DownloadScheduler()
+        return _scheduler
@@ -0,0 +1,177 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Union
+
+from tqdm import tqdm
+
+EVENTS = ("start", "progress", "first_byte", "retry", "throttled", "finish", "error")
+
+
+@dataclass
+class FileStats:
+    """
+    Measurements of the download of a single file.
+
+    received counts the bytes that came over the network, so a resumed download's throughput isn't inflated by the
+    part it already had, while position is how much of the file has been downloaded, including that part.
+    """
+
+    file_name: str
+    size: Union[int, None] = None
+    position: int = 0
+    received: int = 0
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    throttle_wait: float = 0.0
+    first_byte_times: List[float] = field(default_factory=list)
+    started: Union[float, None] = None
+    finished: Union[float, None] = None
+    path: Union[str, None] = None
+    error: Union[str, None] = None
+    url: Union[str, None] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the download started, or that it took if it has finished"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Average download rate so far"""
+        return self.received / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def time_to_first_byte(self) -> Union[float, None]:
+        """Seconds between sending the first request for the file and receiving its first byte"""
+        return self.first_byte_times[0] if self.first_byte_times else None
+
+
+class DownloadTelemetry:
+    """
+    Collects measurements of downloads, to show whether slow downloads are limited by the network or by the server:
+    the throughput of each file and of all of them together, the time to first byte of each request, retries, and
+    how long was spent waiting after 429 (Too Many Requests) responses.
+
+    Callbacks are called with the name of the event and the FileStats of the file, from the thread (or event loop)
+    downloading it, so they should return quickly. Events are "start", "progress", "first_byte", "retry",
+    "throttled", "finish" and "error".
+
+    Args:
+        *callbacks (Callable[[str, FileStats], None]): Functions to call on each event
+
+    Example::
+
+        from osdatahub import OpenDataDownload
+        from osdatahub.DownloadsAPI import DownloadTelemetry
+
+        def log_slow_files(event, stats):
+            if event == "finish" and stats.bytes_per_second < 1024 ** 2:
+                print(f"{stats.file_name}: {stats.bytes_per_second:.0f} B/s, TTFB {stats.time_to_first_byte:.2f}s")
+
+        telemetry = DownloadTelemetry(log_slow_files)
+        OpenDataDownload("OpenRoads").download("roads", download_multiple=True, telemetry=telemetry)
+        print(telemetry.summary())
+    """
+
+    def __init__(self, *callbacks: Callable[[str, FileStats], None]):
+        self.callbacks = list(callbacks)
+        # keyed by URL, as products and versions can have files of the same name
+        self.files: Dict[str, FileStats] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable[[str, FileStats], None]) -> None:
+        """Adds a function to call on each event"""
+        self.callbacks.append(callback)
+
+    def file(self, file_name: str, size: Union[int, None] = None, url: Union[str, None] = None) -> FileStats:
+        """
+        Returns the stats of a file, creating them if this is the first time it has been seen
+
+        Args:
+            file_name (str): The name of the file
+            size (int, optional): The expected size of the file in bytes. Defaults to None
+            url (str, optional): Where the file is downloaded from, without the API key, which identifies the file
+                in files. Defaults to None, which identifies it by its name
+
+        Returns:
+            FileStats: The stats of the file
+        """
+        key = url or file_name
+        with self._lock:
+            if key not in self.files:
+                self.files[key] = FileStats(file_name, size or None, url=url)
+            return self.files[key]
+
+    def emit(self, event: str, stats: FileStats) -> None:
+        """Passes an event to the callbacks"""
+        for callback in self.callbacks:
+            callback(event, stats)
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Average download rate of all files together, from the first file starting until now or the last finishing"""
+        with self._lock:
+            files = list(self.files.values())
+        started = [stats.started for stats in files if stats.started is not None]
+        if not started:
+            return 0.0
+        running = any(stats.finished is None for stats in files if stats.started is not None)
+        end = time.monotonic() if running else max(stats.finished for stats in files if stats.finished is not None)
+        elapsed = end - min(started)
+        return sum(stats.received for stats in files) / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> dict:
+        """
+        Returns the totals across every file
+
+        Returns:
+            dict: The numbers of files, completed files and failed files, bytes received, aggregate bytes per second,
+            mean time to first byte, requests, retries, 429 responses and seconds spent waiting after them
+        """
+        with self._lock:
+            files = list(self.files.values())
+        first_byte_times = [t for stats in files for t in stats.first_byte_times]
+        return {
+            "files": len(files),
+            "completed": sum(1 for stats in files if stats.finished is not None and stats.error is None),
+            "failed": sum(1 for stats in files if stats.error is not None),
+            "bytes_received": sum(stats.received for stats in files),
+            "bytes_per_second": self.bytes_per_second,
+            "time_to_first_byte": sum(first_byte_times) / len(first_byte_times) if first_byte_times else None,
+            "requests": sum(stats.requests for stats in files),
+            "retries": sum(stats.retries for stats in files),
+            "throttled": sum(stats.throttled for stats in files),
+            "throttle_wait": sum(stats.throttle_wait for stats in files),
+        }
+
+
+class TqdmReporter:
+    """
+    Telemetry callback showing the progress of downloads in a tqdm progress bar. If no bar is given, one is created
+    for the first file to start
+
+    Args:
+        pbar (tqdm, optional): The progress bar to update. Defaults to None
+    """
+
+    def __init__(self, pbar: Union[tqdm, None] = None):
+        self.pbar = pbar
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: str, stats: FileStats) -> None:
+        with self._lock:
+            if self.pbar is None:
+                if event not in ("start", "progress"):
+                    return
+                self.pbar = tqdm(total=stats.size, desc=stats.file_name, unit="B", unit_scale=True, leave=True)
+            if event in ("start", "progress"):
+                key = stats.url or stats.file_name
+                self.pbar.update(stats.position - self._positions.get(key, 0))
+                self._positions[key] = stats.position
+            elif event == "finish":
+                self.pbar.write(f"Finished downloading {stats.file_name} to {stats.path}")
@@ -1 +1,10 @@
-from osdatahub.FeaturesAPI.features_api import FeaturesAPI
+from typing import TYPE_CHECKING
+
+from osdatahub._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "FeaturesAPI": "osdatahub.FeaturesAPI.features_api",
+})
+
+if TYPE_CHECKING:
+    from osdatahub.FeaturesAPI.features_api import FeaturesAPI
@@ -3,8 +3,6 @@ import warnings
 
 import requests
 from geojson import FeatureCollection
-from typeguard import typechecked
-
 import osdatahub
 from osdatahub.extent import Extent
 from osdatahub.errors import raise_http_error
@@ -13,7 +11,8 @@ from osdatahub.FeaturesAPI.feature_products import (get_product,
 from osdatahub.filters import Filter
 from osdatahub.grow_list import GrowList
 from osdatahub.spatial_filter_types import SpatialFilterTypes
-from osdatahub.utils import features_to_geojson, is_new_api
+from osdatahub.typecheck import typechecked
+from osdatahub.utils import features_to_geojson, is_new_api, validate_type
 
 class FeaturesAPI:
     """Main class for querying the OS Features API (https://osdatahub.os.uk/docs/wfs/overview)
@@ -93,6 +92,7 @@ class FeaturesAPI:
         Returns:
             FeatureCollection: The results of the query in GeoJSON format
         """
+        validate_type(limit, int, "limit")
 
         params = self.__params
         data = GrowList()
@@ -103,7 +103,7 @@ class FeaturesAPI:
         try:
             while n_required > 0 and data.grown:
                 params.update({"count": n_required, "startIndex": len(data)})
-                response = osdatahub.get(self.ENDPOINT, params=params, proxies=osdatahub.get_proxies())
+                response = osdatahub.get(self.ENDPOINT, params=params)
                 resp_json = response.json()
                 if "fault" in resp_json:
                     raise_http_error(response)
@@ -1 +1,12 @@
-from osdatahub.LinkedIdentifiersAPI.linked_identifiers_api import LinkedIdentifiersAPI
+from typing import TYPE_CHECKING
+
+from osdatahub._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "LinkedIdentifiersAPI": "osdatahub.LinkedIdentifiersAPI.linked_identifiers_api",
+    "LinkedIdentifierGraph": "osdatahub.LinkedIdentifiersAPI.graph",
+})
+
+if TYPE_CHECKING:
+    from osdatahub.LinkedIdentifiersAPI.linked_identifiers_api import LinkedIdentifiersAPI
+    from osdatahub.LinkedIdentifiersAPI.graph import LinkedIdentifierGraph
@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass
+class LinkedIdentifierGraph:
+    """
+    Adjacency structure built by LinkedIdentifiersAPI.traverse.
+
+    nodes maps every identifier reached to its "identifierType", "featureType" and "depth" (the number of links
+    from the nearest seed). edges maps an identifier to its linked identifiers, each with the correlation method
+    that links them. Only identifiers that were looked up have edges.
+    """
+
+    nodes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    edges: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    def add_node(self, identifier: str, identifier_type: str, feature_type: str, depth: int) -> bool:
+        """Adds a node if it isn't already in the graph. Returns whether it was added"""
+        if identifier in self.nodes:
+            return False
+        self.nodes[identifier] = {"identifierType": identifier_type, "featureType": feature_type, "depth": depth}
+        return True
+
+    def add_edge(self, identifier: str, linked_identifier: str, correlation_method: str) -> None:
+        """Adds a link from one identifier to another"""
+        self.edges.setdefault(identifier, {})[linked_identifier] = correlation_method
+
+    def neighbours(self, identifier: str) -> List[str]:
+        """Returns the identifiers linked to an identifier"""
+        return list(self.edges.get(identifier, {}))
+
+    def find(self, identifier_type: str) -> List[str]:
+        """Returns every identifier of the given identifier type (e.g. "USRN") in the graph"""
+        return [identifier for identifier, node in self.nodes.items() if node["identifierType"] == identifier_type]
@@ -1,12 +1,18 @@
-from typing import Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Union
 
 import requests
-from typeguard import typechecked
 
 import osdatahub
+from osdatahub.cache import PersistentCache
 from osdatahub.errors import raise_http_error
+from osdatahub.LinkedIdentifiersAPI.graph import LinkedIdentifierGraph
 from osdatahub.LinkedIdentifiersAPI.linked_identifier_options import (
     correlation_methods, feature_types, identifier_types)
+from osdatahub.rate_limiter import ThreadedRateLimiter
+from osdatahub.typecheck import typechecked
 
 
 class LinkedIdentifiersAPI:
@@ -26,13 +32,16 @@ class LinkedIdentifiersAPI:
     """
 
     __ENDPOINT = r"https://api.os.uk/search/links/v1/"
+    __CACHE_WRITE_BATCH = 500
+    __IN_FLIGHT_PER_WORKER = 4
+    __RETRIES = 3
 
     def __init__(self, key: str):
         self.key = key
 
     @staticmethod
     def __request(endpoint: str) -> dict:
-        response = osdatahub.get(endpoint, proxies=osdatahub.get_proxies())
+        response = osdatahub.get(endpoint)
         if response.status_code != 200:
             raise_http_error(response)
         return response.json()
@@ -79,6 +88,220 @@ class LinkedIdentifiersAPI:
         endpoint = self.__get_endpoint(identifier, feature_type, identifier_type)
         return self.__request(endpoint)
 
+    @typechecked
+    def query_many(
+            self,
+            identifiers: Iterable,
+            feature_type: Union[str, None] = None,
+            identifier_type: Union[str, None] = None,
+            cache: Union[str, Path, PersistentCache, None] = None,
+            max_concurrent: int = 5,
+            request_delay: float = 0.1,
+    ) -> dict:
+        """Looks up the linked identifiers of many identifiers at once. Duplicate identifiers are only looked up
+        once, and the lookups are run in parallel while sharing a single rate limit.
+
+        If a cache is given, results are stored in it as they arrive and identifiers that are already in it are
+        not requested again, so an interrupted or repeated linkage job only fetches identifiers it hasn't seen
+        before. Identifiers that the API doesn't recognise (404 Not Found) are returned, and cached, as None.
+
+        Args:
+            identifiers (Iterable[Union[int, str]]): The identifiers to look up.
+            feature_type (str): Look up linked identifiers when the input feature type is known.
+            identifier_type (str): Look up linked identifiers when the input identifier type is known.
+            cache (Union[str, Path, PersistentCache], optional): A PersistentCache, or the path of the file to keep
+                one in. Defaults to None (results are not kept after the call)
+            max_concurrent (int, optional): Maximum number of requests running at once. Defaults to 5
+            request_delay (float, optional): Minimum delay in seconds between requests. Defaults to 0.1
+
+        Returns:
+            dict: The results of the query in JSON format, keyed by identifier
+        """
+        # validates feature_type and identifier_type before anything is requested
+        self.__get_endpoint("", feature_type, identifier_type)
+        unique = {}
+        for identifier in identifiers:
+            unique.setdefault(str(identifier), identifier)
+
+        should_close = not isinstance(cache, PersistentCache)
+        if not isinstance(cache, PersistentCache):
+            cache = PersistentCache(cache, table="linked_identifiers")
+        try:
+            limiter = ThreadedRateLimiter(max_concurrent=max_concurrent, request_delay=request_delay)
+            with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+                results = self.__query_cached([(key, feature_type, identifier_type) for key in unique], cache,
+                                              executor, limiter, max_concurrent)
+        finally:
+            if should_close:
+                cache.close()
+        return {identifier: results[(key, feature_type, identifier_type)] for key, identifier in unique.items()}
+
+    def __query_cached(self, queries: list, cache: PersistentCache, executor: ThreadPoolExecutor,
+                       limiter: ThreadedRateLimiter, max_concurrent: int) -> dict:
+        """Looks up (identifier, feature_type, identifier_type) queries, taking the results the cache already has
+        and caching the rest as they arrive. Returns the results keyed by query. If any lookup fails, the others
+        still finish, and are cached, before the first error is raised"""
+        cache_keys = {query: f"{query[1]}/{query[2]}/{query[0]}" for query in queries}
+        cached = cache.get_many(cache_keys.values())
+        results = {query: cached[cache_key] for query, cache_key in cache_keys.items() if cache_key in cached}
+        missing = [query for query in queries if query not in results]
+
+        pending_writes = {}
+        error = None
+        try:
+            endpoints = ((query, self.__get_endpoint(*query)) for query in missing)
+            for query, result, e in self.__lookup(endpoints, executor, limiter,
+                                                  max_concurrent * self.__IN_FLIGHT_PER_WORKER):
+                if e is not None:
+                    error = error or e
+                    continue
+                results[query] = result
+                pending_writes[cache_keys[query]] = result
+                if len(pending_writes) >= self.__CACHE_WRITE_BATCH:
+                    cache.set_many(pending_writes)
+                    pending_writes = {}
+        finally:
+            if pending_writes:
+                cache.set_many(pending_writes)
+        if error is not None:
+            raise error
+        return results
+
+    @typechecked
+    def traverse(
+            self,
+            seeds: Iterable,
+            depth: int = 1,
+            target_identifier_type: Union[str, None] = None,
+            feature_type: Union[str, None] = None,
+            identifier_type: Union[str, None] = None,
+            methods: Union[Iterable, None] = None,
+            cache: Union[str, Path, PersistentCache, None] = None,
+            max_concurrent: int = 5,
+            request_delay: float = 0.1,
+    ) -> LinkedIdentifierGraph:
+        """Follows the links between identifiers breadth-first, starting from a set of seed identifiers, e.g.
+        UPRN -> TopographicArea TOID -> RoadLink TOID -> USRN.
+
+        Each level of the traversal is looked up in parallel, sharing one rate limit across the whole traversal, and
+        every identifier is only looked up once however many times it is reached.
+
+        Args:
+            seeds (Iterable[Union[int, str]]): The identifiers to start from.
+            depth (int, optional): The maximum number of links to follow from the seeds. Defaults to 1
+            target_identifier_type (str, optional): Stops following links at identifiers of this type (e.g. "USRN"),
+                which can then be found with LinkedIdentifierGraph.find. Defaults to None
+            feature_type (str): The feature type of the seeds, if known.
+            identifier_type (str): The identifier type of the seeds, if known.
+            methods (Iterable[str], optional): Only follow links made by these correlation methods. See
+                linked_identifier_options.correlation_methods for the possible values. Defaults to None (all)
+            cache (Union[str, Path, PersistentCache], optional): A PersistentCache, or the path of the file to keep
+                one in, as in query_many. Defaults to None
+            max_concurrent (int, optional): Maximum number of requests running at once. Defaults to 5
+            request_delay (float, optional): Minimum delay in seconds between requests. Defaults to 0.1
+
+        Returns:
+            LinkedIdentifierGraph: The identifiers reached and the links between them
+        """
+        if depth < 1:
+            raise ValueError(f"depth must be at least 1, got {depth}")
+        if target_identifier_type is not None:
+            identifier_types.validate(target_identifier_type)
+        if methods is not None:
+            methods = set(methods)
+            for method in methods:
+                correlation_methods.validate(method)
+
+        should_close = not isinstance(cache, PersistentCache)
+        if not isinstance(cache, PersistentCache):
+            cache = PersistentCache(cache, table="linked_identifiers")
+
+        graph = LinkedIdentifierGraph()
+        frontier = {}
+        for seed in seeds:
+            frontier[str(seed)] = (feature_type, identifier_type)
+            graph.add_node(str(seed), identifier_type, feature_type, 0)
+        # every level shares one rate limit and one pool, and the identifiers of a level are looked up together
+        # whatever their feature type
+        limiter = ThreadedRateLimiter(max_concurrent=max_concurrent, request_delay=request_delay)
+        try:
+            with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+                for level in range(depth):
+                    # identifiers reached through a link have a known feature type, so are looked up by it
+                    queries = [(identifier, *types) for identifier, types in frontier.items()]
+                    results = self.__query_cached(queries, cache, executor, limiter, max_concurrent)
+                    frontier = {}
+                    for query in queries:
+                        frontier.update(self.__expand(graph, query[0], results[query], level + 1, methods,
+                                                      target_identifier_type))
+                    if not frontier:
+                        break
+        finally:
+            if should_close:
+                cache.close()
+        return graph
+
+    @staticmethod
+    def __expand(graph: LinkedIdentifierGraph, identifier: str, result: Union[dict, None], depth: int,
+                 methods: Union[set, None], target_identifier_type: Union[str, None]) -> dict:
+        """Adds the links of a looked up identifier to the graph, returning the newly reached identifiers that
+        should be looked up next, along with their feature type"""
+        if result is None:
+            return {}
+        linked = result.get("linkedIdentifier", {})
+        node = graph.nodes[identifier]
+        node["identifierType"] = linked.get("identifierType", node["identifierType"])
+        node["featureType"] = linked.get("featureType", node["featureType"])
+
+        frontier = {}
+        for correlation in result.get("correlations", []):
+            method = correlation["correlationMethodIdentifier"]
+            if methods is not None and method not in methods:
+                continue
+            for correlated in correlation["correlatedIdentifiers"]:
+                linked_identifier = str(correlated["identifier"])
+                graph.add_edge(identifier, linked_identifier, method)
+                added = graph.add_node(linked_identifier, correlation["correlatedIdentifierType"],
+                                       correlation["correlatedFeatureType"], depth)
+                if added and correlation["correlatedIdentifierType"] != target_identifier_type:
+                    frontier[linked_identifier] = (correlation["correlatedFeatureType"], None)
+        return frontier
+
+    @classmethod
+    def __lookup(cls, endpoints: Iterable, executor: ThreadPoolExecutor, limiter: ThreadedRateLimiter,
+                 max_in_flight: int) -> Iterator[tuple]:
+        """Requests (key, endpoint) pairs on the executor, keeping at most max_in_flight requests queued or running
+        so that a very long input isn't turned into futures all at once. Yields (key, result, error) as each request
+        completes"""
+        endpoints = iter(endpoints)
+        in_flight = {executor.submit(cls.__limited_request, endpoint, limiter): key
+                     for key, endpoint in islice(endpoints, max_in_flight)}
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for lookup in done:
+                key = in_flight.pop(lookup)
+                try:
+                    result, error = lookup.result(), None
+                except Exception as e:
+                    result, error = None, e
+                yield key, result, error
+            for key, endpoint in islice(endpoints, len(done)):
+                in_flight[executor.submit(cls.__limited_request, endpoint, limiter)] = key
+
+    @classmethod
+    def __limited_request(cls, endpoint: str, limiter: ThreadedRateLimiter) -> Union[dict, None]:
+        for attempt in range(cls.__RETRIES):
+            with limiter:
+                response = osdatahub.get(endpoint)
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code == 404:
+                return None
+            if response.status_code in (429, 503) and attempt < cls.__RETRIES - 1:
+                limiter.pause(2 ** attempt)
+                continue
+            raise_http_error(response)
+
     @typechecked
     def product_version(self, correlation_method: str) -> dict:
         """Discover the current product version information. For a list of
@@ -1,2 +1,12 @@
-from .ngd_api import NGD
-from .async_ngd_api import AsyncNGD
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+from osdatahub._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "NGD": ".ngd_api",
+    "AsyncNGD": ".async_ngd_api",
+})
+
+if TYPE_CHECKING:
+    from .ngd_api import NGD
+    from .async_ngd_api import AsyncNGD
@@ -3,13 +3,13 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from typeguard import typechecked
-
-import osdatahub
 from osdatahub import Extent
 from osdatahub.AsyncAPI import AsyncHTTPClient
+from osdatahub.config import get_config
 from osdatahub.NGD.crs import get_crs
 from osdatahub.NGD.models import NGDFeatureCollection
+from osdatahub.typecheck import typechecked
+from osdatahub.utils import validate_type
 
 
 # TODO: check that this is more efficient - avoids having to do the copy each time like the synchonous version
@@ -54,9 +54,9 @@ class AsyncNGD:
         key: A valid OS Data Hub API key. Get a free key at https://osdatahub.os.uk/
         collection: ID for the desired NGD Feature Collection. See available collections at
             https://osdatahub.os.uk/docs/ofa/technicalSpecification
-        max_concurrent: Maximum concurrent requests (default: 5)
-        request_delay: Delay between requests in seconds (default: 0.3)
-        max_retries: Maximum retry attempts on failure (default: 3)
+        max_concurrent: Maximum concurrent requests (default: async_max_concurrent of the ClientConfig, 5)
+        request_delay: Delay between requests in seconds (default: async_request_delay of the ClientConfig, 0.1)
+        max_retries: Maximum retry attempts on failure (default: async_max_retries of the ClientConfig, 3)
 
     Example::
 
@@ -85,18 +85,19 @@ class AsyncNGD:
         self,
         key: str,
         collection: str,
-        max_concurrent: int = 5,
-        request_delay: float = 0.1,  # TODO: look at the OS throttling docs
-        max_retries: int = 3,
+        max_concurrent: Optional[int] = None,
+        request_delay: Optional[float] = None,  # TODO: look at the OS throttling docs
+        max_retries: Optional[int] = None,
     ) -> None:
         self.key: str = key
         self.collection: str = collection
         self._client: Optional[AsyncHTTPClient] = None
 
-        # Store config
-        self._max_concurrent = max_concurrent
-        self._request_delay = request_delay
-        self._max_retries = max_retries
+        # Store config, filling in the settings not given from the ClientConfig in use
+        config = get_config()
+        self._max_concurrent = config.async_max_concurrent if max_concurrent is None else max_concurrent
+        self._request_delay = config.async_request_delay if request_delay is None else request_delay
+        self._max_retries = config.async_max_retries if max_retries is None else max_retries
 
     def _get_client(self) -> AsyncHTTPClient:
         """Initialisation of HTTP client."""
@@ -105,7 +106,6 @@ class AsyncNGD:
                 max_concurrent=self._max_concurrent,
                 request_delay=self._request_delay,
                 max_retries=self._max_retries,
-                proxies=osdatahub.get_proxies(),
             )
         return self._client
 
@@ -140,7 +140,7 @@ class AsyncNGD:
 
         should_close = client is None
         if client is None:
-            client = AsyncHTTPClient(proxies=osdatahub.get_proxies())
+            client = AsyncHTTPClient()
 
         try:
             result = await client.get(cls.__ENDPOINT)
@@ -195,6 +195,8 @@ class AsyncNGD:
             AssertionError: If max_results <= 0 or offset < 0.
             ValueError: If start_datetime > end_datetime or CRS validation fails.
         """
+        validate_type(extent, (Extent, type(None)), "extent")
+        validate_type(max_results, (int, type(None)), "max_results")
 
         if max_results is not None and max_results <= 0:
             raise ValueError(f"max_results must be > 0, got {max_results}")
@@ -5,12 +5,12 @@ from datetime import datetime
 from typing import Union
 
 import requests
-from typeguard import typechecked
-
 import osdatahub
 from osdatahub import Extent
 from osdatahub.NGD.crs import get_crs
 from osdatahub.NGD.models import NGDFeatureCollection
+from osdatahub.typecheck import typechecked
+from osdatahub.utils import validate_type
 
 
 def _merge_geojsons(gj1: Union[dict], gj2: Union[dict]) -> Union[dict]:
@@ -82,7 +82,7 @@ class NGD:
         Returns:
             Dict: Dictionary containing all Feature Collections currently supported with details for each
         """
-        response = osdatahub.get(cls.__ENDPOINT, proxies=osdatahub.get_proxies())
+        response = osdatahub.get(cls.__ENDPOINT)
         response.raise_for_status()
         return response.json()
 
@@ -129,6 +129,8 @@ class NGD:
             Dict: The results of the query in GeoJSON format (if output_as_collection is set to False)
             NGDFeatureCollection: The results of the query in structured form (if output_as_collection is set to True)
         """
+        validate_type(extent, (Extent, type(None)), "extent")
+        validate_type(max_results, int, "max_results")
 
         assert max_results > 0, (
             f"Argument max_results must be greater than 0 but was {max_results}"
@@ -198,7 +200,6 @@ class NGD:
                     self.__endpoint(),
                     params=params,
                     headers=headers,
-                    proxies=osdatahub.get_proxies(),
                 )
                 response.raise_for_status()
             except requests.exceptions.HTTPError as e:
@@ -241,7 +242,6 @@ class NGD:
             self.__endpoint(feature_id),
             params=params,
             headers={"key": self.key},
-            proxies=osdatahub.get_proxies(),
         )
         response.raise_for_status()
 
@@ -1 +1,14 @@
-from osdatahub.NamesAPI.names_api import NamesAPI
+from typing import TYPE_CHECKING
+
+from osdatahub._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "NamesAPI": "osdatahub.NamesAPI.names_api",
+    "AsyncNamesAPI": "osdatahub.NamesAPI.async_names_api",
+    "NamesTypeahead": "osdatahub.NamesAPI.typeahead",
+})
+
+if TYPE_CHECKING:
+    from osdatahub.NamesAPI.names_api import NamesAPI
+    from osdatahub.NamesAPI.async_names_api import AsyncNamesAPI
+    from osdatahub.NamesAPI.typeahead import NamesTypeahead
@@ -0,0 +1,258 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from osdatahub.address_table import AddressTable
+from osdatahub.AsyncAPI import AsyncHTTPClient
+from osdatahub.config import get_config
+from osdatahub.extent import Extent
+from osdatahub.NamesAPI.names_api import NamesAPI
+from osdatahub.typecheck import typechecked
+from osdatahub.utils import addresses_to_geojson, validate_type
+
+
+class AsyncNamesAPI:
+    """
+    Async client for querying the OS Names API (https://osdatahub.os.uk/docs/names/overview)
+
+    This class provides async versions of the NamesAPI queries, fetching the pages of a query in parallel, along with
+    batch methods that run many queries concurrently. All queries made by one AsyncNamesAPI share a single pooled
+    HTTP session and rate limiter, so large batches are limited by the API rate limit rather than by latency.
+
+    Args:
+        key: A valid OS Data Hub API key. Get a free key at https://osdatahub.os.uk/
+        max_concurrent: Maximum concurrent requests (default: async_max_concurrent of the ClientConfig, 5)
+        request_delay: Delay between requests in seconds (default: async_request_delay of the ClientConfig, 0.1)
+        max_retries: Maximum retry attempts on failure (default: async_max_retries of the ClientConfig, 3)
+
+    Example::
+
+        from osdatahub import AsyncNamesAPI
+        import asyncio
+
+        async def main():
+            key = "your-api-key"
+
+            async with AsyncNamesAPI(key) as names:
+                results = await names.find("Buckingham Palace", limit=5)
+                batch = await names.find_many(["Southampton", "Exeter", "Leeds"], limit=1)
+
+        asyncio.run(main())
+    """
+
+    __ENDPOINT = r"https://api.os.uk/search/names/v1/"
+    __PAGE_SIZE = 100  # Names API max return per request
+
+    def __init__(
+        self,
+        key: str,
+        max_concurrent: Optional[int] = None,
+        request_delay: Optional[float] = None,
+        max_retries: Optional[int] = None,
+    ) -> None:
+        self.key: str = key
+        self._client: Optional[AsyncHTTPClient] = None
+
+        # Store config, filling in the settings not given from the ClientConfig in use
+        config = get_config()
+        self._max_concurrent = config.async_max_concurrent if max_concurrent is None else max_concurrent
+        self._request_delay = config.async_request_delay if request_delay is None else request_delay
+        self._max_retries = config.async_max_retries if max_retries is None else max_retries
+
+    def _get_client(self) -> AsyncHTTPClient:
+        """Initialisation of HTTP client."""
+        if self._client is None:
+            self._client = AsyncHTTPClient(
+                max_concurrent=self._max_concurrent,
+                request_delay=self._request_delay,
+                max_retries=self._max_retries,
+            )
+        return self._client
+
+    def _endpoint(self, api_name: str) -> str:
+        """Build endpoint URL."""
+        return self.__ENDPOINT + api_name
+
+    def _add_auth(self, params: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Add API key to query parameters. List values (e.g. fq filters) are repeated, the same as requests does."""
+        query = []
+        for name, value in params.items():
+            values = value if isinstance(value, list) else [value]
+            query.extend((name, str(v)) for v in values)
+        query.append(("key", self.key))
+        return query
+
+    @staticmethod
+    def _format_response(response: Dict) -> List[Dict]:
+        """Extract the gazetteer entries from a response, which has no results key if nothing was found."""
+        return [result["GAZETTEER_ENTRY"] for result in response.get("results", [])]
+
+    @staticmethod
+    def _format_output(entries: List[Dict], output_as_table: bool) -> Union[dict, AddressTable]:
+        if output_as_table:
+            return AddressTable("EPSG:27700", entries)
+        return addresses_to_geojson(entries, "EPSG:27700")
+
+    @typechecked
+    async def find(
+        self,
+        text: str,
+        limit: int = 100,
+        bounds: Optional[Extent] = None,
+        bbox_filter: Optional[Extent] = None,
+        local_type: Union[Iterable, str, None] = None,
+        output_as_table: bool = False,
+    ) -> Union[dict, AddressTable]:
+        """
+        Async free text query of the OS Names API.
+
+        The first page of results is fetched to find out how many results there are, then any remaining pages
+        are fetched in parallel.
+
+        Args:
+            text: The free text search parameter
+            limit: The maximum number of features to return (default: 100)
+            bounds: Biases the results to a certain area. Must be British National Grid (EPSG:27700) CRS
+            bbox_filter: Filters the results to a certain area. Must be British National Grid (EPSG:27700) CRS
+            local_type: Filters the results to certain local types. Available local types can be found at the
+                bottom of https://osdatahub.os.uk/docs/names/technicalSpecification
+            output_as_table: Returns the results as a compact AddressTable instead of GeoJSON (default: False)
+
+        Returns:
+            FeatureCollection or AddressTable with the results of the query.
+
+        Raises:
+            ValueError: If limit <= 0.
+            TypeError: If bounds or bbox_filter are not in EPSG:27700.
+        """
+        validate_type(text, str, "text")
+        validate_type(limit, int, "limit")
+        params = NamesAPI._find_params(text, limit, bounds, bbox_filter, local_type)
+        client = self._get_client()
+
+        first_page = await self._fetch_page(client, "find", {**params, "offset": 0,
+                                                             "maxresults": min(limit, self.__PAGE_SIZE)})
+        entries = self._format_response(first_page)
+        total = min(limit, first_page.get("header", {}).get("totalresults", len(entries)))
+
+        if len(entries) < min(limit, self.__PAGE_SIZE) or total <= len(entries):
+            return self._format_output(entries, output_as_table)
+
+        page_offsets = self._calculate_page_offsets(total, len(entries))
+        tasks = [
+            self._fetch_page(client, "find", {**params, "offset": page_offset, "maxresults": page_limit})
+            for page_offset, page_limit in page_offsets
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for i, result in enumerate(results):
+            if isinstance(result, BaseException):
+                logging.error(f"Page fetch failed for offset {page_offsets[i][0]}: {result}")
+                raise result
+            page_entries = self._format_response(result)
+            entries.extend(page_entries)
+            if len(page_entries) < page_offsets[i][1]:
+                break
+
+        return self._format_output(entries, output_as_table)
+
+    @typechecked
+    async def nearest(
+        self,
+        point: tuple,
+        radius: float = 100,
+        local_type: Union[Iterable, str, None] = None,
+        output_as_table: bool = False,
+    ) -> Union[dict, AddressTable]:
+        """
+        Async query for the closest name to a pair of coordinates (X, Y).
+
+        Args:
+            point: A set of coordinates in British National Grid (EPSG:27700) format
+            radius: The search radius in metres, min. 0.01, max. 1000 (default: 100)
+            local_type: Filters the results to certain local types. Available local types can be found at the
+                bottom of https://osdatahub.os.uk/docs/names/technicalSpecification
+            output_as_table: Returns the results as a compact AddressTable instead of GeoJSON (default: False)
+
+        Returns:
+            FeatureCollection or AddressTable with the results of the query.
+        """
+        validate_type(point, tuple, "point")
+        params = NamesAPI._nearest_params(point, radius, local_type)
+        response = await self._fetch_page(self._get_client(), "nearest", params)
+        return self._format_output(self._format_response(response), output_as_table)
+
+    async def find_many(
+        self,
+        texts: Sequence[str],
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> List[Union[dict, AddressTable, BaseException]]:
+        """
+        Runs a find query for every search text concurrently.
+
+        Args:
+            texts: The free text search parameters
+            return_exceptions: If True, a failed query puts its exception in the results instead of cancelling
+                the whole batch (default: False)
+            **kwargs: Any other arguments accepted by find, applied to every query
+
+        Returns:
+            List of results, in the same order as texts.
+        """
+        tasks = [self.find(text, **kwargs) for text in texts]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    async def nearest_many(
+        self,
+        points: Sequence[Tuple],
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> List[Union[dict, AddressTable, BaseException]]:
+        """
+        Runs a nearest query for every point concurrently.
+
+        Args:
+            points: Coordinates in British National Grid (EPSG:27700) format
+            return_exceptions: If True, a failed query puts its exception in the results instead of cancelling
+                the whole batch (default: False)
+            **kwargs: Any other arguments accepted by nearest, applied to every query
+
+        Returns:
+            List of results, in the same order as points.
+        """
+        tasks = [self.nearest(point, **kwargs) for point in points]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    def _calculate_page_offsets(self, total: int, start_offset: int) -> List[Tuple[int, int]]:
+        """
+        Calculate (offset, maxresults) tuples for the pages after the first.
+
+        Args:
+            total: Total number of results desired
+            start_offset: Offset of the first page still to fetch
+
+        Returns:
+            List of (offset, maxresults) tuples for each page to fetch
+        """
+        return [(offset, min(self.__PAGE_SIZE, total - offset))
+                for offset in range(start_offset, total, self.__PAGE_SIZE)]
+
+    async def _fetch_page(self, client: AsyncHTTPClient, api_name: str, params: Dict) -> Dict:
+        """Fetch a single page of results."""
+        return await client.get(self._endpoint(api_name), params=self._add_auth(params))
+
+    async def close(self) -> None:
+        """Close the HTTP client and release resources."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncNamesAPI":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit - cleanup."""
+        await self.close()
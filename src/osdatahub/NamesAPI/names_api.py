@@ -1,14 +1,14 @@
 from collections.abc import Iterable
 from typing import Union
 
-from typeguard import typechecked
-
 import osdatahub
+from osdatahub.address_table import AddressTable, AddressTableGrowList
 from osdatahub.errors import raise_http_error
 from osdatahub.extent import Extent
 from osdatahub.grow_list import GrowList
 from osdatahub.NamesAPI.local_types import get_local_type, validate_local_type
-from osdatahub.utils import addresses_to_geojson
+from osdatahub.typecheck import typechecked
+from osdatahub.utils import addresses_to_geojson, validate_type
 
 
 class NamesAPI:
@@ -42,7 +42,8 @@ class NamesAPI:
              limit: int = 100,
              bounds: Union[Extent, None] = None,
              bbox_filter: Union[Extent, None] = None,
-             local_type: Union[Iterable, str, None] = None) -> dict:
+             local_type: Union[Iterable, str, None] = None,
+             output_as_table: bool = False) -> Union[dict, AddressTable]:
         """A free text query of the OS Names API
 
         Args:
@@ -55,41 +56,36 @@ class NamesAPI:
                 (EPSG:27700) CRS
             local_type (Union[Iterable, str], optional): Filters the results to certain local types. Available local
                 types can be found at the bottom of https://osdatahub.os.uk/docs/names/technicalSpecification
+            output_as_table (bool, optional): Returns the results as a compact AddressTable instead of GeoJSON,
+                which uses far less memory for large numbers of results. Defaults to False
 
         Returns:
-            FeatureCollection: The results of the query in GeoJSON format
+            FeatureCollection|AddressTable: The results of the query in GeoJSON format, or as an AddressTable
         """
-        data = GrowList()
-        params = {"query": text}
-
-        if limit <= 0:
-            raise ValueError(f"Parameter \"limit\" must be a positive integer. Instead got {limit}")
-
-        if bounds:
-            if not bounds.crs == "EPSG:27700":
-                raise TypeError("Bounds must be in British National Grid CRS (EPSG:27700)")
-            params.update({"bounds": bounds.bbox.to_string(precision=2)})
-        if bbox_filter or local_type:
-            if bbox_filter and (not bbox_filter.crs == "EPSG:27700"):
-                raise TypeError("Bounding Box filter must be in British National Grid CRS (EPSG:27700)")
-            params.update({"fq": self.__format_fq(bbox_filter, local_type)})
+        validate_type(text, str, "text")
+        validate_type(limit, int, "limit")
+        data = AddressTableGrowList("EPSG:27700") if output_as_table else GrowList()
+        params = self._find_params(text, limit, bounds, bbox_filter, local_type)
 
         try:
             n_required = min(limit, 100)
             while n_required > 0 and data.grown:
                 params.update({"offset": len(data), "maxresults": n_required})
-                response = osdatahub.get(self.__endpoint("find"), params=params, proxies=osdatahub.get_proxies())
+                response = osdatahub.get(self.__endpoint("find"), params=params)
                 data.extend(self.__format_response(response))
                 n_required = min(100, limit - len(data))
         except KeyError:
             raise_http_error(response)
+        if output_as_table:
+            return data.values
         return addresses_to_geojson(data.values, "EPSG:27700")
 
     @typechecked
     def nearest(self,
                 point: tuple,
                 radius: float = 100,
-                local_type: Union[Iterable, str, None] = None) -> dict:
+                local_type: Union[Iterable, str, None] = None,
+                output_as_table: bool = False) -> Union[dict, AddressTable]:
         """Takes a pair of coordinates (X, Y) as an input
         to determine the closest name.
 
@@ -99,11 +95,55 @@ class NamesAPI:
                 Defaults to 100.
             local_type (Union[Iterable, str], optional):  Filters the results to certain local types. Available local
                 types can be found at the bottom of https://osdatahub.os.uk/docs/names/technicalSpecification
+            output_as_table (bool, optional): Returns the results as a compact AddressTable instead of GeoJSON,
+                which uses far less memory for large numbers of results. Defaults to False
 
         Returns:
-            FeatureCollection: The results of the query in GeoJSON format
+            FeatureCollection|AddressTable: The results of the query in GeoJSON format, or as an AddressTable
         """
-        data = GrowList()
+        validate_type(point, tuple, "point")
+        data = AddressTableGrowList("EPSG:27700") if output_as_table else GrowList()
+        params = self._nearest_params(point, radius, local_type)
+        try:
+            response = osdatahub.get(self.__endpoint("nearest"), params=params)
+            data.extend(self.__format_response(response))
+        except KeyError:
+            if response.status_code != 200:
+                raise_http_error(response)
+        if output_as_table:
+            return data.values
+        return addresses_to_geojson(data.values, crs="EPSG:27700")
+
+    @classmethod
+    def _find_params(cls,
+                     text: str,
+                     limit: int,
+                     bounds: Union[Extent, None],
+                     bbox_filter: Union[Extent, None],
+                     local_type: Union[Iterable, str, None]) -> dict:
+        """Validates the arguments of a find query and formats them into request parameters, apart from the
+        offset and maxresults used for paging"""
+        params = {"query": text}
+
+        if limit <= 0:
+            raise ValueError(f"Parameter \"limit\" must be a positive integer. Instead got {limit}")
+
+        if bounds:
+            if not bounds.crs == "EPSG:27700":
+                raise TypeError("Bounds must be in British National Grid CRS (EPSG:27700)")
+            params.update({"bounds": bounds.bbox.to_string(precision=2)})
+        if bbox_filter or local_type:
+            if bbox_filter and (not bbox_filter.crs == "EPSG:27700"):
+                raise TypeError("Bounding Box filter must be in British National Grid CRS (EPSG:27700)")
+            params.update({"fq": cls.__format_fq(bbox_filter, local_type)})
+        return params
+
+    @classmethod
+    def _nearest_params(cls,
+                        point: tuple,
+                        radius: float,
+                        local_type: Union[Iterable, str, None]) -> dict:
+        """Validates the arguments of a nearest query and formats them into request parameters"""
         if not all([str(p).isnumeric() for p in point]):
             raise TypeError("All values in argument \"point\" must be numeric")
         if not 0.01 <= radius <= 1000:
@@ -111,14 +151,8 @@ class NamesAPI:
 
         params = {"point": ",".join([str(c) for c in point]), "radius": radius}
         if local_type:
-            params.update({"fq": self.__format_fq(local_type=local_type)})
-        try:
-            response = osdatahub.get(self.__endpoint("nearest"), params=params, proxies=osdatahub.get_proxies())
-            data.extend(self.__format_response(response))
-        except KeyError:
-            if response.status_code != 200:
-                raise_http_error(response)
-        return addresses_to_geojson(data.values, crs="EPSG:27700")
+            params.update({"fq": cls.__format_fq(local_type=local_type)})
+        return params
 
     @staticmethod
     @typechecked
@@ -0,0 +1,222 @@
+import heapq
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterable
+from pathlib import Path
+from typing import List, Union
+
+from osdatahub.address_table import AddressTable
+from osdatahub.NamesAPI.local_types import get_local_type, validate_local_type
+from osdatahub.NamesAPI.names_api import NamesAPI
+from osdatahub.utils import addresses_to_geojson
+
+
+class NamesTypeahead:
+    """
+    A local prefix index of OS Names API gazetteer entries, for answering type-ahead (search as you type) lookups
+    without calling the API on every keystroke.
+
+    Names are kept in a sorted array, so a lookup is a binary search followed by a short scan. Lookups that find
+    nothing locally fall back to NamesAPI.find and the results are written back into the index, so the index fills
+    up with the names that are actually searched for. If a path is given, the index is loaded from and saved to it
+    so that it survives between sessions. The index is saved every SAVE_EVERY API lookups or SAVE_INTERVAL seconds,
+    rather than after each of them, so call save() when finished or use the index in a with block, which saves it
+    on exit.
+
+    Args:
+        names_api (NamesAPI, optional): Used to look up prefixes that aren't in the index. If None, lookups only
+            use the index
+        path (Union[str, Path], optional): JSON file in which the index is persisted. Defaults to None (in memory
+            only)
+        api_limit (int, optional): Number of results to request from the API when a lookup misses. Defaults to 100
+
+    Example::
+
+        from osdatahub import NamesAPI
+        from osdatahub.NamesAPI import NamesTypeahead
+        from os import environ
+
+        names = NamesAPI(environ.get("OS_API_KEY"))
+        typeahead = NamesTypeahead(names, path="names_index.json")
+        results = typeahead.search("southa", local_type="city")
+    """
+    SAVE_EVERY = 20
+    SAVE_INTERVAL = 5.0
+
+    def __init__(self,
+                 names_api: Union[NamesAPI, None] = None,
+                 path: Union[str, Path, None] = None,
+                 api_limit: int = 100):
+        self.names_api = names_api
+        self.path = Path(path) if path is not None else None
+        self.api_limit = api_limit
+        self.__lock = threading.Lock()
+        self.__entries = {}
+        self.__queried = set()
+        # sorted names and the IDs of their entries, replaced together so that lookups never see a mix of the two
+        self.__index = ([], [])
+        self.__unsaved = 0
+        self.__saved = time.monotonic()
+        if self.path is not None and self.path.is_file():
+            self.__load()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __enter__(self) -> "NamesTypeahead":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.path is not None and self.__unsaved:
+            self.save()
+
+    @staticmethod
+    def __normalise(text: str) -> str:
+        return " ".join(text.casefold().split())
+
+    def add(self, results: Union[dict, AddressTable, Iterable]) -> None:
+        """
+        Adds Names API results to the index. Entries that are already in the index are replaced
+
+        Args:
+            results (Union[dict, AddressTable, Iterable]): Either the output of NamesAPI.find/nearest (as GeoJSON or
+                as an AddressTable), or an iterable of raw gazetteer entries
+        """
+        if isinstance(results, dict):
+            entries = [feature["properties"] for feature in results["features"]]
+        elif isinstance(results, AddressTable):
+            entries = [address.properties for address in results]
+        else:
+            entries = list(results)
+
+        with self.__lock:
+            new_pairs, renamed = [], set()
+            for entry_id, entry in {entry["ID"]: entry for entry in entries}.items():
+                keys = self.__names(entry)
+                if entry_id in self.__entries:
+                    if keys == self.__names(self.__entries[entry_id]):
+                        self.__entries[entry_id] = entry
+                        continue
+                    # the entry's names have changed, so its old keys are replaced
+                    renamed.add(entry_id)
+                new_pairs.extend((key, entry_id) for key in keys)
+                self.__entries[entry_id] = entry
+            if new_pairs or renamed:
+                # the index is already sorted, so only the new names need sorting before they are merged in
+                pairs = heapq.merge((pair for pair in zip(*self.__index) if pair[1] not in renamed), sorted(new_pairs))
+                keys, ids = [], []
+                for key, entry_id in pairs:
+                    keys.append(key)
+                    ids.append(entry_id)
+                self.__index = (keys, ids)
+
+    @classmethod
+    def __names(cls, entry: dict) -> List[str]:
+        return [cls.__normalise(entry[name]) for name in ("NAME1", "NAME2") if entry.get(name)]
+
+    def lookup(self,
+               prefix: str,
+               limit: int = 10,
+               local_type: Union[Iterable, str, None] = None) -> List[dict]:
+        """
+        Finds the entries in the index with a name starting with the prefix, without calling the API
+
+        Args:
+            prefix (str): The start of the name to search for. Case and repeated whitespace are ignored
+            limit (int, optional): The maximum number of entries to return. Defaults to 10
+            local_type (Union[Iterable, str], optional): Filters the results to certain local types, using the same
+                values as NamesAPI.find
+
+        Returns:
+            list: Matching gazetteer entries, in alphabetical order of name
+        """
+        local_types = self.__local_types(local_type)
+        prefix = self.__normalise(prefix)
+        keys, ids = self.__index
+        matches, seen = [], set()
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            if len(matches) >= limit or not keys[i].startswith(prefix):
+                break
+            entry = self.__entries[ids[i]]
+            if ids[i] not in seen and (local_types is None or entry.get("LOCAL_TYPE") in local_types):
+                seen.add(ids[i])
+                matches.append(entry)
+        return matches
+
+    def search(self,
+               prefix: str,
+               limit: int = 10,
+               local_type: Union[Iterable, str, None] = None) -> dict:
+        """
+        Finds names starting with the prefix. The index is searched first and the Names API is only called if
+        nothing is found, in which case its results are added to the index (and periodically saved, if the index
+        has a path)
+
+        Args:
+            prefix (str): The start of the name to search for. Case and repeated whitespace are ignored
+            limit (int, optional): The maximum number of features to return. Defaults to 10
+            local_type (Union[Iterable, str], optional): Filters the results to certain local types, using the same
+                values as NamesAPI.find
+
+        Returns:
+            FeatureCollection: The results in GeoJSON format, the same as NamesAPI.find
+        """
+        matches = self.lookup(prefix, limit, local_type)
+        query_key = (self.__normalise(prefix), tuple(sorted(self.__local_types(local_type) or ())))
+        if matches or self.names_api is None or query_key in self.__queried:
+            return addresses_to_geojson(matches, "EPSG:27700")
+
+        results = self.names_api.find(prefix, limit=self.api_limit, local_type=local_type)
+        self.add(results)
+        with self.__lock:
+            self.__queried.add(query_key)
+            self.__unsaved += 1
+            save_due = (self.__unsaved >= self.SAVE_EVERY
+                        or time.monotonic() - self.__saved >= self.SAVE_INTERVAL)
+        if self.path is not None and save_due:
+            self.save()
+
+        matches = self.lookup(prefix, limit, local_type)
+        if not matches:
+            # the API's free text matching can return names that don't start with the prefix
+            matches = [feature["properties"] for feature in results["features"][:limit]]
+        return addresses_to_geojson(matches, "EPSG:27700")
+
+    @staticmethod
+    def __local_types(local_type: Union[Iterable, str, None]) -> Union[set, None]:
+        if not local_type:
+            return None
+        local_type = {local_type} if isinstance(local_type, str) else set(local_type)
+        invalid_local_types = validate_local_type(local_type)
+        if invalid_local_types:
+            raise ValueError(f"The local type(s) {invalid_local_types} are not valid local types")
+        return {get_local_type(name) for name in local_type}
+
+    def save(self, path: Union[str, Path, None] = None) -> None:
+        """
+        Saves the index to a JSON file. The file is replaced atomically, so a crash mid-save can't corrupt it
+
+        Args:
+            path (Union[str, Path], optional): Where to save the index. Defaults to the path of the index
+        """
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("No path given to save the index to")
+        with self.__lock:
+            content = {"entries": list(self.__entries.values()),
+                       "queried": [[prefix, list(local_types)] for prefix, local_types in self.__queried]}
+            self.__unsaved = 0
+            self.__saved = time.monotonic()
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(content, f)
+        os.replace(temp_path, path)
+
+    def __load(self) -> None:
+        with open(self.path) as f:
+            content = json.load(f)
+        self.add(content["entries"])
+        self.__queried = {(prefix, tuple(local_types)) for prefix, local_types in content["queried"]}
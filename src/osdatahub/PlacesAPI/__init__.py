@@ -1 +1,10 @@
-from osdatahub.PlacesAPI.places_api import PlacesAPI
+from typing import TYPE_CHECKING
+
+from osdatahub._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "PlacesAPI": "osdatahub.PlacesAPI.places_api",
+})
+
+if TYPE_CHECKING:
+    from osdatahub.PlacesAPI.places_api import PlacesAPI
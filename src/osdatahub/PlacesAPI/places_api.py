@@ -1,13 +1,17 @@
+from collections import deque
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from multiprocessing import cpu_count
 from typing import Union
 
 import requests
-from typeguard import typechecked
-
 import osdatahub
 from osdatahub import Extent
+from osdatahub.address_table import AddressTable, AddressTableGrowList
 from osdatahub.grow_list import GrowList
-from osdatahub.utils import addresses_to_geojson, validate_in_range
+from osdatahub.typecheck import typechecked
+from osdatahub.utils import addresses_to_geojson, validate_in_range, validate_type
 from osdatahub.codes import DATASET
 
 class PlacesAPI:
@@ -28,6 +32,7 @@ class PlacesAPI:
     """
 
     __ENDPOINT = r"https://api.os.uk/search/places/v1/"
+    __MAX_TILE_DEPTH = 8
     HEADERS = {"method": "POST", "headers": "{'Content-Type': 'application/json'}"}
 
     def __init__(self, key: str):
@@ -58,51 +63,142 @@ class PlacesAPI:
             limit: int = 100,
             classification_code: Union[str, Iterable, None] = None,
             logical_status_code: Union[str, int, None] = None,
-            dataset: Union[str, Iterable, None] = None
-    ) -> dict:
+            dataset: Union[str, Iterable, None] = None,
+            merge_datasets: bool = False,
+            max_tile_results: Union[int, None] = None,
+            processes: Union[int, None] = None,
+            output_as_table: bool = False
+    ) -> Union[dict, AddressTable]:
         """Run a query of the OS Places API within a given extent
 
         Args:
-            extent (Extent): The geographical extent of your query
+            extent (Extent): The geographical extent of your query. The parts of a MultiPolygon extent are queried
+                separately, in parallel
             output_crs (str, optional): The intended output CRS
             limit (int, optional): The maximum number of features to return.
                 Defaults to 100.
             classification_code (str|Iterable[str], optional): Classification codes to filter query by
             logical_status_code (str|int, optional): logical status codes to filter query by
             dataset (str|Iterable, optional): The dataset to return. Multiple values can be sent, separated by a comma. Default: DPA.
+            merge_datasets (bool, optional): When querying both the LPI and DPA datasets, joins the LPI and DPA
+                records of each property on their UPRN, returning one result per property with both records
+                attached under the "LPI" and "DPA" properties. The limit applies to the records returned by
+                the API, before they are merged. Defaults to False
+            max_tile_results (int, optional): If given, the extent is automatically split into tiles that each
+                contain at most this many addresses (estimated from the API's result count for each tile). The
+                tiles are queried in parallel and addresses that fall on shared tile boundaries are only returned
+                once, and count once towards the limit. Useful for large or complex extents. Defaults to None
+                (query the extent as a whole)
+            processes (int, optional): Number of parallel requests to use when max_tile_results is set.
+                Defaults to the machine's CPU count
+            output_as_table (bool, optional): Returns the results as a compact AddressTable instead of GeoJSON,
+                which uses far less memory for large numbers of results. Defaults to False
 
         Returns:
-            FeatureCollection: The results of the query in GeoJSON format
+            FeatureCollection|AddressTable: The results of the query in GeoJSON format, or as an AddressTable
         """
+        validate_type(extent, Extent, "extent")
+        validate_type(limit, int, "limit")
         if not output_crs:
             output_crs = extent.crs
-        data = GrowList()
-        params = {
-            "url": self.__endpoint("polygon"),
-            "headers": self.HEADERS,
-            "json": extent.to_json(),
-            "params": {"srs": extent.crs, "output_srs": output_crs},
-        }
+        params = {"output_srs": output_crs}
         if classification_code or logical_status_code:
-            params["params"].update(
+            params.update(
                 {"fq": self.__format_fq(classification_code, logical_status_code)}
             )
 
         if dataset is not None:
-            params["params"].update(
+            params.update(
                 {"dataset": self.__get_dataset_param(dataset)}
             )
-
+        if merge_datasets:
+            self.__validate_merge_datasets(dataset)
+
+        if max_tile_results is not None and max_tile_results <= 0:
+            raise ValueError(f"max_tile_results must be a positive integer, got {max_tile_results}")
+        data = self.__results(output_crs, merge_datasets, output_as_table)
+        if max_tile_results is None and len(extent.parts) == 1:
+            self.__query_extent(extent, params, limit, data, merge_datasets)
+        else:
+            # the API only accepts single polygons, so each part of a MultiPolygon is queried as a separate tile
+            self.__query_tiles(extent, params, limit, max_tile_results, processes, data, merge_datasets)
+        return self.__output(data, output_crs, output_as_table)
+
+    def __query_extent(self, extent: Extent, params: dict, limit: int, data: GrowList, tagged: bool) -> GrowList:
+        request = {
+            "url": self.__endpoint("polygon"),
+            "headers": self.HEADERS,
+            "json": extent.to_json(),
+            "params": {**params, "srs": extent.crs},
+        }
         try:
             n_required = min(limit, 100)
             while n_required > 0 and data.grown:
-                params["params"].update({"offset": len(data), "maxresults": n_required})
-                response = osdatahub.post(**params)
-                data.extend(self.__format_response(response))
+                request["params"].update({"offset": len(data), "maxresults": n_required})
+                response = osdatahub.post(**request)
+                data.extend(self.__format_response(response, tagged=tagged))
                 n_required = min(100, limit - len(data))
         except KeyError:
             response.raise_for_status()
-        return addresses_to_geojson(data.values, output_crs)
+        return data
+
+    def __count_extent(self, extent: Extent, params: dict) -> int:
+        response = osdatahub.post(url=self.__endpoint("polygon"),
+                                  headers=self.HEADERS,
+                                  json=extent.to_json(),
+                                  params={**params, "srs": extent.crs, "offset": 0, "maxresults": 1})
+        try:
+            return response.json()["header"]["totalresults"]
+        except KeyError:
+            response.raise_for_status()
+            raise
+
+    def __query_tiles(self, extent: Extent, params: dict, limit: int, max_tile_results: Union[int, None],
+                      processes: Union[int, None], data: GrowList, merge_datasets: bool) -> None:
+        workers = processes or cpu_count()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # tiles are split into quarters until the API reports few enough addresses in each of them
+            tiles, pending = [], extent.parts
+            if max_tile_results is None:
+                tiles, pending = pending, []
+            for depth in range(self.__MAX_TILE_DEPTH + 1 if pending else 0):
+                counts = list(executor.map(lambda tile: self.__count_extent(tile, params), pending))
+                oversized = [tile for tile, count in zip(pending, counts) if count > max_tile_results]
+                tiles.extend(tile for tile, count in zip(pending, counts) if 0 < count <= max_tile_results)
+                if depth == self.__MAX_TILE_DEPTH:
+                    tiles.extend(oversized)
+                    break
+                pending = [part for tile in oversized for part in tile.split()]
+                if not pending:
+                    break
+
+            # each tile returns its raw records, so that the limit counts records the same way as an untiled query.
+            # Only a few tiles are in flight at once, each asking for the records still needed, and the rest are
+            # never requested once the limit is reached
+            def query_tile(tile, n_required):
+                return self.__query_extent(tile, params, n_required, GrowList(), merge_datasets).values
+
+            remaining, in_flight, seen = iter(tiles), deque(), set()
+            try:
+                for tile in islice(remaining, workers):
+                    in_flight.append(executor.submit(query_tile, tile, limit))
+                while in_flight and len(data) < limit:
+                    new_records = []
+                    for record in in_flight.popleft().result():
+                        if len(data) + len(new_records) >= limit:
+                            break
+                        dataset, address = record if merge_datasets else (None, record)
+                        key = (dataset, address.get("UPRN"), address.get("LPI_KEY"))
+                        if key not in seen:
+                            seen.add(key)
+                            new_records.append(record)
+                    data.extend(new_records)
+                    tile = next(remaining, None)
+                    if tile is not None and len(data) < limit:
+                        in_flight.append(executor.submit(query_tile, tile, limit - len(data)))
+            finally:
+                for future in in_flight:
+                    future.cancel()
 
     @typechecked
     def find(
@@ -114,8 +210,10 @@ class PlacesAPI:
             logical_status_code: Union[str, int, None] = None,
             minmatch: Union[float, None] = None,
             matchprecision: Union[int, None] = None,
-            dataset: Union[str, Iterable, None] = None
-    ) -> dict:
+            dataset: Union[str, Iterable, None] = None,
+            merge_datasets: bool = False,
+            output_as_table: bool = False
+    ) -> Union[dict, AddressTable]:
         """A free text query of the OS Places API
 
         Args:
@@ -128,11 +226,19 @@ class PlacesAPI:
             minmatch (float, optional): The minimum match score a result has to have to be returned
             matchprecision (int, optional): The decimal point position at which the match score value is to be truncated
             dataset (str|Iterable, optional): The dataset to return. Multiple values can be sent, separated by a comma. Default: DPA.
+            merge_datasets (bool, optional): When querying both the LPI and DPA datasets, joins the LPI and DPA
+                records of each property on their UPRN, returning one result per property with both records
+                attached under the "LPI" and "DPA" properties. The limit applies to the records returned by
+                the API, before they are merged. Defaults to False
+            output_as_table (bool, optional): Returns the results as a compact AddressTable instead of GeoJSON,
+                which uses far less memory for large numbers of results. Defaults to False
 
         Returns:
-            FeatureCollection: The results of the query in GeoJSON format
+            FeatureCollection|AddressTable: The results of the query in GeoJSON format, or as an AddressTable
         """
-        data = GrowList()
+        validate_type(text, str, "text")
+        validate_type(limit, int, "limit")
+        data = self.__results(output_crs, merge_datasets, output_as_table)
         params = {"query": text, "output_srs": output_crs}
         if minmatch is not None:
             params["minmatch"] = validate_in_range(minmatch, 0.1, 1)
@@ -147,17 +253,19 @@ class PlacesAPI:
             params.update(
                 {"dataset": self.__get_dataset_param(dataset)}
             )
+        if merge_datasets:
+            self.__validate_merge_datasets(dataset)
 
         try:
             n_required = min(limit, 100)
             while n_required > 0 and data.grown:
                 params.update({"offset": len(data), "maxresults": n_required})
-                response = osdatahub.get(self.__endpoint("find"), params=params, proxies=osdatahub.get_proxies())
-                data.extend(self.__format_response(response))
+                response = osdatahub.get(self.__endpoint("find"), params=params)
+                data.extend(self.__format_response(response, tagged=merge_datasets))
                 n_required = min(100, limit - len(data))
         except KeyError:
             response.raise_for_status()
-        return addresses_to_geojson(data.values, output_crs)
+        return self.__output(data, output_crs, output_as_table)
 
     @typechecked
     def postcode(
@@ -167,8 +275,10 @@ class PlacesAPI:
             limit: int = 100,
             classification_code: Union[str, Iterable, None] = None,
             logical_status_code: Union[str, int, None] = None,
-            dataset: Union[str, Iterable, None] = None
-    ) -> dict:
+            dataset: Union[str, Iterable, None] = None,
+            merge_datasets: bool = False,
+            output_as_table: bool = False
+    ) -> Union[dict, AddressTable]:
         """A query based on a property’s postcode. The minimum for the
         resource is the area and district
 
@@ -184,11 +294,19 @@ class PlacesAPI:
             classification_code (str|Iterable[str], optional): Classification codes to filter query by
             logical_status_code (str|int, optional): logical status codes to filter query by
             dataset (str|Iterable, optional): The dataset to return. Multiple values can be sent, separated by a comma. Default: DPA.
+            merge_datasets (bool, optional): When querying both the LPI and DPA datasets, joins the LPI and DPA
+                records of each property on their UPRN, returning one result per property with both records
+                attached under the "LPI" and "DPA" properties. The limit applies to the records returned by
+                the API, before they are merged. Defaults to False
+            output_as_table (bool, optional): Returns the results as a compact AddressTable instead of GeoJSON,
+                which uses far less memory for large numbers of results. Defaults to False
 
         Returns:
-            FeatureCollection: The results of the query in GeoJSON format
+            FeatureCollection|AddressTable: The results of the query in GeoJSON format, or as an AddressTable
         """
-        data = GrowList()
+        validate_type(postcode, str, "postcode")
+        validate_type(limit, int, "limit")
+        data = self.__results(output_crs, merge_datasets, output_as_table)
         params = {"postcode": postcode, "output_srs": output_crs}
         if classification_code or logical_status_code:
             params.update(
@@ -198,17 +316,19 @@ class PlacesAPI:
             params.update(
                 {"dataset": self.__get_dataset_param(dataset)}
             )
+        if merge_datasets:
+            self.__validate_merge_datasets(dataset)
 
         try:
             n_required = min(limit, 100)
             while n_required > 0 and data.grown:
                 params.update({"offset": len(data), "maxresults": n_required})
-                response = osdatahub.get(self.__endpoint("postcode"), params=params, proxies=osdatahub.get_proxies())
-                data.extend(self.__format_response(response))
+                response = osdatahub.get(self.__endpoint("postcode"), params=params)
+                data.extend(self.__format_response(response, tagged=merge_datasets))
                 n_required = min(100, limit - len(data))
         except KeyError:
             response.raise_for_status()
-        return addresses_to_geojson(data.values, output_crs)
+        return self.__output(data, output_crs, output_as_table)
 
     @typechecked
     def uprn(
@@ -217,8 +337,10 @@ class PlacesAPI:
             output_crs: str = "EPSG:27700",
             classification_code: Union[str, Iterable, None] = None,
             logical_status_code: Union[str, int, None] = None,
-            dataset: Union[str, Iterable, None] = None
-    ) -> dict:
+            dataset: Union[str, Iterable, None] = None,
+            merge_datasets: bool = False,
+            output_as_table: bool = False
+    ) -> Union[dict, AddressTable]:
         """A query that takes a UPRN as the search parameter
 
         Args:
@@ -228,11 +350,18 @@ class PlacesAPI:
             classification_code (str|Iterable[str], optional): Classification codes to filter query by
             logical_status_code (str|int, optional): logical status codes to filter query by
             dataset (str|Iterable, optional): The dataset to return. Multiple values can be sent, separated by a comma. Default: DPA.
+            merge_datasets (bool, optional): When querying both the LPI and DPA datasets, joins the LPI and DPA
+                records of each property on their UPRN, returning one result per property with both records
+                attached under the "LPI" and "DPA" properties. The limit applies to the records returned by
+                the API, before they are merged. Defaults to False
+            output_as_table (bool, optional): Returns the results as a compact AddressTable instead of GeoJSON,
+                which uses far less memory for large numbers of results. Defaults to False
 
         Returns:
-            FeatureCollection: The results of the query in GeoJSON format
+            FeatureCollection|AddressTable: The results of the query in GeoJSON format, or as an AddressTable
         """
-        data = GrowList()
+        validate_type(uprn, int, "uprn")
+        data = self.__results(output_crs, merge_datasets, output_as_table)
         params = {"uprn": uprn, "output_srs": output_crs}
         if classification_code or logical_status_code:
             params.update(
@@ -242,12 +371,14 @@ class PlacesAPI:
             params.update(
                 {"dataset": self.__get_dataset_param(dataset)}
             )
+        if merge_datasets:
+            self.__validate_merge_datasets(dataset)
         try:
-            response = osdatahub.get(self.__endpoint("uprn"), params=params, proxies=osdatahub.get_proxies())
-            data.extend(self.__format_response(response))
+            response = osdatahub.get(self.__endpoint("uprn"), params=params)
+            data.extend(self.__format_response(response, tagged=merge_datasets))
         except KeyError:
             response.raise_for_status()
-        return addresses_to_geojson(data.values, output_crs)
+        return self.__output(data, output_crs, output_as_table)
 
     @typechecked
     def nearest(
@@ -258,8 +389,10 @@ class PlacesAPI:
             output_crs: str = "EPSG:27700",
             classification_code: Union[str, Iterable] = None,
             logical_status_code: Union[str, int] = None,
-            dataset: Union[str, Iterable, None] = None
-    ) -> dict:
+            dataset: Union[str, Iterable, None] = None,
+            merge_datasets: bool = False,
+            output_as_table: bool = False
+    ) -> Union[dict, AddressTable]:
         """Takes a pair of coordinates (X, Y)/(Lon, Lat) as an input
         to determine the closest address.
 
@@ -273,11 +406,18 @@ class PlacesAPI:
             classification_code (str|Iterable[str], optional): Classification codes to filter query by
             logical_status_code (str|int, optional): logical status codes to filter query by
             dataset (str|Iterable, optional): The dataset to return. Multiple values can be sent, separated by a comma. Default: DPA.
+            merge_datasets (bool, optional): When querying both the LPI and DPA datasets, joins the LPI and DPA
+                records of each property on their UPRN, returning one result per property with both records
+                attached under the "LPI" and "DPA" properties. The limit applies to the records returned by
+                the API, before they are merged. Defaults to False
+            output_as_table (bool, optional): Returns the results as a compact AddressTable instead of GeoJSON,
+                which uses far less memory for large numbers of results. Defaults to False
 
         Returns:
-            FeatureCollection: The results of the query in GeoJSON format
+            FeatureCollection|AddressTable: The results of the query in GeoJSON format, or as an AddressTable
         """
-        data = GrowList()
+        validate_type(point, tuple, "point")
+        data = self.__results(output_crs, merge_datasets, output_as_table)
         point = point if point_crs.upper() != "EPSG:4326" else (point[1], point[0])
         params = {
             "point": ",".join([str(c) for c in point]),
@@ -293,18 +433,46 @@ class PlacesAPI:
             params.update(
                 {"dataset": self.__get_dataset_param(dataset)}
             )
+        if merge_datasets:
+            self.__validate_merge_datasets(dataset)
         try:
-            response = osdatahub.get(self.__endpoint("nearest"), params=params, proxies=osdatahub.get_proxies())
-            data.extend(self.__format_response(response))
+            response = osdatahub.get(self.__endpoint("nearest"), params=params)
+            data.extend(self.__format_response(response, tagged=merge_datasets))
         except KeyError:
             response.raise_for_status()
+        return self.__output(data, output_crs, output_as_table)
+
+    @staticmethod
+    def __results(output_crs: str, merge_datasets: bool, output_as_table: bool) -> GrowList:
+        if merge_datasets:
+            # a property's other record can arrive on any later page, so merged results are held until the end
+            return _DatasetMerger()
+        if output_as_table:
+            # each page is added to the table as it arrives, so the raw results are never all held at once
+            return AddressTableGrowList(output_crs)
+        return GrowList()
+
+    @staticmethod
+    def __output(data: GrowList, output_crs: str, output_as_table: bool) -> Union[dict, AddressTable]:
+        if isinstance(data.values, AddressTable):
+            return data.values
+        if output_as_table:
+            return AddressTable(output_crs, data.values)
         return addresses_to_geojson(data.values, output_crs)
 
     @staticmethod
-    def __format_response(response: requests.Response) -> list:
+    def __format_response(response: requests.Response, tagged: bool = False) -> list:
         results = response.json()["results"]
+        if tagged:
+            return [(dataset, record) for result in results for dataset, record in result.items()]
         return [result[list(result.keys())[0]] for result in results]
 
+    @staticmethod
+    def __validate_merge_datasets(dataset: Union[str, Iterable, None]) -> None:
+        if dataset is None or isinstance(dataset, str) or set(dataset) != DATASET:
+            raise ValueError(f"merge_datasets can only be used when querying both datasets, "
+                             f"i.e. dataset=['LPI', 'DPA'], got {dataset}")
+
     @staticmethod
     @typechecked
     def __format_fq(
@@ -346,6 +514,46 @@ class PlacesAPI:
         return fq_args
 
 
+class _DatasetMerger(GrowList):
+    """
+    A GrowList that joins LPI and DPA records on their UPRN through a dictionary index as they are added, so that each
+    property is held once with both of its records attached. Its length is the number of records added, before
+    merging, so that it can be used to calculate the offset when paging through API results.
+
+    Where a property has several LPI records (e.g. alternative addresses) the approved one is kept.
+    """
+
+    _COORDINATE_KEYS = ("X_COORDINATE", "Y_COORDINATE", "LNG", "LAT")
+
+    def __init__(self):
+        super().__init__()
+        self.__index = {}
+        self.__count = 0
+
+    def __len__(self):
+        return self.__count
+
+    def extend(self, values: list):
+        """Merges (dataset, record) pairs into the existing properties
+
+        Args:
+            values (list): list of (dataset, record) tuples, where dataset is either "LPI" or "DPA"
+        """
+        for dataset, record in values:
+            merged = self.__index.get(record["UPRN"])
+            if merged is None:
+                merged = {"UPRN": record["UPRN"], "DPA": None, "LPI": None}
+                merged.update({key: record[key] for key in self._COORDINATE_KEYS if key in record})
+                self.__index[record["UPRN"]] = merged
+                self.values.append(merged)
+            existing = merged[dataset]
+            if existing is None or (dataset == "LPI" and existing.get("LPI_LOGICAL_STATUS_CODE") != "1"
+                                    and record.get("LPI_LOGICAL_STATUS_CODE") == "1"):
+                merged[dataset] = record
+        self.__count += len(values)
+        self.size.append(self.__count)
+
+
 if __name__ == "__main__":
     from os import environ
 
@@ -1,24 +1,71 @@
-import json
 import logging
-import os
+from typing import TYPE_CHECKING, Union
 
-os.environ["_OSDATAHUB_PROXIES"] = json.dumps({})
+from osdatahub import config as _config
+from osdatahub._lazy import attach
 
 
 def set_proxies(proxies):
-    os.environ["_OSDATAHUB_PROXIES"] = json.dumps(proxies)
+    _config.configure(proxies=proxies)
 
 
 def get_proxies():
-    return json.loads(os.environ["_OSDATAHUB_PROXIES"])
+    # a copy, as requests adds proxies from the environment to the dict it is given
+    return dict(_config.get_config().proxies)
+
+
+def configure(typecheck: Union[bool, None] = None, **settings) -> None:
+    """
+    Changes settings of osdatahub for the whole process. Arguments left as None are unchanged
+
+    Args:
+        typecheck (bool, optional): Whether the API methods check the types of all their arguments at runtime with
+            typeguard. Turning this off removes typeguard's overhead from every call, while the arguments that matter
+            most are still checked. Can also be turned off before importing osdatahub by setting the environment
+            variable OSDATAHUB_TYPECHECK=0
+        **settings: Settings of the ClientConfig used by every client, such as proxies, timeout, pool_maxsize,
+            max_retries or cache_dir, see osdatahub.config
+
+    Example::
+
+        import osdatahub
+
+        osdatahub.configure(timeout=30, max_retries=3, pool_maxsize=20)
+    """
+    if typecheck is not None:
+        from osdatahub.typecheck import set_typecheck
+
+        set_typecheck(typecheck)
+    if settings:
+        _config.configure(**settings)
+
 
 __version__ = "1.3.3"
 
-from osdatahub.DownloadsAPI import DataPackageDownload, OpenDataDownload
-from osdatahub.extent import Extent
-from osdatahub.FeaturesAPI import FeaturesAPI
-from osdatahub.LinkedIdentifiersAPI import LinkedIdentifiersAPI
-from osdatahub.NamesAPI import NamesAPI
-from osdatahub.NGD import NGD, AsyncNGD
-from osdatahub.PlacesAPI import PlacesAPI
-from osdatahub.requests_wrapper import get, post
+# the APIs are imported when first used, so that scripts only load the dependencies of the APIs they use
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "ClientConfig": "osdatahub.config",
+    "DataPackageDownload": "osdatahub.DownloadsAPI",
+    "OpenDataDownload": "osdatahub.DownloadsAPI",
+    "Extent": "osdatahub.extent",
+    "FeaturesAPI": "osdatahub.FeaturesAPI",
+    "LinkedIdentifiersAPI": "osdatahub.LinkedIdentifiersAPI",
+    "AsyncNamesAPI": "osdatahub.NamesAPI",
+    "NamesAPI": "osdatahub.NamesAPI",
+    "NGD": "osdatahub.NGD",
+    "AsyncNGD": "osdatahub.NGD",
+    "PlacesAPI": "osdatahub.PlacesAPI",
+    "get": "osdatahub.requests_wrapper",
+    "post": "osdatahub.requests_wrapper",
+})
+
+if TYPE_CHECKING:
+    from osdatahub.config import ClientConfig
+    from osdatahub.DownloadsAPI import DataPackageDownload, OpenDataDownload
+    from osdatahub.extent import Extent
+    from osdatahub.FeaturesAPI import FeaturesAPI
+    from osdatahub.LinkedIdentifiersAPI import LinkedIdentifiersAPI
+    from osdatahub.NamesAPI import AsyncNamesAPI, NamesAPI
+    from osdatahub.NGD import NGD, AsyncNGD
+    from osdatahub.PlacesAPI import PlacesAPI
+    from osdatahub.requests_wrapper import get, post
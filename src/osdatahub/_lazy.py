@@ -0,0 +1,58 @@
+"""
+PEP 562 lazy loading of the names a package exports, so that importing osdatahub (or one of its API subpackages)
+doesn't import every API module and, through them, requests, shapely, tqdm, typeguard and aiohttp. Each name is
+imported from its module when first accessed and then kept on the package, so later accesses are plain attributes.
+"""
+
+import importlib
+import sys
+from types import ModuleType
+from typing import Callable, Dict, List, Tuple
+
+
+def attach(package_name: str, exports: Dict[str, str]) -> Tuple[Callable, Callable, List[str]]:
+    """
+    Creates the __getattr__, __dir__ and __all__ of a package that exports names lazily
+
+    Args:
+        package_name (str): The package's __name__
+        exports (Dict[str, str]): The module each exported name is defined in, relative to the package (e.g.
+            ".places_api") or absolute
+
+    Returns:
+        tuple: __getattr__, __dir__ and __all__ for the package
+
+    Example::
+
+        __getattr__, __dir__, __all__ = attach(__name__, {"PlacesAPI": ".places_api"})
+    """
+    package = sys.modules[package_name]
+    # importing a subpackage binds it on its parent, which would hide an exported class of the same name, such as
+    # the PlacesAPI class and the osdatahub.PlacesAPI subpackage
+    package.__class__ = _LazyPackage
+    package.__lazy_exports__ = frozenset(exports)
+
+    def __getattr__(name: str):
+        if name in exports:
+            value = getattr(importlib.import_module(exports[name], package_name), name)
+        else:
+            try:
+                value = importlib.import_module(f"{package_name}.{name}")
+            except ModuleNotFoundError as e:
+                if e.name != f"{package_name}.{name}":
+                    raise
+                raise AttributeError(f"module {package_name!r} has no attribute {name!r}") from None
+        setattr(package, name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(package)) | set(exports))
+
+    return __getattr__, __dir__, sorted(exports)
+
+
+class _LazyPackage(ModuleType):
+    def __setattr__(self, name, value):
+        if isinstance(value, ModuleType) and name in self.__dict__.get("__lazy_exports__", ()):
+            return
+        super().__setattr__(name, value)
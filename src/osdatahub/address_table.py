@@ -0,0 +1,212 @@
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from geojson import FeatureCollection
+
+from osdatahub.grow_list import GrowList
+from osdatahub.utils import address_coordinate_keys
+
+# Attributes whose values repeat across many addresses. Their strings are interned so that every address with the
+# same postcode, classification code, local custodian etc. shares a single string object
+SHARED_VALUE_KEYS = frozenset({
+    "POSTCODE", "POST_TOWN", "DEPENDENT_LOCALITY", "DOUBLE_DEPENDENT_LOCALITY", "THOROUGHFARE_NAME",
+    "DEPENDENT_THOROUGHFARE_NAME", "STATUS", "LOGICAL_STATUS_CODE", "CLASSIFICATION_CODE",
+    "CLASSIFICATION_CODE_DESCRIPTION", "LOCAL_CUSTODIAN_CODE", "LOCAL_CUSTODIAN_CODE_DESCRIPTION", "COUNTRY_CODE",
+    "COUNTRY_CODE_DESCRIPTION", "POSTAL_ADDRESS_CODE", "POSTAL_ADDRESS_CODE_DESCRIPTION", "BLPU_STATE_CODE",
+    "BLPU_STATE_CODE_DESCRIPTION", "RPC", "MATCH_DESCRIPTION", "LANGUAGE", "ENTRY_DATE", "LAST_UPDATE_DATE",
+    "BLPU_STATE_DATE", "LPI_LOGICAL_STATUS_CODE", "LPI_LOGICAL_STATUS_CODE_DESCRIPTION", "USRN",
+    "STREET_DESCRIPTION", "TOWN_NAME", "ADMINISTRATIVE_AREA", "STREET_STATE_CODE", "STREET_STATE_CODE_DESCRIPTION",
+    "STREET_CLASSIFICATION_CODE", "STREET_CLASSIFICATION_CODE_DESCRIPTION", "TYPE", "LOCAL_TYPE",
+    "POSTCODE_DISTRICT", "POSTCODE_DISTRICT_URI", "POPULATED_PLACE", "POPULATED_PLACE_URI", "POPULATED_PLACE_TYPE",
+    "DISTRICT_BOROUGH", "DISTRICT_BOROUGH_URI", "DISTRICT_BOROUGH_TYPE", "COUNTY_UNITARY", "COUNTY_UNITARY_URI",
+    "COUNTY_UNITARY_TYPE", "REGION", "REGION_URI", "COUNTRY", "COUNTRY_URI",
+})
+
+# Marks an attribute that an address doesn't have, so that it is left out of the address' properties
+_MISSING = object()
+
+
+class Address:
+    """
+    A read-only view of a single address stored in an AddressTable. It holds no data itself, so creating one is cheap,
+    and the values are only gathered into a dictionary when properties or to_feature() are accessed.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "AddressTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return self._table._x[self._index]
+
+    @property
+    def y(self) -> float:
+        return self._table._y[self._index]
+
+    @property
+    def properties(self) -> dict:
+        return self._table._properties(self._index)
+
+    def __getitem__(self, key: str) -> Any:
+        x_key, y_key = self._table._coordinate_keys[self._table._key_codes[self._index]]
+        if key == x_key:
+            return self.x
+        if key == y_key:
+            return self.y
+        column = self._table._columns.get(key)
+        if column is None or column[self._index] is _MISSING:
+            raise KeyError(key)
+        return column[self._index]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_feature(self) -> dict:
+        """
+        Converts the address into a GeoJSON Point Feature, in the same form returned by the API classes
+
+        Returns:
+            dict: GeoJSON Feature
+        """
+        return {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [self.x, self.y]},
+            "properties": self.properties,
+        }
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.properties})"
+
+
+class AddressTable:
+    """
+    AddressTable is a compact, column-oriented store for PlacesAPI and NamesAPI results. Coordinates are kept in
+    float arrays, every attribute is kept in its own column and repeated values such as postcodes and classification
+    codes are interned. This uses a fraction of the memory of a GeoJSON FeatureCollection holding the same addresses,
+    which is only built if to_geojson() is called.
+
+    Args:
+        crs (str): The CRS of the address coordinates
+        addresses (Iterable[dict], optional): Raw addresses from the API to add to the table
+
+    Example::
+
+        from osdatahub import PlacesAPI
+        from os import environ
+
+        places = PlacesAPI(environ.get("OS_API_KEY"))
+        table = places.postcode("SO16 0AS", output_as_table=True)
+        postcodes = table["POSTCODE"]
+        first = table[0].properties
+        results = table.to_geojson()
+    """
+
+    def __init__(self, crs: str, addresses: Union[Iterable[dict], None] = None):
+        self.crs = crs
+        self._x = array("d")
+        self._y = array("d")
+        self._key_codes = array("B")
+        self._coordinate_keys: List[Tuple[str, str]] = []
+        self._columns: Dict[str, list] = {}
+        if addresses is not None:
+            self.extend(addresses)
+
+    def __len__(self) -> int:
+        return len(self._x)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Address]:
+        return (Address(self, i) for i in range(len(self)))
+
+    def __getitem__(self, index: Union[int, str]) -> Union[Address, list]:
+        """Gets either a single Address by its position in the table, or the values of an attribute for every
+        address by the attribute name (None where an address doesn't have the attribute)"""
+        if isinstance(index, str):
+            return [address.get(index) for address in self]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("AddressTable index out of range")
+        return Address(self, index)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(crs='{self.crs}', length={len(self)})"
+
+    @property
+    def columns(self) -> list:
+        return list(self._columns)
+
+    def extend(self, addresses: Iterable[dict]) -> None:
+        """
+        Adds raw addresses from the API onto the end of the table
+
+        Args:
+            addresses (Iterable[dict]): raw addresses, as found in the "results" of an API response
+        """
+        for address in addresses:
+            keys = address_coordinate_keys(address, self.crs)
+            if keys not in self._coordinate_keys:
+                self._coordinate_keys.append(keys)
+            length = len(self)
+            self._x.append(address[keys[0]])
+            self._y.append(address[keys[1]])
+            self._key_codes.append(self._coordinate_keys.index(keys))
+
+            for key, value in address.items():
+                if key in keys:
+                    continue
+                column = self._columns.get(key)
+                if column is None:
+                    column = self._columns[key] = [_MISSING] * length
+                if key in SHARED_VALUE_KEYS and isinstance(value, str):
+                    value = sys.intern(value)
+                column.append(value)
+            for column in self._columns.values():
+                if len(column) == length:
+                    column.append(_MISSING)
+
+    def _properties(self, index: int) -> dict:
+        x_key, y_key = self._coordinate_keys[self._key_codes[index]]
+        properties = {key: column[index] for key, column in self._columns.items() if column[index] is not _MISSING}
+        properties[x_key] = self._x[index]
+        properties[y_key] = self._y[index]
+        return properties
+
+    def features(self) -> Iterator[dict]:
+        """
+        Lazily converts the addresses into GeoJSON Features, one at a time
+
+        Returns:
+            Iterator[dict]: GeoJSON Features
+        """
+        return (address.to_feature() for address in self)
+
+    def to_geojson(self) -> FeatureCollection:
+        """
+        Converts the whole table into a GeoJSON FeatureCollection, the same as is returned by the API classes when
+        output_as_table is False
+
+        Returns:
+            FeatureCollection: The addresses in GeoJSON format
+        """
+        return FeatureCollection(list(self.features()), crs=self.crs)
+
+
+class AddressTableGrowList(GrowList):
+    """
+    A GrowList that adds the addresses it is extended with straight into an AddressTable, so that the API classes can
+    page results into a table without holding the raw results of every page until the query finishes
+    """
+
+    def __init__(self, crs: str):
+        super().__init__()
+        self.values = AddressTable(crs)
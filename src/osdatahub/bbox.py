@@ -1,12 +1,13 @@
-from dataclasses import astuple, dataclass
-from typing import Union
+from typing import Iterable, Iterator, NamedTuple, Union
 
+import numpy as np
+import shapely
 
-@dataclass
-class BBox:
+
+class BBox(NamedTuple):
     """
-    BBox is a dataclass that specifies a rectangular polygon made up of north, south, east and west. It is indiscriminate
-    of CRS and so is used as part of the more comprehensive Extent class
+    BBox is a named tuple that specifies a rectangular polygon made up of north, south, east and west. It is
+    indiscriminate of CRS and so is used as part of the more comprehensive Extent class
     """
 
     west: float
@@ -14,12 +15,6 @@ class BBox:
     east: float
     north: float
 
-    def __iter__(self):
-        return (c for c in astuple(self))
-
-    def __getitem__(self, index):
-        return list(self)[index]
-
     def to_string(self, precision: Union[int, None] = None) -> str:
         """
         Converts bounding box into string
@@ -31,3 +26,191 @@ class BBox:
             str: bounding box in string form
         """
         return ",".join(str(round(c, precision) if precision is not None else c) for c in self)
+
+    def intersects(self, other: Iterable[float]) -> bool:
+        """
+        Checks whether another bounding box overlaps or touches this one
+
+        Args:
+            other (Iterable[float]): A BBox or a collection of the form (west, south, east, north)
+
+        Returns:
+            bool: True if the bounding boxes share any area or edge
+        """
+        west, south, east, north = other
+        return west <= self.east and east >= self.west and south <= self.north and north >= self.south
+
+    def contains(self, other: Iterable[float]) -> bool:
+        """
+        Checks whether another bounding box is inside this one, including along its edges
+
+        Args:
+            other (Iterable[float]): A BBox or a collection of the form (west, south, east, north)
+
+        Returns:
+            bool: True if the other bounding box is inside this one
+        """
+        west, south, east, north = other
+        return west >= self.west and south >= self.south and east <= self.east and north <= self.north
+
+    def union(self, other: Iterable[float]) -> "BBox":
+        """
+        Returns the smallest bounding box containing this one and another
+
+        Args:
+            other (Iterable[float]): A BBox or a collection of the form (west, south, east, north)
+
+        Returns:
+            BBox: The bounding box of both
+        """
+        west, south, east, north = other
+        return BBox(min(west, self.west), min(south, self.south), max(east, self.east), max(north, self.north))
+
+
+class BBoxArray:
+    """
+    An array of bounding boxes held in a single (n, 4) NumPy array of (west, south, east, north) rows, so that many
+    boxes can be tested against a box, or against each other, in one vectorised call without creating a BBox for each
+
+    Args:
+        bounds (Union[Iterable[Iterable[float]], np.ndarray]): BBoxes, collections of the form
+            (west, south, east, north), or an array of shape (n, 4)
+
+    Example::
+
+        from osdatahub.bbox import BBox, BBoxArray
+
+        tiles = BBoxArray([(0, 0, 10, 10), (10, 0, 20, 10), (40, 40, 50, 50)])
+        tiles.intersects(BBox(5, 5, 15, 15))  # array([ True,  True, False])
+        tiles[tiles.intersects((5, 5, 15, 15))].union()  # BBox(west=0.0, south=0.0, east=20.0, north=10.0)
+    """
+
+    __slots__ = ("bounds",)
+
+    def __init__(self, bounds: Union[Iterable[Iterable[float]], np.ndarray]):
+        bounds = np.asarray(bounds if isinstance(bounds, np.ndarray) else list(bounds), dtype=float)
+        if bounds.size == 0:
+            bounds = bounds.reshape(0, 4)
+        if bounds.ndim != 2 or bounds.shape[1] != 4:
+            raise ValueError(f"bounds must have the shape (n, 4), got {bounds.shape}")
+        self.bounds = bounds
+
+    @classmethod
+    def from_geometries(cls, geometries: Iterable) -> "BBoxArray":
+        """
+        Creates the bounding boxes of shapely geometries
+
+        Args:
+            geometries (Iterable): Shapely geometries, or an array of them
+
+        Returns:
+            BBoxArray: The bounding box of each geometry, NaN for missing or empty geometries
+        """
+        return cls(shapely.bounds(np.asarray(geometries, dtype=object)).reshape(-1, 4))
+
+    @property
+    def west(self) -> np.ndarray:
+        return self.bounds[:, 0]
+
+    @property
+    def south(self) -> np.ndarray:
+        return self.bounds[:, 1]
+
+    @property
+    def east(self) -> np.ndarray:
+        return self.bounds[:, 2]
+
+    @property
+    def north(self) -> np.ndarray:
+        return self.bounds[:, 3]
+
+    def intersects(self, other: Union[Iterable[float], "BBoxArray"]) -> np.ndarray:
+        """
+        Checks which bounding boxes overlap or touch another
+
+        Args:
+            other (Union[Iterable[float], BBoxArray]): A single bounding box to test every box against, or a BBoxArray
+                of the same length to test pairwise
+
+        Returns:
+            np.ndarray: A boolean array, True where the bounding boxes share any area or edge
+        """
+        west, south, east, north = self.__columns(other)
+        return (west <= self.east) & (east >= self.west) & (south <= self.north) & (north >= self.south)
+
+    def contains(self, other: Union[Iterable[float], "BBoxArray"]) -> np.ndarray:
+        """
+        Checks which bounding boxes contain another, including along their edges
+
+        Args:
+            other (Union[Iterable[float], BBoxArray]): A single bounding box to test every box against, or a BBoxArray
+                of the same length to test pairwise
+
+        Returns:
+            np.ndarray: A boolean array, True where the other bounding box is inside
+        """
+        west, south, east, north = self.__columns(other)
+        return (west >= self.west) & (south >= self.south) & (east <= self.east) & (north <= self.north)
+
+    def within(self, other: Union[Iterable[float], "BBoxArray"]) -> np.ndarray:
+        """
+        Checks which bounding boxes are inside another, including along its edges
+
+        Args:
+            other (Union[Iterable[float], BBoxArray]): A single bounding box to test every box against, or a BBoxArray
+                of the same length to test pairwise
+
+        Returns:
+            np.ndarray: A boolean array, True where the bounding box is inside the other
+        """
+        west, south, east, north = self.__columns(other)
+        return (self.west >= west) & (self.south >= south) & (self.east <= east) & (self.north <= north)
+
+    def union(self, other: Union[Iterable[float], "BBoxArray", None] = None) -> Union[BBox, "BBoxArray"]:
+        """
+        Combines bounding boxes
+
+        Args:
+            other (Union[Iterable[float], BBoxArray], optional): A bounding box to combine with every box, or a
+                BBoxArray of the same length to combine pairwise. Defaults to None, which combines the boxes of this
+                array into one
+
+        Returns:
+            Union[BBox, BBoxArray]: The bounding box of every box if other is None, otherwise the bounding box of
+            each box and other
+        """
+        if other is None:
+            if not len(self):
+                raise ValueError("Cannot take the union of an empty BBoxArray")
+            west, south = np.nanmin(self.bounds[:, :2], axis=0).tolist()
+            east, north = np.nanmax(self.bounds[:, 2:], axis=0).tolist()
+            return BBox(west, south, east, north)
+        west, south, east, north = self.__columns(other)
+        columns = (np.minimum(self.west, west), np.minimum(self.south, south),
+                   np.maximum(self.east, east), np.maximum(self.north, north))
+        return BBoxArray(np.column_stack(np.broadcast_arrays(*columns)))
+
+    def __columns(self, other: Union[Iterable[float], "BBoxArray"]) -> tuple:
+        if isinstance(other, BBoxArray):
+            if len(other) != len(self):
+                raise ValueError(f"BBoxArrays must be the same length to compare, got {len(self)} and {len(other)}")
+            return other.west, other.south, other.east, other.north
+        west, south, east, north = other
+        return west, south, east, north
+
+    def __len__(self) -> int:
+        return len(self.bounds)
+
+    def __getitem__(self, index) -> Union[BBox, "BBoxArray"]:
+        if isinstance(index, (int, np.integer)):
+            return BBox(*self.bounds[index].tolist())
+        return BBoxArray(self.bounds[index])
+
+    def __iter__(self) -> Iterator[BBox]:
+        return (BBox(*row) for row in self.bounds.tolist())
+
+    def __eq__(self, o: object) -> bool:
+        return isinstance(o, BBoxArray) and np.array_equal(self.bounds, o.bounds, equal_nan=True)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.bounds.tolist()})"
@@ -0,0 +1,188 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Union
+
+from osdatahub.config import get_config
+
+CACHE_DIR_ENV = "OSDATAHUB_CACHE_DIR"
+
+
+def default_cache_dir() -> Path:
+    """
+    The directory osdatahub keeps its caches in: the cache_dir of the ClientConfig in use if set, otherwise
+    $OSDATAHUB_CACHE_DIR if set, otherwise ~/.cache/osdatahub
+    """
+    return Path(get_config().cache_dir or os.environ.get(CACHE_DIR_ENV) or Path.home() / ".cache" / "osdatahub")
+
+
+# rows without an expiry time are kept until they are deleted
+_LIVE = "(expires IS NULL OR expires > ?)"
+
+
+class PersistentCache:
+    """
+    A key-value cache stored in a SQLite database, so that results can be reused between runs and shared between
+    processes. Values must be JSON serialisable.
+
+    Values can be given a time to live, after which they are treated as missing.
+
+    Args:
+        path (Union[str, Path], optional): Database file to store the cache in. It is created if it doesn't exist.
+            Defaults to None, which keeps the cache in memory only
+        table (str, optional): Name of the table holding the cache, so that several caches can share one file.
+            Defaults to "cache"
+        ttl (float, optional): Seconds that values are kept for, unless set with their own ttl. Defaults to None, which
+            keeps them until they are deleted
+        mode (int, optional): Permissions of the database file, e.g. 0o600 to keep it private to the user. The file is
+            created with them before SQLite opens it, and SQLite gives its -wal and -shm files the same permissions.
+            Defaults to None, which leaves the permissions to SQLite and the umask
+
+    Example::
+
+        from osdatahub.cache import PersistentCache
+
+        cache = PersistentCache("links.sqlite")
+        cache.set("200001025758", {"linkedIdentifier": ...})
+        cached = cache.get("200001025758")
+    """
+
+    def __init__(self,
+                 path: Union[str, Path, None] = None,
+                 table: str = "cache",
+                 ttl: Union[float, None] = None,
+                 mode: Union[int, None] = None):
+        if not table.isidentifier():
+            raise ValueError(f"table must be a valid identifier, got {table}")
+        self.path = Path(path) if path is not None else None
+        self._table = table
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if mode is not None:
+                self.__create(self.path, mode)
+        self._connection = sqlite3.connect(str(self.path) if self.path is not None else ":memory:",
+                                           check_same_thread=False, timeout=30)
+        with self._lock, self._connection:
+            if self.path is not None:
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT, "
+                                     f"expires REAL)")
+            columns = [row[1] for row in self._connection.execute(f"PRAGMA table_info({table})")]
+            if "expires" not in columns:
+                # caches written before values could expire
+                self._connection.execute(f"ALTER TABLE {table} ADD COLUMN expires REAL")
+
+    @staticmethod
+    def __create(path: Path, mode: int) -> None:
+        """Creates the database file with the given permissions, and restricts those of an existing one"""
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, mode))
+        for existing in (path, Path(f"{path}-wal"), Path(f"{path}-shm")):
+            if existing.exists():
+                os.chmod(existing, mode)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = self._connection.execute(f"SELECT 1 FROM {self._table} WHERE key = ? AND {_LIVE}",
+                                           (key, time.time())).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM {self._table} WHERE {_LIVE}",
+                                            (time.time(),)).fetchone()[0]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Gets a value from the cache
+
+        Args:
+            key (str): The key of the value
+            default (Any, optional): Returned if the key isn't in the cache. Defaults to None
+
+        Returns:
+            The cached value, or default
+        """
+        with self._lock:
+            row = self._connection.execute(f"SELECT value FROM {self._table} WHERE key = ? AND {_LIVE}",
+                                           (key, time.time())).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Gets all of the given keys that are in the cache
+
+        Args:
+            keys (Iterable[str]): The keys to look up
+
+        Returns:
+            dict: The cached values of the keys that were found
+        """
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        with self._lock:
+            # SQLite limits the number of parameters in a single query
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT key, value FROM {self._table} WHERE key IN ({placeholders}) AND {_LIVE}", batch + [now])
+                found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def set(self, key: str, value: Any, ttl: Union[float, None] = None) -> None:
+        """
+        Adds a value to the cache, replacing any existing value
+
+        Args:
+            key (str): The key of the value
+            value (Any): A JSON serialisable value
+            ttl (float, optional): Seconds to keep the value for. Defaults to None, which uses the cache's ttl
+        """
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: Dict[str, Any], ttl: Union[float, None] = None) -> None:
+        """
+        Adds several values to the cache in a single transaction, replacing any existing values
+
+        Args:
+            items (dict): The keys and JSON serialisable values to add
+            ttl (float, optional): Seconds to keep the values for. Defaults to None, which uses the cache's ttl
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        expires = time.time() + ttl if ttl is not None else None
+        rows = [(key, json.dumps(value), expires) for key, value in items.items()]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO {self._table} (key, value, expires) VALUES (?, ?, ?)", rows)
+
+    def purge(self) -> None:
+        """Removes expired values from the database"""
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self._table} WHERE NOT {_LIVE}", (time.time(),))
+
+    def delete(self, key: str) -> None:
+        """Removes a key from the cache, if it is there"""
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Removes everything from the cache"""
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self._table}")
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "PersistentCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
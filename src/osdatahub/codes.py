@@ -23,7 +23,7 @@ COUNTRY_CODES = {
 }
 
 AREA_CODES = {"GB", "HP", "HT", "HU", "HW", "HX", "HY", "HZ", "NA", "NB", "NC", "ND", "NF", "NG", "NH", "NJ", "NK",
-              "NL", "NM", "NN," "NO", "NR", "NS", "NT", "NU", "NW", "NX", "NY", "NZ", "OV", "SD", "SE", "TA", "SH",
+              "NL", "NM", "NN", "NO", "NR", "NS", "NT", "NU", "NW", "NX", "NY", "NZ", "OV", "SD", "SE", "TA", "SH",
               "SJ", "SK", "TF", "TG", "SM", "SN", "SO", "SP", "TL", "TM", "SR", "SS", "ST", "SU", "TQ", "TR", "SV",
               "SW", "SX", "SY", "SZ", "TV"}
 
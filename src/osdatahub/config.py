@@ -0,0 +1,133 @@
+"""
+Settings shared by every osdatahub client: proxies, timeouts, connection pool sizes, retries and where caches are
+kept. There is one process-wide ClientConfig, changed with osdatahub.configure, which can be overridden for a block
+of code with override. Clients read the configuration once, when they are created or when a request is made, so
+looking it up costs no more than reading a context variable.
+
+Overrides are local to the thread or asyncio task that makes them (tasks created inside the block inherit them), so
+threads started inside the block, such as the workers of a ThreadPoolExecutor, see the process-wide configuration.
+
+Example::
+
+    import osdatahub
+    from osdatahub.config import override
+
+    osdatahub.configure(proxies={"https": "http://proxy:3128"}, timeout=60, pool_maxsize=20)
+
+    with override(timeout=5):
+        results = places.uprn(200010019924)
+"""
+
+import contextlib
+import dataclasses
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Iterator, Mapping, Union
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """
+    The settings used by the osdatahub clients. Instances are immutable: use osdatahub.configure or override to
+    change the configuration in use
+
+    Args:
+        proxies (Mapping[str, str], optional): Proxies by URL scheme, e.g. {"https": "http://ip:port"}. Defaults to {}
+        timeout (float, optional): Seconds to wait to connect to the APIs, and between bytes of their responses,
+            before giving up on a request. Defaults to None (wait indefinitely)
+        pool_connections (int, optional): Number of hosts to keep pooled connections to. Defaults to 10
+        pool_maxsize (int, optional): Maximum pooled connections to each host, e.g. for parallel queries. Defaults
+            to 10
+        max_retries (int, optional): Times to retry requests that fail to connect. Defaults to 0
+        cache_dir (Union[str, Path], optional): Directory the persistent caches are kept in. Defaults to None, which
+            uses $OSDATAHUB_CACHE_DIR, or ~/.cache/osdatahub if that isn't set
+        async_max_concurrent (int, optional): Maximum concurrent requests of each async client. Defaults to 5
+        async_request_delay (float, optional): Delay between the requests of each async client in seconds. Defaults
+            to 0.1
+        async_max_retries (int, optional): Maximum attempts of each async request. Defaults to 3
+        async_connector_limit (int, optional): Connection pool limit of each async client. Defaults to 30
+        async_connector_limit_per_host (int, optional): Connection pool limit per host of each async client.
+            Defaults to 5
+        async_timeout (float, optional): Total seconds each async request may take. Async file downloads, which can
+            take longer than any total, use it to limit connecting and each read instead. Defaults to 30
+    """
+
+    proxies: Mapping[str, str] = field(default_factory=dict)
+    timeout: Union[float, None] = None
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    max_retries: int = 0
+    cache_dir: Union[str, Path, None] = None
+    async_max_concurrent: int = 5
+    async_request_delay: float = 0.1
+    async_max_retries: int = 3
+    async_connector_limit: int = 30
+    async_connector_limit_per_host: int = 5
+    async_timeout: float = 30.0
+
+    def __post_init__(self):
+        # read-only, so that the mapping shared by every request can't be changed through it
+        object.__setattr__(self, "proxies", MappingProxyType(dict(self.proxies or {})))
+
+    def replace(self, **changes) -> "ClientConfig":
+        """
+        Returns a copy of the configuration with some settings changed
+
+        Args:
+            **changes: The settings to change, by name
+
+        Returns:
+            ClientConfig: The new configuration
+        """
+        unknown = set(changes) - {f.name for f in dataclasses.fields(self)}
+        if unknown:
+            raise TypeError(f"Unknown ClientConfig settings: {sorted(unknown)}")
+        return dataclasses.replace(self, **changes)
+
+
+_global = ClientConfig()
+_global_lock = threading.Lock()
+_context: ContextVar[Union[ClientConfig, None]] = ContextVar("osdatahub_config", default=None)
+
+
+def get_config() -> ClientConfig:
+    """Returns the configuration in use: the innermost override, or the process-wide configuration"""
+    return _context.get() or _global
+
+
+def configure(**changes) -> ClientConfig:
+    """
+    Changes the process-wide configuration. Settings not given are unchanged
+
+    Args:
+        **changes: The settings of ClientConfig to change, by name
+
+    Returns:
+        ClientConfig: The new process-wide configuration
+    """
+    global _global
+    with _global_lock:
+        _global = _global.replace(**changes)
+        return _global
+
+
+@contextlib.contextmanager
+def override(**changes) -> Iterator[ClientConfig]:
+    """
+    Changes settings of the configuration in use within a with block, in the current thread or asyncio task only
+
+    Args:
+        **changes: The settings of ClientConfig to change, by name
+
+    Yields:
+        ClientConfig: The configuration in use within the block
+    """
+    config = get_config().replace(**changes)
+    token = _context.set(config)
+    try:
+        yield config
+    finally:
+        _context.reset(token)
@@ -1,13 +1,19 @@
 from dataclasses import dataclass
-from typing import Collection, Union, Iterable
+from itertools import chain
+from typing import Collection, Dict, Iterable, List, Sequence, Union
 
 import osdatahub
 from osdatahub.bbox import BBox
-from osdatahub.ons_api import get_ons_geom
-from shapely.geometry import Polygon, box
+from osdatahub.grid_reference import decode
+from osdatahub.ons_api import get_ons_geom, get_ons_geoms
+from osdatahub.reproject import transform_geometry
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon, Polygon, box, shape
 from shapely.geometry.point import Point
 
 _VALID_CRS = ("EPSG:27700", "EPSG:3857", "EPSG:4326", "EPSG:7405", "CRS84")
+_PREDICATES = ("intersects", "contains", "contains_properly", "covers", "overlaps", "crosses", "touches", "within")
 
 
 @dataclass(frozen=True)
@@ -20,14 +26,17 @@ class Extent:
         - It has multiple constructors that allow the user to create custom
           Extents without needing to write out polygon coordinates.
 
+    An Extent can also be a MultiPolygon, such as a coastal boundary with islands. Its parts can be queried
+    separately, and the PlacesAPI queries them in parallel.
+
     """
 
-    polygon: Polygon
+    polygon: Union[Polygon, MultiPolygon]
     crs: str
 
     def __post_init__(self):
-        if not isinstance(self.polygon, Polygon):
-            raise TypeError("Extent expects geometry as a shapley Polygon")
+        if not isinstance(self.polygon, (Polygon, MultiPolygon)):
+            raise TypeError("Extent expects geometry as a shapely Polygon or MultiPolygon")
         if self.crs.upper() not in _VALID_CRS:
             raise ValueError(
                 f"Extent CRS must be one of {_VALID_CRS}, got '{self.crs}'"
@@ -37,8 +46,17 @@ class Extent:
     def bbox(self) -> BBox:
         return BBox(*self.polygon.bounds)
 
+    @property
+    def parts(self) -> List["Extent"]:
+        """The Extent of each polygon of a MultiPolygon Extent, or a list of just this Extent if it is a Polygon"""
+        if isinstance(self.polygon, Polygon):
+            return [self]
+        return [Extent(part, self.crs) for part in self.polygon.geoms]
+
     @property
     def xml_coords(self) -> str:
+        if not isinstance(self.polygon, Polygon):
+            raise ValueError("xml_coords is only available for Polygon extents, use the xml_coords of each of parts")
         coords = self.polygon.exterior.coords
         if self.crs.upper() == "EPSG:4326":
             return " ".join([f"{c2},{c1}" for c1, c2 in coords])
@@ -69,6 +87,22 @@ class Extent:
                 "of the form (west, south, east, north)"
             ) from None
 
+    @classmethod
+    def from_grid_reference(cls, grid_reference: str) -> "Extent":
+        """Creates an extent of an OS National Grid square, given its grid reference.
+
+        Args:
+            grid_reference (str): A grid reference of any precision, e.g. 'SU', 'SU31' or 'SU 3720 1551'
+
+        Raises:
+            ValueError: If grid_reference isn't a valid grid reference.
+
+        Returns:
+            Extent: The square, in the 'EPSG:27700' coordinate system.
+        """
+        (west,), (south,), (size,) = decode(grid_reference)
+        return Extent(box(west, south, west + size, south + size), "EPSG:27700")
+
     @classmethod
     def from_radius(cls, centre: Iterable, radius: float, crs: str) -> "Extent":
         """Creates a circular extent, given a centre point and a radius.
@@ -103,7 +137,8 @@ class Extent:
 
     def set_crs(self, crs: str) -> "Extent":
         """
-        Changes the coordinate reference system of the Extent object to the value specified
+        Changes the coordinate reference system of the Extent object to the value specified, without changing its
+        coordinates. To transform the coordinates into another CRS, use to_crs
 
         Args:
             crs (str): The CRS to change to, must be either ‘’EPSG:4326’, EPSG:27700’ or ‘EPSG:3857’.
@@ -113,6 +148,26 @@ class Extent:
         """
         return Extent(self.polygon, crs)
 
+    def to_crs(self, crs: str, max_segment_length: Union[float, None] = None) -> "Extent":
+        """
+        Transforms the Extent into another coordinate reference system. pyproj is used if it is installed, otherwise
+        a built-in transformation accurate to around 5 metres, see osdatahub.reproject
+
+        Args:
+            crs (str): The CRS to transform to, must be one of 'EPSG:27700', 'EPSG:7405', 'EPSG:4326', 'CRS84' or
+                'EPSG:3857'
+            max_segment_length (float, optional): Adds vertices along edges longer than this (in the units of the
+                Extent's current CRS) before transforming, so that straight edges follow their curved path in the new
+                CRS. Defaults to None (edges are left as they are)
+
+        Returns:
+            Extent: The Extent in the new CRS
+        """
+        polygon = self.polygon
+        if max_segment_length is not None:
+            polygon = shapely.segmentize(polygon, max_segment_length)
+        return Extent(transform_geometry(polygon, self.crs, crs), crs)
+
     def is_within(self, bbox: Union[Collection[float], BBox]) -> bool:
         """
         Checks whether a bounding box is within the Extent object
@@ -131,45 +186,156 @@ class Extent:
                 "bbox must be a BBox object or a collection "
                 "of the form (west, south, east, north)"
             ) from None
-        return bbox[:2] <= self.bbox[:2] and bbox[-2:] >= self.bbox[-2:]
+        return bbox.contains(self.polygon.bounds)
+
+    def filter(self,
+               features: Union[dict, Sequence],
+               predicate: str = "intersects",
+               mask: bool = False) -> Union[dict, Sequence, np.ndarray]:
+        """
+        Filters features by their exact relationship to the Extent, for example to clip results that the API has
+        matched against a simplified or bounding box extent. The Extent is prepared and the features are indexed
+        in an STRtree, so that every feature is tested in one vectorised call
+
+        Args:
+            features (Union[dict, Sequence]): A GeoJSON FeatureCollection, such as the results of a query, a list of
+                GeoJSON features, or a list or array of shapely geometries. If a FeatureCollection has a "crs" member
+                different to the Extent's CRS, the Extent is transformed to it
+            predicate (str, optional): How features must relate to the Extent, tested as
+                extent.polygon.<predicate>(feature), one of "intersects", "contains", "contains_properly", "covers",
+                "overlaps", "crosses", "touches" or "within". Defaults to "intersects"
+            mask (bool, optional): Whether to return a boolean array marking the matching features instead of the
+                features themselves. Defaults to False
+
+        Returns:
+            Union[dict, Sequence, np.ndarray]: The matching features, in the same form and order as given (a
+            FeatureCollection is copied with only the matching features), or a boolean mask if mask is True
+
+        Example::
+
+            from osdatahub import Extent, FeaturesAPI
+
+            extent = Extent.from_ons_code("E05009405")
+            results = FeaturesAPI(key, "Zoomstack_Sites", extent).query(limit=100000)
+            inside = extent.filter(results, predicate="contains")
+        """
+        if predicate not in _PREDICATES:
+            raise ValueError(f"predicate must be one of {_PREDICATES}, got '{predicate}'")
+        polygon = self.polygon
+        crs = features.get("crs") if isinstance(features, dict) else None
+        if isinstance(crs, str) and crs.upper() != self.crs.upper():
+            polygon = self.to_crs(crs).polygon
+        items = features["features"] if isinstance(features, dict) else features
+        geometries = _geometries(items)
+
+        shapely.prepare(polygon)
+        matches = np.zeros(len(geometries), dtype=bool)
+        # the tree narrows the features down by bounding box before the prepared predicate is tested
+        matches[shapely.STRtree(geometries).query(polygon, predicate=predicate)] = True
+        if mask:
+            return matches
+        if isinstance(features, dict):
+            return {**features, "features": [item for item, match in zip(items, matches) if match]}
+        if isinstance(features, np.ndarray):
+            return features[matches]
+        return [item for item, match in zip(items, matches) if match]
+
+    def split(self, rows: int = 2, cols: int = 2) -> List["Extent"]:
+        """
+        Splits the Extent into smaller Extents by cutting it with a regular grid laid over its bounding box.
+        Grid cells that don't overlap the Extent are dropped, and cells that cut the Extent into several pieces
+        produce one Extent per piece. Neighbouring Extents share their boundaries.
+
+        Args:
+            rows (int, optional): Number of grid rows. Defaults to 2
+            cols (int, optional): Number of grid columns. Defaults to 2
+
+        Returns:
+            list: Extents covering the original Extent, all in the same CRS
+        """
+        if rows < 1 or cols < 1:
+            raise ValueError(f"rows and cols must both be at least 1, got rows={rows} and cols={cols}")
+        west, south, east, north = self.polygon.bounds
+        width, height = (east - west) / cols, (north - south) / rows
+        parts = []
+        for row in range(rows):
+            for col in range(cols):
+                cell = box(west + col * width, south + row * height,
+                           west + (col + 1) * width, south + (row + 1) * height)
+                piece = self.polygon.intersection(cell)
+                parts.extend(geom for geom in getattr(piece, "geoms", [piece])
+                             if isinstance(geom, Polygon) and not geom.is_empty)
+        return [Extent(part, self.crs) for part in parts]
 
     def to_json(self):
         """
         Converts the extent object into a json
 
         Returns:
-            dict: A json containing the coordinates of the Extent
+            dict: A json containing the coordinates of the Extent, as a MultiPolygon if it has several parts
         """
-        coords = list(self.polygon.exterior.coords)
-        if self.crs.upper() == "EPSG:4326":
-            coords = [(c2, c1) for c1, c2 in coords]
-        return {"type": "Polygon", "coordinates": [coords]}
+        polygons = []
+        for part in self.parts:
+            coords = list(part.polygon.exterior.coords)
+            if self.crs.upper() == "EPSG:4326":
+                coords = [(c2, c1) for c1, c2 in coords]
+            polygons.append([coords])
+        if isinstance(self.polygon, Polygon):
+            return {"type": "Polygon", "coordinates": polygons[0]}
+        return {"type": "MultiPolygon", "coordinates": polygons}
 
     @classmethod
-    def from_ons_code(cls, ons_code: str) -> "Extent":
+    def from_ons_code(cls, ons_code: str, cache: bool = True) -> "Extent":
         """Creates an extent of an existing ONS boundary.
         Note that the output will be in the "EPSG:4326" coordinate system.
         A full list of available ONS geographies can be found here:
         http://statistics.data.gov.uk/atlas/resource?uri=http://statistics.data.gov.uk/id/statistical-geography/K02000001
 
+        Boundaries are kept in a persistent cache for 30 days, see osdatahub.ons_api.boundary_cache
+
         Args:
             ons_code (str): The code for the desired geography
+            cache (bool, optional): Whether to use the boundary cache. Defaults to True
         Raises:
-            ValueError: If the ONS geography is not a Polygon.
+            ValueError: If the ONS geography is not a Polygon or MultiPolygon.
 
         Returns:
             Extent: An extent of the ONS geography.
         """
-        geom = get_ons_geom(ons_code)
+        return cls.__from_ons_geom(ons_code, get_ons_geom(ons_code, cache=cache))
+
+    @classmethod
+    def from_ons_codes(cls, ons_codes: Iterable[str], cache: bool = True, max_workers: int = 8) -> Dict[str, "Extent"]:
+        """Creates extents of several ONS boundaries, fetching those that aren't cached concurrently.
+        Note that the output will be in the "EPSG:4326" coordinate system.
+
+        Args:
+            ons_codes (Iterable[str]): The codes of the desired geographies
+            cache (bool, optional): Whether to use the boundary cache. Defaults to True
+            max_workers (int, optional): Maximum number of boundaries to fetch at once. Defaults to 8
+        Raises:
+            ValueError: If an ONS geography is not a Polygon or MultiPolygon.
+
+        Returns:
+            dict: The extent of each ONS geography, keyed by its code.
+        """
+        geometries = get_ons_geoms(ons_codes, cache=cache, max_workers=max_workers)
+        return {ons_code: cls.__from_ons_geom(ons_code, geom) for ons_code, geom in geometries.items()}
+
+    @staticmethod
+    def __from_ons_geom(ons_code: str, geom: dict) -> "Extent":
         geom_type = geom["type"]
-        if geom_type != "Polygon":
+        if geom_type not in ("Polygon", "MultiPolygon"):
             raise ValueError(
-                f"osdatahub doesn't currently support geometry types other than Polygon. \n The ONS geography {ons_code} is a {geom_type}"
+                f"osdatahub doesn't currently support geometry types other than Polygon and MultiPolygon. \n "
+                f"The ONS geography {ons_code} is a {geom_type}"
             )
-        polygon = Polygon(geom["coordinates"][0])
-        return Extent(polygon, "EPSG:4326")
+        return Extent(shape(geom), "EPSG:4326")
 
     def __repr__(self):
+        if isinstance(self.polygon, MultiPolygon):
+            parts = [list(part.exterior.coords) for part in self.polygon.geoms]
+            return f"{self.__class__.__name__}(polygon=MultiPolygon({parts}),crs='{self.crs}')"
         coords = list(self.polygon.exterior.coords)
         return (
             f"{self.__class__.__name__}(polygon=Polygon({coords})," f"crs='{self.crs}')"
@@ -177,3 +343,30 @@ class Extent:
 
     def __eq__(self, o: object) -> bool:
         return self.polygon.equals(o.polygon) and (self.crs == o.crs)
+
+
+# the levels of nested lists between a GeoJSON geometry's "coordinates" and its positions
+_DEPTHS = {"Point": 0, "LineString": 1, "MultiPoint": 1, "Polygon": 2, "MultiLineString": 2, "MultiPolygon": 3}
+
+
+def _geometries(items: Sequence) -> np.ndarray:
+    """Converts GeoJSON features, or shapely geometries, to an array of shapely geometries (None where missing)"""
+    if isinstance(items, np.ndarray) and (not len(items) or isinstance(items[0], shapely.Geometry)):
+        return items
+    geojson = [item["geometry"] if isinstance(item, dict) and "geometry" in item else item for item in items]
+    types = np.array([geom.get("type", "") if isinstance(geom, dict) else "" for geom in geojson], dtype=object)
+    geometries = np.empty(len(geojson), dtype=object)
+    for i in np.flatnonzero(~np.isin(types, list(_DEPTHS))):
+        geometries[i] = shape(geojson[i]) if isinstance(geojson[i], dict) else geojson[i]
+    # each type is built in one call from flattened coordinates, rather than one shape() call per feature
+    for geom_type in set(types) & set(_DEPTHS):
+        indices = np.flatnonzero(types == geom_type)
+        nested, offsets = [geojson[i]["coordinates"] for i in indices], []
+        for _ in range(_DEPTHS[geom_type]):
+            offsets.insert(0, np.cumsum([0] + [len(part) for part in nested]))
+            nested = list(chain.from_iterable(nested))
+        coords = np.fromiter(chain.from_iterable(position[:2] for position in nested), dtype=float,
+                             count=2 * len(nested)).reshape(-1, 2)
+        geometries[indices] = shapely.from_ragged_array(getattr(shapely.GeometryType, geom_type.upper()), coords,
+                                                        tuple(offsets) or None)
+    return geometries
@@ -130,19 +130,32 @@ def spatial_filter(operator: str, extent: Extent) -> Filter:
     Returns:
         Filter: A valid OGC XML filter
     """
-    coords = extent.xml_coords
     crs = extent.crs.upper()
+    if len(extent.parts) == 1:
+        geometry = _gml_polygon(extent.xml_coords, f" xmlns:gml='http://www.opengis.net/gml' srsName='{crs}'")
+    else:
+        members = "".join(f"<gml:polygonMember>{_gml_polygon(part.xml_coords)}</gml:polygonMember>"
+                          for part in extent.parts)
+        geometry = (f"<gml:MultiPolygon xmlns:gml='http://www.opengis.net/gml' srsName='{crs}'>"
+                    f"{members}"
+                    "</gml:MultiPolygon>")
     return Filter(
         f"<ogc:{operator}>"
         "<ogc:PropertyName>SHAPE</ogc:PropertyName>"
-        f"<gml:Polygon xmlns:gml='http://www.opengis.net/gml' srsName='{crs}'>"
+        f"{geometry}"
+        f"</ogc:{operator}>"
+    )
+
+
+def _gml_polygon(coords: str, attributes: str = "") -> str:
+    return (
+        f"<gml:Polygon{attributes}>"
         "<gml:outerBoundaryIs>"
         "<gml:LinearRing>"
         f'<gml:coordinates decimal="." cs="," ts=" ">{coords}</gml:coordinates>'
         "</gml:LinearRing>"
         "</gml:outerBoundaryIs>"
         "</gml:Polygon>"
-        f"</ogc:{operator}>"
     )
 
 
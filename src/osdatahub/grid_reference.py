@@ -0,0 +1,205 @@
+"""
+Conversion between OS National Grid references, such as "SU 3720 1551", and British National Grid (EPSG:27700)
+coordinates, over NumPy arrays of either, and tiling of extents into National Grid squares.
+
+A grid reference is two letters naming a 100km square, followed by an equal number of easting and northing digits
+locating a smaller square within it: "SU" is 100km across, "SU31" 10km, "SU3715" 1km and "SU 3720 1551" 10m. The
+100km squares are the areas of the Downloads API.
+"""
+
+from typing import TYPE_CHECKING, Iterable, List, Tuple, Union
+
+import numpy as np
+import shapely
+
+if TYPE_CHECKING:
+    from osdatahub.extent import Extent
+
+# the 5x5 grids of 500km and 100km square letters, left to right and top to bottom, skipping I
+_LETTERS = np.array(list("ABCDEFGHJKLMNOPQRSTUVWXYZ"))
+_LETTER_INDEX = np.full(128, -1)
+_LETTER_INDEX[[ord(letter) for letter in _LETTERS]] = np.arange(25)
+# the National Grid covers eastings 0 to 700km and northings 0 to 1300km
+_MAX_EASTING, _MAX_NORTHING = 700000, 1300000
+SQUARE_SIZES = (100000, 10000, 1000, 100, 10, 1)
+
+
+def encode(easting: Union[float, Iterable[float]],
+           northing: Union[float, Iterable[float]],
+           digits: int = 4,
+           separator: str = " ") -> Union[str, np.ndarray]:
+    """
+    Converts British National Grid coordinates to grid references, of the squares containing them
+
+    Args:
+        easting (Union[float, Iterable[float]]): Eastings in metres
+        northing (Union[float, Iterable[float]]): Northings in metres
+        digits (int, optional): Digits of each of the easting and northing, from 0 ("SU", 100km squares) to 5
+            ("SU 37201 15512", 1m squares). Defaults to 4 (10m squares)
+        separator (str, optional): Placed between the letters and each group of digits. Defaults to " "
+
+    Returns:
+        Union[str, np.ndarray]: The grid reference, or an array of them if arrays of coordinates were given
+
+    Example::
+
+        from osdatahub.grid_reference import encode
+
+        encode(437293, 115541)  # "SU 3729 1554"
+        encode([437293, 651409], [115541, 313177], digits=1, separator="")  # ["SU31", "TG51"]
+    """
+    if not 0 <= digits <= 5:
+        raise ValueError(f"digits must be between 0 and 5, got {digits}")
+    easting, northing = np.asarray(easting, dtype=float), np.asarray(northing, dtype=float)
+    outside = (easting < 0) | (easting >= _MAX_EASTING) | (northing < 0) | (northing >= _MAX_NORTHING)
+    if np.any(outside):
+        raise ValueError(f"Coordinates must be within the National Grid (0 <= easting < {_MAX_EASTING}, "
+                         f"0 <= northing < {_MAX_NORTHING})")
+    scalar = easting.ndim == 0 and northing.ndim == 0
+    easting, northing = np.broadcast_arrays(np.atleast_1d(easting), np.atleast_1d(northing))
+
+    e100k, n100k = (easting // 100000).astype(int), (northing // 100000).astype(int)
+    first = (19 - n100k) - (19 - n100k) % 5 + (e100k + 10) // 5
+    second = (19 - n100k) * 5 % 25 + e100k % 5
+    references = np.char.add(_LETTERS[first], _LETTERS[second])
+    if digits:
+        scale = 10 ** (5 - digits)
+        for coordinate in (easting, northing):
+            within = ((coordinate % 100000) // scale).astype(int)
+            references = np.char.add(np.char.add(references, separator),
+                                     np.char.zfill(within.astype(str), digits))
+    return str(references[0]) if scalar else references
+
+
+def decode(grid_reference: Union[str, Iterable[str]],
+           centre: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Converts grid references to British National Grid coordinates. Grid references are case insensitive and may
+    contain spaces, and can be of different precisions
+
+    Args:
+        grid_reference (Union[str, Iterable[str]]): A grid reference or grid references
+        centre (bool, optional): Whether to return the centres of the squares instead of their south west corners.
+            Defaults to False
+
+    Returns:
+        tuple: Arrays of the eastings, northings and sizes of the squares, in metres
+
+    Example::
+
+        from osdatahub.grid_reference import decode
+
+        eastings, northings, sizes = decode(["SU 3720 1551", "TG51"])  # [437200, 650000], [115510, 310000], [10, 10000]
+    """
+    references = np.char.upper(np.char.replace(np.atleast_1d(np.asarray(grid_reference, dtype=str)), " ", ""))
+    lengths = np.char.str_len(references)
+    eastings, northings = np.zeros(len(references)), np.zeros(len(references))
+    sizes = np.zeros(len(references))
+
+    invalid = (lengths < 2) | (lengths > 12) | (lengths % 2 == 1)
+    # each reference as a row of character codes, padded with zeros
+    codes = np.zeros((len(references), 12), dtype=np.uint8)
+    encoded = np.char.encode(references, "ascii", "replace").astype("S12")
+    codes[:, :] = np.frombuffer(encoded.tobytes(), dtype=np.uint8).reshape(len(references), 12)
+    first, second = _LETTER_INDEX[np.minimum(codes[:, 0], 127)], _LETTER_INDEX[np.minimum(codes[:, 1], 127)]
+    invalid |= (first < 0) | (second < 0)
+
+    e100k = ((first - 2) % 5) * 5 + second % 5
+    n100k = (19 - (first // 5) * 5) - second // 5
+    invalid |= (e100k < 0) | (e100k >= _MAX_EASTING // 100000) | (n100k < 0) | (n100k >= _MAX_NORTHING // 100000)
+
+    for length in np.unique(lengths[~invalid]):
+        rows = np.flatnonzero((lengths == length) & ~invalid)
+        digits = (length - 2) // 2
+        values = codes[rows, 2:length].astype(int) - ord("0")
+        bad = np.any((values < 0) | (values > 9), axis=1)
+        invalid[rows[bad]] = True
+        rows, values = rows[~bad], values[~bad]
+        places = 10 ** np.arange(4, 4 - digits, -1)
+        eastings[rows] = values[:, :digits] @ places if digits else 0
+        northings[rows] = values[:, digits:] @ places if digits else 0
+        sizes[rows] = SQUARE_SIZES[digits]
+
+    if np.any(invalid):
+        raise ValueError(f"Invalid grid references: {np.atleast_1d(np.asarray(grid_reference))[invalid].tolist()}")
+    eastings += e100k * 100000
+    northings += n100k * 100000
+    if centre:
+        eastings, northings = eastings + sizes / 2, northings + sizes / 2
+    return eastings, northings, sizes
+
+
+def squares(extent: "Extent", size: int = 10000) -> List[str]:
+    """
+    Returns the grid references of the National Grid squares of a given size that overlap an extent
+
+    Args:
+        extent (Extent): The extent. It is transformed to British National Grid if it is in another CRS
+        size (int, optional): Width of the squares in metres, one of 100000, 10000, 1000, 100, 10 or 1. Squares of
+            100000 are the areas of the Downloads API. Defaults to 10000
+
+    Returns:
+        list: Grid references without spaces, e.g. ["SU31", "SU32"]
+    """
+    return [reference for reference, _ in _overlapping_squares(extent, size)]
+
+
+def tile(extent: "Extent", size: int = 10000, clip: bool = True) -> List[Tuple[str, "Extent"]]:
+    """
+    Splits an extent into National Grid squares, so that work can be split along the same lines as OS products and
+    the areas of the Downloads API
+
+    Args:
+        extent (Extent): The extent to split. It is transformed to British National Grid if it is in another CRS
+        size (int, optional): Width of the squares in metres, one of 100000, 10000, 1000, 100, 10 or 1. Defaults to
+            10000
+        clip (bool, optional): Whether to clip the squares to the extent. If a square cuts the extent into several
+            pieces, each piece is returned with the square's grid reference. Defaults to True
+
+    Returns:
+        list: Pairs of grid reference and the British National Grid Extent of its square, or of the part of the
+        extent within it
+
+    Example::
+
+        from osdatahub import Extent
+        from osdatahub.grid_reference import tile
+
+        extent = Extent.from_bbox((400000, 100000, 450000, 130000), "EPSG:27700")
+        for grid_reference, square in tile(extent, size=10000):
+            ...
+    """
+    # imported here as Extent uses this module
+    from osdatahub.extent import Extent
+
+    tiles = []
+    for reference, square in _overlapping_squares(extent, size):
+        if not clip:
+            tiles.append((reference, Extent(square, "EPSG:27700")))
+            continue
+        piece = _bng(extent).polygon.intersection(square)
+        tiles.extend((reference, Extent(part, "EPSG:27700")) for part in getattr(piece, "geoms", [piece])
+                     if part.geom_type == "Polygon" and not part.is_empty)
+    return tiles
+
+
+def _bng(extent: "Extent") -> "Extent":
+    return extent if extent.crs.upper() in ("EPSG:27700", "EPSG:7405") else extent.to_crs("EPSG:27700")
+
+
+def _overlapping_squares(extent: "Extent", size: int) -> List[tuple]:
+    if size not in SQUARE_SIZES:
+        raise ValueError(f"size must be one of {SQUARE_SIZES}, got {size}")
+    polygon = _bng(extent).polygon
+    west, south, east, north = polygon.bounds
+    west, south = max(west // size * size, 0), max(south // size * size, 0)
+    east, north = min(east, _MAX_EASTING), min(north, _MAX_NORTHING)
+    eastings, northings = np.meshgrid(np.arange(west, east, size), np.arange(south, north, size))
+    eastings, northings = eastings.ravel(), northings.ravel()
+    cells = shapely.box(eastings, northings, eastings + size, northings + size)
+    shapely.prepare(polygon)
+    # squares that only touch the extent along an edge don't overlap it
+    overlapping = shapely.intersects(polygon, cells) & ~shapely.touches(polygon, cells)
+    references = encode(eastings[overlapping], northings[overlapping], digits=SQUARE_SIZES.index(size),
+                        separator="")
+    return list(zip(references.tolist(), cells[overlapping]))
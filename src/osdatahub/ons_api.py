@@ -1,9 +1,20 @@
 import json
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable
 
 import osdatahub
 import requests
+from osdatahub.cache import PersistentCache, default_cache_dir
 
 ID_ENDPOINT = "http://statistics.data.gov.uk/geometry?resource=http://statistics.data.gov.uk/id/statistical-geography/"
+# boundaries are only revised occasionally, so are kept for 30 days
+CACHE_TTL = 30 * 24 * 60 * 60
+
+_cache = None
+_cache_lock = threading.Lock()
 
 
 def _sanitise_response(res: requests.Response) -> dict:
@@ -35,15 +46,60 @@ def _remove_duplicate_features(response_json: dict) -> dict:
         raise ValueError(f"Response JSON should contains either 1 or 2.")
 
 
-def get_ons_geom(ons_code: str) -> dict:
+def boundary_cache() -> PersistentCache:
+    """
+    Returns the cache of ONS boundaries, kept in "ons.sqlite" in the directory given by default_cache_dir. If the
+    file can't be opened, the boundaries are only cached in memory
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            path = default_cache_dir() / "ons.sqlite"
+            try:
+                _cache = PersistentCache(path, table="ons_boundaries", ttl=CACHE_TTL)
+            except (sqlite3.Error, OSError) as e:
+                logging.warning(f"Could not open the ONS boundary cache at {path} ({e}). Caching in memory")
+                _cache = PersistentCache(table="ons_boundaries", ttl=CACHE_TTL)
+        return _cache
+
+
+def get_ons_geom(ons_code: str, cache: bool = True) -> dict:
     """Gets coordinates of the boundary of the polygon for the ons_code
 
     Args:
         ons_code (str): ONS code
+        cache (bool, optional): Whether to use the boundary cache. Defaults to True
 
     Returns:
         response_json (dict): The json of the raw response
     """
+    return get_ons_geoms([ons_code], cache=cache)[ons_code]
+
+
+def get_ons_geoms(ons_codes: Iterable[str], cache: bool = True, max_workers: int = 8) -> Dict[str, dict]:
+    """Gets the boundaries of several ONS geographies, fetching those that aren't cached concurrently
+
+    Args:
+        ons_codes (Iterable[str]): ONS codes
+        cache (bool, optional): Whether to use the boundary cache. Defaults to True
+        max_workers (int, optional): Maximum number of boundaries to fetch at once. Defaults to 8
+
+    Returns:
+        dict: The GeoJSON geometry of each ONS code, in the order given
+    """
+    ons_codes = list(dict.fromkeys(ons_codes))
+    geometries = boundary_cache().get_many(ons_codes) if cache else {}
+    missing = [ons_code for ons_code in ons_codes if ons_code not in geometries]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+            fetched = dict(zip(missing, executor.map(_fetch_ons_geom, missing)))
+        if cache:
+            boundary_cache().set_many(fetched)
+        geometries.update(fetched)
+    return {ons_code: geometries[ons_code] for ons_code in ons_codes}
+
+
+def _fetch_ons_geom(ons_code: str) -> dict:
     url = f"{ID_ENDPOINT}{ons_code}"
-    res = osdatahub.get(url, proxies=osdatahub.get_proxies())
+    res = osdatahub.get(url)
     return _sanitise_response(res)
@@ -0,0 +1,80 @@
+import threading
+import time
+
+
+class ThreadedRateLimiter:
+    """
+    Thread-safe rate limiter for the synchronous clients, the counterpart of osdatahub.AsyncAPI.RateLimiter.
+
+    This class provides three levels of rate limiting, shared by every thread using it:
+
+    1. Concurrent request limiting via threading.Semaphore
+    2. Time-based delay between requests to prevent burst traffic
+    3. A shared pause, so that when the API responds with 429 (Too Many Requests) every thread backs off, not just
+       the one that received it
+
+    Args:
+        max_concurrent: Maximum number of concurrent requests (default: 5)
+        request_delay: Minimum delay in seconds between requests (default: 0.02)
+
+    Example::
+
+        limiter = ThreadedRateLimiter(max_concurrent=5, request_delay=0.1)
+        with limiter:
+            response = osdatahub.get(url)
+        if response.status_code == 429:
+            limiter.pause(10)
+    """
+
+    def __init__(self, max_concurrent: int = 5, request_delay: float = 0.02) -> None:
+        self._semaphore: threading.Semaphore = threading.Semaphore(max_concurrent)
+        self._max_concurrent: int = max_concurrent
+        self._request_delay: float = request_delay
+        self._last_request_time: float = 0.0
+        self._resume_time: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+
+    def __enter__(self) -> "ThreadedRateLimiter":
+        """Acquire semaphore and enforce delay between requests."""
+        self._semaphore.acquire()
+        try:
+            self._enforce_delay()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Release the semaphore."""
+        self._semaphore.release()
+
+    def _enforce_delay(self) -> None:
+        """Ensure minimum delay between requests, and wait for any pause to end."""
+        # the next start time is reserved under the lock, and waited for outside it, so that waiting threads sleep
+        # at the same time instead of one after another
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._last_request_time + self._request_delay, self._resume_time)
+            self._last_request_time = start
+        if start > now:
+            time.sleep(start - now)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops any new requests from starting for the given number of seconds
+
+        Args:
+            seconds: How long to pause for
+        """
+        with self._lock:
+            self._resume_time = max(self._resume_time, time.monotonic() + seconds)
+
+    @property
+    def max_concurrent(self) -> int:
+        """Return the maximum number of concurrent requests allowed."""
+        return self._max_concurrent
+
+    @property
+    def request_delay(self) -> float:
+        """Return the minimum delay between requests."""
+        return self._request_delay
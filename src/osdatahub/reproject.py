@@ -0,0 +1,314 @@
+"""
+Reprojection between the coordinate reference systems used by the OS Data Hub APIs: British National Grid
+(EPSG:27700, and EPSG:7405 which adds heights), WGS84 (EPSG:4326 and CRS84) and Web Mercator (EPSG:3857).
+
+Coordinates are transformed as NumPy arrays, in (x, y) order, so longitude comes before latitude for EPSG:4326 as it
+does for CRS84. pyproj is used if it is installed (pip install osdatahub[proj]), and otherwise a built-in Helmert
+transformation and Transverse Mercator projection, which is accurate to around 5 metres in Great Britain (pyproj
+matches it unless the OSTN15 grid is installed, which gives centimetre accuracy).
+"""
+
+import copy
+import functools
+from typing import Callable, Iterable, Tuple, Union
+
+import numpy as np
+import shapely
+from shapely.geometry import mapping, shape
+from shapely.geometry.base import BaseGeometry
+
+SUPPORTED_CRS = ("EPSG:27700", "EPSG:7405", "EPSG:4326", "CRS84", "EPSG:3857")
+ENGINES = ("pyproj", "builtin")
+
+# how each CRS is handled by the built-in engine. Heights of EPSG:7405 are left as they are
+_SYSTEMS = {"EPSG:27700": "bng", "EPSG:7405": "bng", "EPSG:4326": "wgs84", "CRS84": "wgs84", "EPSG:3857": "mercator"}
+_PYPROJ_NAMES = {"CRS84": "OGC:CRS84"}
+
+
+@functools.lru_cache(maxsize=None)
+def _pyproj():
+    """Imports pyproj when first needed, as it takes longer to import than the rest of osdatahub. None if it isn't
+    installed"""
+    try:
+        import pyproj
+    except ImportError:
+        return None
+    return pyproj
+
+
+# ellipsoids (semi-major and semi-minor axes, metres)
+_AIRY_1830 = (6377563.396, 6356256.909)
+_WGS84 = (6378137.0, 6356752.314245)
+
+# National Grid Transverse Mercator projection of the Airy 1830 ellipsoid
+_F0 = 0.9996012717
+_LAT0, _LON0 = np.radians(49.0), np.radians(-2.0)
+_E0, _N0 = 400000.0, -100000.0
+
+# Helmert transformation from WGS84 to OSGB36: translations (metres), scale (ppm) and rotations (arc seconds)
+_HELMERT = (-446.448, 125.157, -542.060, 20.4894, -0.1502, -0.2470, -0.8421)
+
+_MERCATOR_RADIUS = 6378137.0
+_MERCATOR_MAX_LAT = 85.06
+
+
+def normalise_crs(crs: str) -> str:
+    """
+    Checks that a CRS is supported, returning its standard form, e.g. "EPSG:27700" for "epsg:27700"
+
+    Args:
+        crs (str): The CRS, e.g. "EPSG:27700" or "crs84"
+
+    Returns:
+        str: The CRS as it appears in SUPPORTED_CRS
+    """
+    normalised = crs.upper()
+    if normalised not in SUPPORTED_CRS:
+        raise ValueError(f"crs must be one of {SUPPORTED_CRS}, got '{crs}'")
+    return normalised
+
+
+@functools.lru_cache(maxsize=None)
+def get_transformer(source_crs: str, target_crs: str, engine: Union[str, None] = None) -> Callable:
+    """
+    Returns a function transforming coordinate arrays from one CRS to another. Transformers are cached, so this is
+    cheap to call repeatedly
+
+    Args:
+        source_crs (str): The CRS of the coordinates
+        target_crs (str): The CRS to transform them to
+        engine (str, optional): Either "pyproj" or "builtin". Defaults to None, which uses pyproj if it is installed
+
+    Returns:
+        Callable: A function taking arrays of x and y coordinates and returning the transformed x and y arrays
+    """
+    source_crs, target_crs = normalise_crs(source_crs), normalise_crs(target_crs)
+    pyproj = _pyproj()
+    if engine is None:
+        engine = "pyproj" if pyproj is not None else "builtin"
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got '{engine}'")
+
+    if _SYSTEMS[source_crs] == _SYSTEMS[target_crs]:
+        return lambda x, y: (x, y)
+    if engine == "pyproj":
+        if pyproj is None:
+            raise ImportError("The pyproj engine requires pyproj. Install it with: pip install osdatahub[proj]")
+        transformer = pyproj.Transformer.from_crs(_PYPROJ_NAMES.get(source_crs, source_crs),
+                                                  _PYPROJ_NAMES.get(target_crs, target_crs), always_xy=True)
+        return lambda x, y: transformer.transform(x, y)
+
+    to_wgs84 = {"bng": _bng_to_wgs84, "mercator": _mercator_to_wgs84, "wgs84": None}[_SYSTEMS[source_crs]]
+    from_wgs84 = {"bng": _wgs84_to_bng, "mercator": _wgs84_to_mercator, "wgs84": None}[_SYSTEMS[target_crs]]
+
+    def transform_builtin(x, y):
+        if to_wgs84 is not None:
+            x, y = to_wgs84(x, y)
+        if from_wgs84 is not None:
+            x, y = from_wgs84(x, y)
+        return x, y
+
+    return transform_builtin
+
+
+def transform(x: Union[float, Iterable[float]],
+              y: Union[float, Iterable[float]],
+              source_crs: str,
+              target_crs: str,
+              engine: Union[str, None] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Transforms coordinates from one CRS to another
+
+    Args:
+        x (Union[float, Iterable[float]]): The x coordinates (eastings or longitudes)
+        y (Union[float, Iterable[float]]): The y coordinates (northings or latitudes)
+        source_crs (str): The CRS of the coordinates
+        target_crs (str): The CRS to transform them to
+        engine (str, optional): Either "pyproj" or "builtin". Defaults to None, which uses pyproj if it is installed
+
+    Returns:
+        tuple: Arrays of the transformed x and y coordinates
+
+    Example::
+
+        from osdatahub.reproject import transform
+
+        eastings, northings = transform([-0.1276, -3.1883], [51.5072, 55.9533], "EPSG:4326", "EPSG:27700")
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    new_x, new_y = get_transformer(source_crs, target_crs, engine)(x, y)
+    return np.asarray(new_x, dtype=float), np.asarray(new_y, dtype=float)
+
+
+def transform_geometry(geometry: Union[BaseGeometry, np.ndarray],
+                       source_crs: str,
+                       target_crs: str,
+                       engine: Union[str, None] = None) -> Union[BaseGeometry, np.ndarray]:
+    """
+    Transforms a shapely geometry, or an array of them, from one CRS to another. The coordinates of every geometry
+    are transformed together. Heights are kept as they are
+
+    Args:
+        geometry (Union[BaseGeometry, np.ndarray]): A geometry or array of geometries
+        source_crs (str): The CRS of the geometries
+        target_crs (str): The CRS to transform them to
+        engine (str, optional): Either "pyproj" or "builtin". Defaults to None, which uses pyproj if it is installed
+
+    Returns:
+        The transformed geometry or array of geometries
+    """
+    transformer = get_transformer(source_crs, target_crs, engine)
+
+    def transform_coords(coords: np.ndarray) -> np.ndarray:
+        coords = coords.copy()
+        coords[:, 0], coords[:, 1] = transformer(coords[:, 0], coords[:, 1])
+        return coords
+
+    return shapely.transform(geometry, transform_coords, include_z=None)
+
+
+def transform_features(features: dict,
+                       target_crs: str,
+                       source_crs: Union[str, None] = None,
+                       engine: Union[str, None] = None) -> dict:
+    """
+    Transforms the geometries of a GeoJSON FeatureCollection, such as the results of a query, to another CRS. The
+    original is left unchanged
+
+    Args:
+        features (dict): A GeoJSON FeatureCollection
+        target_crs (str): The CRS to transform it to
+        source_crs (str, optional): The CRS of the features. Defaults to None, which uses the collection's "crs"
+            member, as set on the results of the osdatahub APIs
+        engine (str, optional): Either "pyproj" or "builtin". Defaults to None, which uses pyproj if it is installed
+
+    Returns:
+        dict: A copy of the FeatureCollection, with its geometries and "crs" member in target_crs
+
+    Example::
+
+        from osdatahub import Extent, FeaturesAPI
+        from osdatahub.reproject import transform_features
+
+        results = FeaturesAPI(key, "Topography_TopographicArea", extent).query()
+        results_wgs84 = transform_features(results, "EPSG:4326")
+    """
+    source_crs = source_crs or features.get("crs")
+    if not isinstance(source_crs, str):
+        raise ValueError("source_crs must be given if the FeatureCollection doesn't have a crs member")
+    transformed = copy.deepcopy(features)
+    located = [feature for feature in transformed["features"] if feature.get("geometry")]
+    geometries = np.array([shape(feature["geometry"]) for feature in located], dtype=object)
+    for feature, geometry in zip(located, transform_geometry(geometries, source_crs, target_crs, engine)):
+        feature["geometry"] = mapping(geometry)
+    if "crs" in transformed:
+        transformed["crs"] = target_crs
+    return transformed
+
+
+def _geodetic_to_cartesian(lon: np.ndarray, lat: np.ndarray, ellipsoid: tuple) -> tuple:
+    a, b = ellipsoid
+    e2 = 1 - b ** 2 / a ** 2
+    nu = a / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+    return nu * np.cos(lat) * np.cos(lon), nu * np.cos(lat) * np.sin(lon), (1 - e2) * nu * np.sin(lat)
+
+
+def _cartesian_to_geodetic(x: np.ndarray, y: np.ndarray, z: np.ndarray, ellipsoid: tuple) -> tuple:
+    a, b = ellipsoid
+    e2 = 1 - b ** 2 / a ** 2
+    p = np.hypot(x, y)
+    lat = np.arctan2(z, p * (1 - e2))
+    for _ in range(10):
+        nu = a / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+        lat = np.arctan2(z + e2 * nu * np.sin(lat), p)
+    return np.arctan2(y, x), lat
+
+
+def _helmert(x: np.ndarray, y: np.ndarray, z: np.ndarray, inverse: bool = False) -> tuple:
+    tx, ty, tz, s, rx, ry, rz = _HELMERT
+    sign = -1 if inverse else 1
+    tx, ty, tz = sign * tx, sign * ty, sign * tz
+    s = 1 + sign * s * 1e-6
+    rx, ry, rz = (sign * np.radians(r / 3600) for r in (rx, ry, rz))
+    return (tx + s * (x - rz * y + ry * z),
+            ty + s * (rz * x + y - rx * z),
+            tz + s * (-ry * x + rx * y + z))
+
+
+def _meridional_arc(lat: np.ndarray) -> np.ndarray:
+    a, b = _AIRY_1830
+    n = (a - b) / (a + b)
+    dlat, slat = lat - _LAT0, lat + _LAT0
+    return b * _F0 * ((1 + n + 5 / 4 * n ** 2 + 5 / 4 * n ** 3) * dlat
+                      - (3 * n + 3 * n ** 2 + 21 / 8 * n ** 3) * np.sin(dlat) * np.cos(slat)
+                      + (15 / 8 * n ** 2 + 15 / 8 * n ** 3) * np.sin(2 * dlat) * np.cos(2 * slat)
+                      - 35 / 24 * n ** 3 * np.sin(3 * dlat) * np.cos(3 * slat))
+
+
+def _radii(lat: np.ndarray) -> tuple:
+    """The transverse and meridional radii of curvature of the projection at a latitude"""
+    a, b = _AIRY_1830
+    e2 = 1 - b ** 2 / a ** 2
+    nu = a * _F0 / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+    rho = a * _F0 * (1 - e2) * (1 - e2 * np.sin(lat) ** 2) ** -1.5
+    return nu, rho, nu / rho - 1
+
+
+def _project(lon: np.ndarray, lat: np.ndarray) -> tuple:
+    """Projects OSGB36 longitudes and latitudes (radians) to eastings and northings"""
+    nu, rho, eta2 = _radii(lat)
+    sin, cos, tan2 = np.sin(lat), np.cos(lat), np.tan(lat) ** 2
+    dlon = lon - _LON0
+    northing = (_meridional_arc(lat) + _N0
+                + nu / 2 * sin * cos * dlon ** 2
+                + nu / 24 * sin * cos ** 3 * (5 - tan2 + 9 * eta2) * dlon ** 4
+                + nu / 720 * sin * cos ** 5 * (61 - 58 * tan2 + tan2 ** 2) * dlon ** 6)
+    easting = (_E0 + nu * cos * dlon
+               + nu / 6 * cos ** 3 * (nu / rho - tan2) * dlon ** 3
+               + nu / 120 * cos ** 5 * (5 - 18 * tan2 + tan2 ** 2 + 14 * eta2 - 58 * tan2 * eta2) * dlon ** 5)
+    return easting, northing
+
+
+def _unproject(easting: np.ndarray, northing: np.ndarray) -> tuple:
+    """Converts eastings and northings to OSGB36 longitudes and latitudes (radians)"""
+    a, _ = _AIRY_1830
+    lat = (northing - _N0) / (a * _F0) + _LAT0
+    for _ in range(20):
+        error = northing - _N0 - _meridional_arc(lat)
+        lat = lat + error / (a * _F0)
+        if np.all(np.abs(error) < 1e-5):
+            break
+    nu, rho, eta2 = _radii(lat)
+    tan, sec = np.tan(lat), 1 / np.cos(lat)
+    tan2 = tan ** 2
+    de = easting - _E0
+    lat = (lat - tan / (2 * rho * nu) * de ** 2
+           + tan / (24 * rho * nu ** 3) * (5 + 3 * tan2 + eta2 - 9 * tan2 * eta2) * de ** 4
+           - tan / (720 * rho * nu ** 5) * (61 + 90 * tan2 + 45 * tan2 ** 2) * de ** 6)
+    lon = (_LON0 + sec / nu * de
+           - sec / (6 * nu ** 3) * (nu / rho + 2 * tan2) * de ** 3
+           + sec / (120 * nu ** 5) * (5 + 28 * tan2 + 24 * tan2 ** 2) * de ** 5
+           - sec / (5040 * nu ** 7) * (61 + 662 * tan2 + 1320 * tan2 ** 2 + 720 * tan2 ** 3) * de ** 7)
+    return lon, lat
+
+
+def _wgs84_to_bng(lon: np.ndarray, lat: np.ndarray) -> tuple:
+    x, y, z = _helmert(*_geodetic_to_cartesian(np.radians(lon), np.radians(lat), _WGS84))
+    return _project(*_cartesian_to_geodetic(x, y, z, _AIRY_1830))
+
+
+def _bng_to_wgs84(easting: np.ndarray, northing: np.ndarray) -> tuple:
+    x, y, z = _geodetic_to_cartesian(*_unproject(easting, northing), _AIRY_1830)
+    lon, lat = _cartesian_to_geodetic(*_helmert(x, y, z, inverse=True), _WGS84)
+    return np.degrees(lon), np.degrees(lat)
+
+
+def _wgs84_to_mercator(lon: np.ndarray, lat: np.ndarray) -> tuple:
+    lat = np.clip(lat, -_MERCATOR_MAX_LAT, _MERCATOR_MAX_LAT)
+    return (_MERCATOR_RADIUS * np.radians(lon),
+            _MERCATOR_RADIUS * np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)))
+
+
+def _mercator_to_wgs84(x: np.ndarray, y: np.ndarray) -> tuple:
+    return (np.degrees(x / _MERCATOR_RADIUS),
+            np.degrees(2 * np.arctan(np.exp(y / _MERCATOR_RADIUS)) - np.pi / 2))
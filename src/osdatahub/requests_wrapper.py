@@ -3,9 +3,15 @@ This requests wrapper is included to handle incomplete responses from the api.
 Information and inspiration from https://blog.petrzemek.net/2018/04/22/on-incomplete-http-reads-and-the-requests-library-in-python/
 """
 
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from osdatahub.config import ClientConfig, get_config
 
 _USER_AGENT_TAG = 'osdatahub-python'
+_local = threading.local()
 
 def check_length(func):
     """
@@ -51,14 +57,52 @@ def add_user_agent_tag(kwargs):
 
     return kwargs
 
+
+def session(config: ClientConfig = None) -> requests.Session:
+    """
+    Returns the session requests are sent with, which keeps connections to the APIs open between requests. Each
+    thread has its own session for each combination of pool size and retry settings
+
+    Args:
+        config (ClientConfig, optional): The configuration to create the session for. Defaults to the
+            configuration in use
+
+    Returns:
+        requests.Session: The session
+    """
+    config = config or get_config()
+    key = (config.pool_connections, config.pool_maxsize, config.max_retries)
+    sessions = getattr(_local, "sessions", None)
+    if sessions is None:
+        sessions = _local.sessions = {}
+    if key not in sessions:
+        adapter = HTTPAdapter(pool_connections=config.pool_connections, pool_maxsize=config.pool_maxsize,
+                              max_retries=config.max_retries)
+        new_session = requests.Session()
+        new_session.mount("https://", adapter)
+        new_session.mount("http://", adapter)
+        sessions[key] = new_session
+    return sessions[key]
+
+
+def _request(method: str, *args, **kwargs):
+    config = get_config()
+    kwargs = add_user_agent_tag(kwargs)
+    if config.timeout is not None:
+        kwargs.setdefault('timeout', config.timeout)
+    if kwargs.get('proxies') is None and config.proxies:
+        kwargs['proxies'] = dict(config.proxies)
+    return session(config).request(method, *args, **kwargs)
+
 @check_length
 def get(*args, **kwargs):
     """
     Sends a GET request to the specified URL.
 
     Args:
-        *args: Positional arguments to be passed to the requests.get function.
-        **kwargs: Keyword arguments to be passed to the requests.get function.
+        *args: Positional arguments to be passed to requests.Session.get.
+        **kwargs: Keyword arguments to be passed to requests.Session.get. The timeout and proxies default to those
+            of the ClientConfig in use.
 
     Returns:
         The response object if the content length check passes.
@@ -66,8 +110,7 @@ def get(*args, **kwargs):
     Raises:
         IOError: If the content length check fails.
     """
-    kwargs = add_user_agent_tag(kwargs)
-    return requests.get(*args, **kwargs)
+    return _request('GET', *args, **kwargs)
 
 
 @check_length
@@ -76,8 +119,9 @@ def post(*args, **kwargs):
     Sends a POST request to the specified URL.
 
     Args:
-        *args: Positional arguments to be passed to the requests.post function.
-        **kwargs: Keyword arguments to be passed to the requests.post function.
+        *args: Positional arguments to be passed to requests.Session.post.
+        **kwargs: Keyword arguments to be passed to requests.Session.post. The timeout and proxies default to those
+            of the ClientConfig in use.
 
     Returns:
         The response object if the content length check passes.
@@ -85,5 +129,4 @@ def post(*args, **kwargs):
     Raises:
         IOError: If the content length check fails.
     """
-    kwargs = add_user_agent_tag(kwargs)
-    return requests.post(*args, **kwargs)
+    return _request('POST', *args, **kwargs)
@@ -0,0 +1,93 @@
+"""
+Switchable runtime type checking of the API methods. The methods are decorated with osdatahub.typecheck.typechecked,
+which applies typeguard's typechecked unless checking has been turned off, in which case the undecorated function is
+used so calls pay nothing for it. The arguments that matter most are still checked explicitly by the methods.
+
+Checking can be turned off before osdatahub is imported by setting the environment variable OSDATAHUB_TYPECHECK to
+0 (or false, no or off), which also avoids importing typeguard, or at any time with
+osdatahub.configure(typecheck=False), which swaps the undecorated functions onto the API classes.
+"""
+
+import os
+import sys
+import threading
+from typing import Callable, List, Tuple, Union
+
+TYPECHECK_ENV = "OSDATAHUB_TYPECHECK"
+_DISABLED = ("0", "false", "no", "off")
+
+_enabled = os.environ.get(TYPECHECK_ENV, "1").strip().lower() not in _DISABLED
+_lock = threading.Lock()
+# the undecorated and type checked version (None until needed) of every decorated function
+_registry: List[list] = []
+
+
+def typechecked(func: Callable) -> Callable:
+    """
+    Decorates a function with typeguard's typechecked if type checking is turned on, otherwise returns it unchanged.
+    Either way the function is registered, so that set_typecheck can swap the other version in later
+
+    Args:
+        func (Callable): The function or method to check
+
+    Returns:
+        Callable: The type checked function, or func itself if type checking is off
+    """
+    with _lock:
+        entry = [func, _instrument(func) if _enabled else None]
+        _registry.append(entry)
+    return entry[1] or func
+
+
+def typecheck_enabled() -> bool:
+    """Whether the API methods check the types of their arguments"""
+    return _enabled
+
+
+def set_typecheck(enabled: bool) -> None:
+    """
+    Turns runtime type checking of the API methods on or off, replacing the methods of the classes that are already
+    imported. Functions imported directly from their modules beforehand (e.g. with "from module import function")
+    keep the version they were imported as
+
+    Args:
+        enabled (bool): Whether to check types
+    """
+    global _enabled
+    with _lock:
+        _enabled = bool(enabled)
+        for entry in _registry:
+            if _enabled and entry[1] is None:
+                entry[1] = _instrument(entry[0])
+            _install(entry[0], entry[1] if _enabled else entry[0])
+
+
+def _instrument(func: Callable) -> Callable:
+    from typeguard import typechecked as typeguard_typechecked
+
+    return typeguard_typechecked(func)
+
+
+def _install(original: Callable, replacement: Callable) -> None:
+    owner, name = _owner(original)
+    if owner is None:
+        return
+    current = vars(owner).get(name)
+    if isinstance(current, (staticmethod, classmethod)):
+        replacement = type(current)(replacement)
+    setattr(owner, name, replacement)
+
+
+def _owner(func: Callable) -> Tuple[Union[object, None], str]:
+    """Finds the class or module a function was defined in, and the name it is bound to there"""
+    parts = func.__qualname__.split(".")
+    owner = sys.modules.get(func.__module__)
+    if owner is None or "<locals>" in parts:
+        return None, ""
+    for part in parts[:-1]:
+        owner = getattr(owner, part, None)
+    name = parts[-1]
+    if isinstance(owner, type) and name.startswith("__") and not name.endswith("__"):
+        # private names are mangled with the class name
+        name = f"_{owner.__name__.lstrip('_')}{name}"
+    return owner, name
@@ -161,26 +161,41 @@ def address_to_feature(address, crs):
         ValueError: If CRS is not British National Grid, there should be
         attributes called 'LAT' and 'LNG' in the address
     """
-    if crs.lower() in ("epsg:27700", "bng"):
-        try:
-            x, y = address["X_COORDINATE"], address["Y_COORDINATE"]
-        except KeyError:
-            x, y = address["GEOMETRY_X"], address["GEOMETRY_Y"]
-    elif all(i in address.keys() for i in ("LNG", "LAT")):
-        x, y = address["LNG"], address["LAT"]
-    else:
-        raise ValueError(
-            f"If CRS is not British National Grid, there should be attributes called 'LAT' and 'LNG' in"
-            f" address. LAT and LNG were not found, and CRS is {crs}"
-        )
-
+    x_key, y_key = address_coordinate_keys(address, crs)
     return {
         "type": "Feature",
-        "geometry": {"type": "Point", "coordinates": [x, y]},
+        "geometry": {"type": "Point", "coordinates": [address[x_key], address[y_key]]},
         "properties": {**address},
     }
 
 
+def address_coordinate_keys(address, crs):
+    """Finds the names of the attributes holding the coordinates of an address. The raw addresses from the PlacesAPI
+    and NamesAPI use different keys depending on the API and on the CRS requested.
+
+    Args:
+        address (dict): dictionary representation of an address
+        crs (str): string representation of a coordinate system
+
+    Returns:
+        tuple: the names of the x and y coordinate attributes
+
+    Raises:
+        ValueError: If CRS is not British National Grid, there should be
+        attributes called 'LAT' and 'LNG' in the address
+    """
+    if crs.lower() in ("epsg:27700", "bng"):
+        if "X_COORDINATE" in address:
+            return "X_COORDINATE", "Y_COORDINATE"
+        return "GEOMETRY_X", "GEOMETRY_Y"
+    elif all(i in address.keys() for i in ("LNG", "LAT")):
+        return "LNG", "LAT"
+    raise ValueError(
+        f"If CRS is not British National Grid, there should be attributes called 'LAT' and 'LNG' in"
+        f" address. LAT and LNG were not found, and CRS is {crs}"
+    )
+
+
 def validate_in_range(value: float, minimum: float, maximum: float) -> float:
     """Checks that the input value is between the maximum and minimum values
     and returns the original value if it is.
@@ -201,6 +216,28 @@ def validate_in_range(value: float, minimum: float, maximum: float) -> float:
     return value
 
 
+def validate_type(value, expected_type: Union[type, tuple], name: str):
+    """Checks the type of an argument that matters to a request, which is still checked when runtime type checking
+    is turned off (see osdatahub.typecheck) and returns it if the check passes.
+
+    Args:
+        value: value to check
+        expected_type (Union[type, tuple]): the type, or tuple of types, that value should be an instance of
+        name (str): name of the argument, for the error message
+
+    Returns:
+        the value, if the check passed
+
+    Raises:
+        TypeError: Argument "{name}" should be {expected_type}, got {type}.
+    """
+    if not isinstance(value, expected_type):
+        types = expected_type if isinstance(expected_type, tuple) else (expected_type,)
+        expected = " or ".join(t.__name__ for t in types)
+        raise TypeError(f'Argument "{name}" should be {expected}, got {type(value).__name__}.')
+    return value
+
+
 def is_new_api(response: Union[dict, GrowList]) -> bool:
     """
     Checks whether the response came from the new API endpoint or the old API endpoint. The new endpoint response has
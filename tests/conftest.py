@@ -0,0 +1,24 @@
+import pytest
+
+from osdatahub import ons_api
+from osdatahub.DownloadsAPI import catalogue
+
+
+@pytest.fixture(autouse=True)
+def catalogue_cache(tmp_path, monkeypatch):
+    """Gives each test its own catalogue cache, with caching turned off, so that tests don't share responses or
+    write to the user's cache directory. Tests of the cache turn it on with configure(enabled=True)"""
+    cache = catalogue.CatalogueCache(tmp_path / "catalogue.sqlite", enabled=False)
+    monkeypatch.setattr(catalogue, "_catalogue", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Points the other caches, such as the ONS boundary cache, at a directory of their own for each test"""
+    monkeypatch.setenv("OSDATAHUB_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(ons_api, "_cache", None)
+    yield tmp_path / "cache"
+    if ons_api._cache is not None:
+        ons_api._cache.close()
@@ -203,3 +203,15 @@ def test_to_json():
         ),
     ]
     return test_variables, test_data
+
+
+def test_split():
+    test_variables = "polygon, rows, cols, expected_count"
+    test_data = [
+        param(box(0, 0, 10, 10), 2, 2, 4, id="square - quarters"),
+        param(box(0, 0, 10, 10), 1, 1, 1, id="square - unsplit"),
+        param(Polygon([(0, 0), (10, 0), (0, 10)]), 2, 2, 3, id="triangle - empty cell dropped"),
+        param(Polygon([(0, 0), (10, 0), (10, 10), (9, 10), (9, 1), (1, 1), (1, 10), (0, 10)]), 2, 1, 3,
+              id="u shape - cell cut into two pieces"),
+    ]
+    return test_variables, test_data
@@ -35,3 +35,46 @@ def test_format_fq_errors():
         param(None, ("1", "2"), (TypeError, TypeCheckError)),
     ]
     return test_variables, test_data
+
+
+def fake_addresses():
+    # a dense cluster of addresses in the south west corner, and a few spread out elsewhere. Address 0 sits on the
+    # boundary between tiles when the extent is split in half
+    addresses = [{"UPRN": "0", "X_COORDINATE": 500.0, "Y_COORDINATE": 500.0}]
+    addresses += [{"UPRN": str(i), "X_COORDINATE": 10.0 + i, "Y_COORDINATE": 10.0 + i} for i in range(1, 41)]
+    addresses += [{"UPRN": str(i), "X_COORDINATE": 10.0 * i, "Y_COORDINATE": 900.0} for i in range(41, 51)]
+    return addresses
+
+
+def test_query_tiles():
+    test_variables = "max_tile_results, limit, expected_length"
+    test_data = [
+        param(None, 1000, 51, id="no tiling"),
+        param(1000, 1000, 51, id="single tile"),
+        param(20, 1000, 51, id="many tiles"),
+        param(1, 1000, 51, id="maximum depth"),
+        param(20, 30, 30, id="limited"),
+    ]
+    return test_variables, test_data
+
+
+def test_merge_datasets():
+    dpa = {"UPRN": "1", "ADDRESS": "1, HIGH STREET", "X_COORDINATE": 1.0, "Y_COORDINATE": 2.0}
+    lpi_approved = {"UPRN": "1", "LPI_KEY": "1L", "LPI_LOGICAL_STATUS_CODE": "1", "X_COORDINATE": 1.0,
+                    "Y_COORDINATE": 2.0}
+    lpi_alternative = {"UPRN": "1", "LPI_KEY": "2L", "LPI_LOGICAL_STATUS_CODE": "3", "X_COORDINATE": 1.0,
+                       "Y_COORDINATE": 2.0}
+    lpi_only = {"UPRN": "2", "LPI_KEY": "3L", "LPI_LOGICAL_STATUS_CODE": "1", "X_COORDINATE": 3.0,
+                "Y_COORDINATE": 4.0}
+
+    test_variables = "pages, expected_result"
+    test_data = [
+        param([[{"LPI": lpi_alternative}, {"DPA": dpa}], [{"LPI": lpi_approved}, {"LPI": lpi_only}]],
+              [{"UPRN": "1", "X_COORDINATE": 1.0, "Y_COORDINATE": 2.0, "DPA": dpa, "LPI": lpi_approved},
+               {"UPRN": "2", "X_COORDINATE": 3.0, "Y_COORDINATE": 4.0, "DPA": None, "LPI": lpi_only}],
+              id="merged across pages"),
+        param([[{"DPA": dpa}]],
+              [{"UPRN": "1", "X_COORDINATE": 1.0, "Y_COORDINATE": 2.0, "DPA": dpa, "LPI": None}],
+              id="dpa only"),
+    ]
+    return test_variables, test_data
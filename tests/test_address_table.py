@@ -0,0 +1,57 @@
+import pytest
+from osdatahub.address_table import AddressTable
+from osdatahub.utils import addresses_to_geojson
+
+ADDRESSES = [
+    {"UPRN": "1", "ADDRESS": "1, HIGH STREET", "POSTCODE": "SO16 0AS", "X_COORDINATE": 437293.0,
+     "Y_COORDINATE": 115515.0},
+    {"UPRN": "2", "ADDRESS": "2, HIGH STREET", "POSTCODE": "SO16 0AS", "X_COORDINATE": 437294.0,
+     "Y_COORDINATE": 115516.0, "ORGANISATION_NAME": "ORDNANCE SURVEY"},
+    {"ID": "3", "NAME1": "Southampton", "GEOMETRY_X": 442000.0, "GEOMETRY_Y": 112000.0},
+]
+
+
+class TestAddressTable:
+    @pytest.fixture()
+    def table(self):
+        yield AddressTable("EPSG:27700", ADDRESSES)
+
+    def test_to_geojson(self, table):
+        assert table.to_geojson() == addresses_to_geojson(ADDRESSES, "EPSG:27700")
+
+    def test_properties(self, table):
+        assert [address.properties for address in table] == ADDRESSES
+
+    def test_len(self, table):
+        assert len(table) == 3
+        assert not AddressTable("EPSG:27700")
+
+    def test_column(self, table):
+        assert table["POSTCODE"] == ["SO16 0AS", "SO16 0AS", None]
+        assert table["GEOMETRY_X"] == [None, None, 442000.0]
+
+    def test_getitem(self, table):
+        address = table[-2]
+        assert (address.x, address.y) == (437294.0, 115516.0)
+        assert address["ORGANISATION_NAME"] == "ORDNANCE SURVEY"
+        assert address["X_COORDINATE"] == 437294.0
+        with pytest.raises(KeyError):
+            table[0]["ORGANISATION_NAME"]
+        with pytest.raises(IndexError):
+            table[3]
+
+    def test_shared_values_interned(self):
+        # Arrange
+        postcodes = ["".join(["SO16", " 0AS"]) for _ in range(2)]
+        addresses = [{**address, "POSTCODE": postcode} for address, postcode in zip(ADDRESSES, postcodes)]
+
+        # Act
+        table = AddressTable("EPSG:27700", addresses)
+
+        # Assert
+        assert postcodes[0] is not postcodes[1]
+        assert table[0]["POSTCODE"] is table[1]["POSTCODE"]
+
+    def test_missing_coordinates(self):
+        with pytest.raises(ValueError):
+            AddressTable("EPSG:4326", ADDRESSES)
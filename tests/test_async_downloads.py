@@ -0,0 +1,136 @@
+"""Tests for the async download engine, against a local aiohttp server."""
+
+import asyncio
+import hashlib
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from osdatahub import OpenDataDownload
+from osdatahub.DownloadsAPI.async_downloads import AsyncDownloadEngine
+from osdatahub.DownloadsAPI.downloads_api import _DownloadObj
+from osdatahub.DownloadsAPI.scheduler import DownloadScheduler
+
+FILES = {f"tile_{i}.zip": os.urandom(1000 + i * 5000) for i in range(20)}
+
+
+def _app(requests, throttled=0):
+    """A server supporting Range/If-Range requests, which responds 429 to the first `throttled` requests."""
+
+    async def handler(request):
+        requests.append(request)
+        if len(requests) <= throttled:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        content = FILES[request.match_info["name"]]
+        byte_range = request.headers.get("Range")
+        if byte_range and request.headers.get("If-Range") == '"v1"':
+            start = int(byte_range.split("=")[1].rstrip("-"))
+            return web.Response(status=206, body=content[start:], headers={
+                "ETag": '"v1"', "Content-Range": f"bytes {start}-{len(content) - 1}/{len(content)}"})
+        return web.Response(body=content, headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/files/{name}", handler)
+    return app
+
+
+def _download_list(server, names=FILES):
+    return [_DownloadObj(str(server.make_url(f"/files/{name}")), name, len(FILES[name]),
+                         md5=hashlib.md5(FILES[name]).hexdigest()) for name in names]
+
+
+@pytest.mark.asyncio
+async def test_download(tmp_path):
+    requests = []
+    async with TestServer(_app(requests)) as server:
+        engine = AsyncDownloadEngine(max_connections=8, write_workers=2, buffer_chunks=2, chunk_size=1024)
+        paths, missing = await engine.download(_download_list(server), str(tmp_path))
+
+    assert missing == []
+    assert len(paths) == len(FILES) == len(requests)
+    for name, content in FILES.items():
+        assert (tmp_path / name).read_bytes() == content
+    manifest = json.loads((tmp_path / ".osdatahub_manifest.json").read_text())
+    assert len(manifest["files"]) == len(FILES)
+
+
+@pytest.mark.asyncio
+async def test_resume(tmp_path):
+    name = "tile_3.zip"
+    (tmp_path / f"{name}.part").write_bytes(FILES[name][:4000])
+    (tmp_path / f"{name}.part.json").write_text(json.dumps({"etag": '"v1"', "size": len(FILES[name])}))
+
+    requests = []
+    async with TestServer(_app(requests)) as server:
+        paths, _ = await AsyncDownloadEngine().download(_download_list(server, [name]), str(tmp_path))
+
+    assert requests[0].headers["Range"] == "bytes=4000-"
+    assert (tmp_path / name).read_bytes() == FILES[name]
+
+
+@pytest.mark.asyncio
+async def test_throttled_and_skipped(tmp_path):
+    requests = []
+    names = list(FILES)[:3]
+    async with TestServer(_app(requests, throttled=1)) as server:
+        engine = AsyncDownloadEngine(max_connections=1)
+        paths, missing = await engine.download(_download_list(server, names), str(tmp_path))
+        await engine.download(_download_list(server, names), str(tmp_path))
+
+    assert missing == []
+    assert len(requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_uses_scheduler(tmp_path, monkeypatch):
+    scheduler = DownloadScheduler(max_connections=2)
+    monkeypatch.setattr("osdatahub.DownloadsAPI.async_downloads.get_scheduler", lambda: scheduler)
+    requests, active, most_active = [], [0], [0]
+    app = _app(requests, throttled=1)
+
+    @web.middleware
+    async def count_active(request, handler):
+        active[0] += 1
+        most_active[0] = max(most_active[0], active[0])
+        try:
+            await asyncio.sleep(0.01)
+            return await handler(request)
+        finally:
+            active[0] -= 1
+
+    app.middlewares.append(count_active)
+    async with TestServer(app) as server:
+        with patch.object(scheduler, "pause", wraps=scheduler.pause) as pause:
+            paths, missing = await AsyncDownloadEngine(max_connections=8).download(_download_list(server),
+                                                                                   str(tmp_path))
+
+    assert missing == []
+    assert most_active[0] <= 2
+    pause.assert_called_once_with(0)
+
+
+@pytest.mark.asyncio
+async def test_checksum_mismatch(tmp_path):
+    requests = []
+    async with TestServer(_app(requests)) as server:
+        download_list = _download_list(server, ["tile_0.zip"])
+        download_list[0].md5 = "0" * 32
+        paths, missing = await AsyncDownloadEngine().download(download_list, str(tmp_path))
+
+    assert paths == []
+    assert missing == download_list
+    assert not (tmp_path / "tile_0.zip").exists()
+
+
+@pytest.mark.asyncio
+async def test_open_data_download_async(tmp_path):
+    requests = []
+    async with TestServer(_app(requests)) as server:
+        with patch.object(OpenDataDownload, "product_list", return_value=_download_list(server)):
+            paths = await OpenDataDownload("test").download_async(tmp_path, download_multiple=True)
+
+    assert len(paths) == len(FILES)
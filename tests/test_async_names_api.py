@@ -0,0 +1,99 @@
+"""Tests for the async Names API client."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from osdatahub.AsyncAPI import AsyncHTTPClient
+from osdatahub.NamesAPI.async_names_api import AsyncNamesAPI
+
+
+def _entry(i):
+    return {"GAZETTEER_ENTRY": {"ID": str(i), "NAME1": f"Place {i}", "GEOMETRY_X": 1.0 * i, "GEOMETRY_Y": 2.0}}
+
+
+def _fake_find(total):
+    """Builds a fake client.get that pages through `total` results."""
+
+    async def fake_get(url, params=None, **kwargs):
+        params = dict(params)
+        offset, maxresults = int(params["offset"]), int(params["maxresults"])
+        results = [_entry(i) for i in range(offset, min(total, offset + maxresults))]
+        response = {"header": {"totalresults": total}}
+        if results:
+            response["results"] = results
+        return response
+
+    return fake_get
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "total, limit, expected_length, expected_requests",
+    [
+        (0, 100, 0, 1),
+        (42, 100, 42, 1),
+        (250, 1000, 250, 3),
+        (250, 120, 120, 2),
+    ],
+)
+async def test_find_parallel_pages(total, limit, expected_length, expected_requests):
+    """Test that find fetches the remaining pages after the first."""
+    with patch.object(AsyncHTTPClient, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = _fake_find(total)
+
+        async with AsyncNamesAPI("test-key", request_delay=0) as names:
+            result = await names.find("Place", limit=limit)
+
+    ids = [feature["properties"]["ID"] for feature in result["features"]]
+    assert ids == [str(i) for i in range(expected_length)]
+    assert mock_get.call_count == expected_requests
+
+
+@pytest.mark.asyncio
+async def test_find_params():
+    """Test that list parameters are repeated and the key is added."""
+    with patch.object(AsyncHTTPClient, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = _fake_find(0)
+
+        async with AsyncNamesAPI("test-key", request_delay=0) as names:
+            await names.find("Place", local_type=["city", "town"])
+
+    params = mock_get.call_args.kwargs["params"]
+    assert ("fq", "LOCAL_TYPE:City LOCAL_TYPE:Town") in params
+    assert ("key", "test-key") in params
+    assert mock_get.call_args.args[0] == "https://api.os.uk/search/names/v1/find"
+
+
+@pytest.mark.asyncio
+async def test_find_many():
+    """Test that find_many keeps the order of the inputs and can return exceptions."""
+    with patch.object(AsyncHTTPClient, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = _fake_find(3)
+
+        async with AsyncNamesAPI("test-key", request_delay=0) as names:
+            results = await names.find_many(["a", "b"], limit=2)
+            failed = await names.find_many(["a"], limit=0, return_exceptions=True)
+
+    assert [len(result["features"]) for result in results] == [2, 2]
+    assert isinstance(failed[0], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_nearest_many():
+    """Test nearest_many runs one query per point."""
+    with patch.object(AsyncHTTPClient, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = {"results": [_entry(1)]}
+
+        async with AsyncNamesAPI("test-key", request_delay=0) as names:
+            results = await names.nearest_many([(1, 2), (3, 4)], radius=10, output_as_table=True)
+
+    assert [len(result) for result in results] == [1, 1]
+    assert mock_get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_nearest_invalid_radius():
+    async with AsyncNamesAPI("test-key") as names:
+        with pytest.raises(ValueError):
+            await names.nearest((1, 2), radius=5000)
@@ -5,9 +5,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-import osdatahub
 from osdatahub import Extent
 from osdatahub.AsyncAPI import AsyncHTTPClient
+from osdatahub.config import override
 from osdatahub.NGD.async_ngd_api import AsyncNGD
 
 API_KEY = os.environ.get("OSDATAHUB_TEST_KEY")
@@ -33,6 +33,42 @@ async def test_async_ngd_query():
         assert len(result.features) == 2
 
 
+@pytest.mark.asyncio
+async def test_async_ngd_query_all():
+    """Test that max_results=None pages until a partial page is returned."""
+    full_page = {"type": "FeatureCollection", "features": [{"id": i} for i in range(100)],
+                 "numberReturned": 100, "links": []}
+    last_page = {"type": "FeatureCollection", "features": [{"id": 100}], "numberReturned": 1, "links": []}
+
+    with patch.object(AsyncHTTPClient, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = [full_page, last_page]
+
+        async with AsyncNGD("test-key", "test-collection", max_concurrent=2, request_delay=0) as ngd:
+            result = await ngd.query(max_results=None)
+
+    assert mock_get.call_count == 2
+    assert result.numberReturned == 101
+    assert len(result.features) == 101
+
+
+@pytest.mark.asyncio
+async def test_async_ngd_query_all_default_concurrency():
+    """Test that fetching all features pages in batches of the configured concurrency by default."""
+    full_page = {"type": "FeatureCollection", "features": [{"id": i} for i in range(100)],
+                 "numberReturned": 100, "links": []}
+    last_page = {"type": "FeatureCollection", "features": [{"id": 400}], "numberReturned": 1, "links": []}
+
+    with patch.object(AsyncHTTPClient, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = [full_page] * 4 + [last_page]
+
+        async with AsyncNGD("test-key", "test-collection", request_delay=0) as ngd:
+            result = await ngd.query(max_results=None)
+
+    assert mock_get.call_count == 5
+    assert [call.kwargs["params"]["offset"] for call in mock_get.call_args_list] == [0, 100, 200, 300, 400]
+    assert result.numberReturned == 401
+
+
 @pytest.mark.asyncio
 @pytest.mark.skipif(not API_KEY, reason="Test API key not available")
 @pytest.mark.parametrize(
@@ -101,14 +137,14 @@ class TestAsyncNGDProxy:
         """Test that AsyncNGD passes proxies to the HTTP client."""
         test_proxies = {"https": "http://proxy:8080"}
 
-        with patch.object(osdatahub, "get_proxies", return_value=test_proxies):
+        with override(proxies=test_proxies):
             ngd = AsyncNGD("test-key", "test-collection")
             client = ngd._get_client()
             assert client._proxies == test_proxies
 
     def test_async_ngd_empty_proxies(self):
         """Test that AsyncNGD works with empty proxies (default)."""
-        with patch.object(osdatahub, "get_proxies", return_value={}):
+        with override(proxies={}):
             ngd = AsyncNGD("test-key", "test-collection")
             client = ngd._get_client()
             assert client._proxies == {}
@@ -120,7 +156,7 @@ class TestAsyncNGDProxy:
 
         AsyncNGD.clear_collections_cache()
 
-        with patch.object(osdatahub, "get_proxies", return_value=test_proxies):
+        with override(proxies=test_proxies):
             with patch.object(
                 AsyncHTTPClient, "get", new_callable=AsyncMock
             ) as mock_get:
@@ -135,7 +171,7 @@ class TestAsyncNGDProxy:
         """Test that proxy is actually passed to aiohttp session.get()."""
         test_proxies = {"https": "http://proxy:8080"}
 
-        with patch.object(osdatahub, "get_proxies", return_value=test_proxies):
+        with override(proxies=test_proxies):
             with patch("aiohttp.ClientSession.get") as mock_session_get:
                 mock_response = AsyncMock()
                 mock_response.json = AsyncMock(
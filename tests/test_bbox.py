@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from osdatahub.bbox import BBox, BBoxArray
+from shapely.geometry import Point, box
+
+
+class TestBBox:
+    def test_tuple(self):
+        # Arrange
+        bbox = BBox(0, 1, 2, 3)
+
+        # Assert
+        assert tuple(bbox) == (0, 1, 2, 3)
+        assert bbox[1:3] == (1, 2)
+        assert bbox.east == 2
+        assert hash(bbox) == hash(BBox(0, 1, 2, 3))
+        with pytest.raises(AttributeError):
+            bbox.west = 5
+
+    @pytest.mark.parametrize("other, intersects, contains", [
+        ((1, 1, 2, 2), True, True),
+        ((0, 0, 10, 10), True, True),
+        ((5, 5, 15, 15), True, False),
+        ((10, 10, 15, 15), True, False),
+        ((11, 0, 15, 5), False, False),
+    ])
+    def test_predicates(self, other, intersects, contains):
+        bbox = BBox(0, 0, 10, 10)
+        assert bbox.intersects(other) == intersects
+        assert bbox.contains(other) == contains
+
+    def test_union(self):
+        assert BBox(0, 0, 1, 1).union((2, -1, 3, 0)) == BBox(0, -1, 3, 1)
+
+
+class TestBBoxArray:
+    @pytest.fixture()
+    def boxes(self):
+        return BBoxArray([(0, 0, 10, 10), (10, 0, 20, 10), (40, 40, 50, 50)])
+
+    def test_single(self, boxes):
+        # Act
+        intersects = boxes.intersects(BBox(5, 5, 15, 15))
+        contains = boxes.contains((1, 1, 2, 2))
+        within = boxes.within((0, 0, 20, 20))
+
+        # Assert
+        assert intersects.tolist() == [True, True, False]
+        assert contains.tolist() == [True, False, False]
+        assert within.tolist() == [True, True, False]
+
+    def test_pairwise(self, boxes):
+        # Arrange
+        others = BBoxArray([(5, 5, 6, 6), (0, 0, 1, 1), (0, 0, 45, 45)])
+
+        # Act
+        intersects = boxes.intersects(others)
+        union = boxes.union(others)
+
+        # Assert
+        assert intersects.tolist() == [True, False, True]
+        assert list(union) == [BBox(0, 0, 10, 10), BBox(0, 0, 20, 10), BBox(0, 0, 50, 50)]
+
+    def test_pairwise_length_mismatch(self, boxes):
+        with pytest.raises(ValueError):
+            boxes.intersects(boxes[:2])
+
+    def test_union(self, boxes):
+        assert boxes.union() == BBox(0, 0, 50, 50)
+        assert boxes[boxes.intersects((5, 5, 15, 15))].union() == BBox(0, 0, 20, 10)
+
+    def test_union_empty(self):
+        with pytest.raises(ValueError):
+            BBoxArray([]).union()
+
+    def test_indexing(self, boxes):
+        assert boxes[1] == BBox(10, 0, 20, 10)
+        assert len(boxes[1:]) == 2
+        assert boxes[np.array([True, False, True])] == BBoxArray([(0, 0, 10, 10), (40, 40, 50, 50)])
+
+    def test_from_geometries(self):
+        bboxes = BBoxArray.from_geometries([box(0, 0, 1, 2), Point(3, 4)])
+        assert list(bboxes) == [BBox(0, 0, 1, 2), BBox(3, 4, 3, 4)]
+
+    @pytest.mark.parametrize("bounds", [[(0, 0, 1)], np.zeros((2, 5))])
+    def test_invalid(self, bounds):
+        with pytest.raises(ValueError):
+            BBoxArray(bounds)
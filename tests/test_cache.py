@@ -0,0 +1,80 @@
+import sqlite3
+import time
+
+from osdatahub.cache import PersistentCache
+
+
+class TestPersistentCache:
+
+    def test_get_set(self):
+        # Arrange
+        cache = PersistentCache()
+
+        # Act
+        cache.set("a", {"value": [1, 2]})
+        cache.set_many({"b": None, "c": "3"})
+
+        # Assert
+        assert cache.get("a") == {"value": [1, 2]}
+        assert "b" in cache and cache.get("b") is None
+        assert cache.get("missing", "default") == "default"
+        assert len(cache) == 3
+
+    def test_get_many(self):
+        # Arrange
+        cache = PersistentCache()
+        cache.set_many({str(i): i for i in range(1200)})
+
+        # Act
+        found = cache.get_many([str(i) for i in range(0, 2400, 2)])
+
+        # Assert
+        assert found == {str(i): i for i in range(0, 1200, 2)}
+
+    def test_persisted(self, tmp_path):
+        # Arrange
+        with PersistentCache(tmp_path / "cache.sqlite", table="first") as cache:
+            cache.set("a", 1)
+
+        # Act
+        with PersistentCache(tmp_path / "cache.sqlite", table="first") as cache:
+            value = cache.get("a")
+        with PersistentCache(tmp_path / "cache.sqlite", table="second") as cache:
+            other_table = len(cache)
+
+        # Assert
+        assert value == 1
+        assert other_table == 0
+
+    def test_ttl(self, monkeypatch):
+        # Arrange
+        cache = PersistentCache(ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=100)
+        cache.ttl = None
+        cache.set("c", 3)
+        now = time.time()
+
+        # Act
+        monkeypatch.setattr(time, "time", lambda: now + 50)
+
+        # Assert
+        assert cache.get("a") is None and "a" not in cache
+        assert cache.get_many(["a", "b", "c"]) == {"b": 2, "c": 3}
+        assert len(cache) == 2
+
+    def test_cache_without_expiry_column(self, tmp_path):
+        # Arrange
+        connection = sqlite3.connect(tmp_path / "cache.sqlite")
+        with connection:
+            connection.execute("CREATE TABLE cache (key TEXT PRIMARY KEY, value TEXT)")
+            connection.execute("INSERT INTO cache VALUES ('a', '1')")
+        connection.close()
+
+        # Act
+        with PersistentCache(tmp_path / "cache.sqlite") as cache:
+            cache.set("b", 2, ttl=60)
+            values = cache.get_many(["a", "b"])
+
+        # Assert
+        assert values == {"a": 1, "b": 2}
@@ -0,0 +1,139 @@
+import time
+
+import pytest
+import requests_mock
+
+from osdatahub import DataPackageDownload, OpenDataDownload
+from osdatahub.DownloadsAPI.catalogue import CatalogueCache
+
+PRODUCTS = "https://api.os.uk/downloads/v1/products"
+DATA_PACKAGES = "https://api.os.uk/downloads/v1/dataPackages"
+
+
+@pytest.fixture()
+def catalogue(catalogue_cache):
+    catalogue_cache.configure(enabled=True)
+    return catalogue_cache
+
+
+def test_shared_between_instances(catalogue):
+    # Arrange
+    with requests_mock.Mocker() as m:
+        m.get(PRODUCTS, json=[{"id": "OpenRoads"}])
+        m.get(f"{PRODUCTS}/OpenRoads/downloads", json=[{"fileName": "roads.zip"}])
+
+        # Act
+        for _ in range(2):
+            products = OpenDataDownload.all_products()
+            files = OpenDataDownload("OpenRoads").product_list()
+
+    # Assert
+    assert m.call_count == 2
+    assert products == [{"id": "OpenRoads"}]
+    assert files == [{"fileName": "roads.zip"}]
+
+
+def test_params_in_key(catalogue):
+    # Arrange
+    with requests_mock.Mocker() as m:
+        m.get(f"{PRODUCTS}/OpenRoads/downloads", json=[])
+
+        # Act
+        OpenDataDownload("OpenRoads").product_list(file_format="GeoPackage")
+        OpenDataDownload("OpenRoads").product_list(file_format="Shapefile")
+        OpenDataDownload("OpenRoads").product_list(file_format="GeoPackage")
+
+    # Assert
+    assert m.call_count == 2
+
+
+def test_expired(catalogue):
+    # Arrange
+    catalogue.configure(ttls={"versions": 0.01})
+    with requests_mock.Mocker() as m:
+        m.get(f"{DATA_PACKAGES}/1/versions", [{"json": [{"id": "1"}]}, {"json": [{"id": "1"}, {"id": "2"}]}])
+
+        # Act
+        first = DataPackageDownload("key", "1").versions
+        time.sleep(0.05)
+        second = DataPackageDownload("key", "1").versions
+
+    # Assert
+    assert m.call_count == 2
+    assert len(first) == 1 and len(second) == 2
+
+
+def test_keys_hashed(catalogue, tmp_path):
+    # Arrange
+    with requests_mock.Mocker() as m:
+        m.get(DATA_PACKAGES, json=[{"id": "1"}])
+
+        # Act
+        DataPackageDownload.all_products("first-secret-key")
+        DataPackageDownload.all_products("second-secret-key")
+
+    # Assert
+    assert m.call_count == 2
+    assert b"secret-key" not in (tmp_path / "catalogue.sqlite").read_bytes()
+
+
+def test_persisted(catalogue, tmp_path):
+    # Arrange
+    with requests_mock.Mocker() as m:
+        m.get(f"{PRODUCTS}/OpenRoads", json={"id": "OpenRoads"})
+        OpenDataDownload("OpenRoads").details
+    catalogue.close()
+
+    # Act
+    with requests_mock.Mocker() as m:
+        details = CatalogueCache(tmp_path / "catalogue.sqlite").fetch(
+            "products", f"{PRODUCTS}/OpenRoads", None, lambda: pytest.fail("not cached"))
+
+    # Assert
+    assert details == {"id": "OpenRoads"}
+    assert m.call_count == 0
+
+
+def test_disabled(catalogue_cache):
+    with requests_mock.Mocker() as m:
+        m.get(PRODUCTS, json=[])
+        OpenDataDownload.all_products()
+        OpenDataDownload.all_products()
+    assert m.call_count == 2
+
+
+def test_error_not_cached(catalogue):
+    # Arrange
+    with requests_mock.Mocker() as m:
+        m.get(PRODUCTS, [{"status_code": 500}, {"json": [{"id": "OpenRoads"}]}])
+
+        # Act
+        with pytest.raises(Exception):
+            OpenDataDownload.all_products()
+        products = OpenDataDownload.all_products()
+
+    # Assert
+    assert products == [{"id": "OpenRoads"}]
+
+
+def test_configure_invalid():
+    with pytest.raises(ValueError):
+        CatalogueCache(enabled=False).configure(ttls={"unknown": 1})
+
+
+@pytest.mark.parametrize("existing", [False, True])
+def test_private(catalogue, tmp_path, existing):
+    # Arrange
+    path = tmp_path / "catalogue.sqlite"
+    if existing:
+        path.touch(mode=0o644)
+        path.chmod(0o644)
+
+    # Act
+    with requests_mock.Mocker() as m:
+        m.get(PRODUCTS, json=[{"id": "OpenRoads"}])
+        OpenDataDownload.all_products()
+
+    # Assert
+    files = [path, tmp_path / "catalogue.sqlite-wal", tmp_path / "catalogue.sqlite-shm"]
+    assert all(file.exists() and file.stat().st_mode & 0o777 == 0o600 for file in files)
@@ -0,0 +1,172 @@
+import asyncio
+import threading
+
+import pytest
+import requests_mock
+
+import osdatahub
+from osdatahub import config
+from osdatahub.AsyncAPI import AsyncHTTPClient
+from osdatahub.DownloadsAPI.async_downloads import AsyncDownloadEngine
+from osdatahub.DownloadsAPI.downloads_api import _DownloadObj
+from osdatahub.cache import default_cache_dir
+from osdatahub.config import ClientConfig, get_config, override
+from osdatahub.NGD.async_ngd_api import AsyncNGD
+from osdatahub.requests_wrapper import session
+
+
+@pytest.fixture(autouse=True)
+def default_config(monkeypatch):
+    monkeypatch.setattr(config, "_global", ClientConfig())
+
+
+def test_configure():
+    # Act
+    osdatahub.configure(timeout=5, pool_maxsize=20)
+
+    # Assert
+    assert get_config().timeout == 5
+    assert get_config().pool_maxsize == 20
+    assert get_config().max_retries == 0
+
+
+def test_configure_unknown_setting():
+    with pytest.raises(TypeError):
+        osdatahub.configure(time_out=5)
+
+
+def test_proxies():
+    # Arrange
+    osdatahub.set_proxies({"https": "http://proxy:8080"})
+
+    # Act
+    proxies = osdatahub.get_proxies()
+    proxies["http"] = "http://other:8080"
+
+    # Assert
+    assert osdatahub.get_proxies() == {"https": "http://proxy:8080"}
+    assert get_config().proxies == {"https": "http://proxy:8080"}
+
+
+def test_override():
+    # Act
+    with override(timeout=5) as outer:
+        with override(max_retries=2) as inner:
+            nested = get_config()
+        restored = get_config()
+
+    # Assert
+    assert outer.timeout == 5
+    assert nested is inner
+    assert (nested.timeout, nested.max_retries) == (5, 2)
+    assert restored is outer
+    assert get_config().timeout is None
+
+
+def test_override_is_context_local():
+    # Arrange
+    seen = {}
+
+    async def task():
+        seen["task"] = get_config().timeout
+
+    def thread():
+        seen["thread"] = get_config().timeout
+
+    # Act
+    with override(timeout=5):
+        asyncio.run(task())
+        worker = threading.Thread(target=thread)
+        worker.start()
+        worker.join()
+
+    # Assert
+    assert seen == {"task": 5, "thread": None}
+
+
+def test_requests_use_config():
+    # Arrange
+    osdatahub.configure(proxies={"https": "http://proxy:8080"}, timeout=7)
+
+    # Act
+    with requests_mock.Mocker() as m:
+        m.get("https://api.os.uk/test", json={})
+        osdatahub.get("https://api.os.uk/test")
+        osdatahub.get("https://api.os.uk/test", timeout=2, proxies={})
+
+    # Assert
+    first, second = m.request_history
+    assert first.timeout == 7
+    assert first.proxies == {"https": "http://proxy:8080"}
+    assert second.timeout == 2
+    assert first.headers["User-Agent"] == "osdatahub-python"
+
+
+def test_session():
+    # Act
+    shared = session()
+    same = session()
+    with override(pool_maxsize=20):
+        larger = session()
+    other_thread = []
+    worker = threading.Thread(target=lambda: other_thread.append(session()))
+    worker.start()
+    worker.join()
+
+    # Assert
+    assert shared is same
+    assert larger is not shared
+    assert larger.get_adapter("https://api.os.uk")._pool_maxsize == 20
+    assert other_thread[0] is not shared
+
+
+def test_cache_dir(tmp_path):
+    with override(cache_dir=tmp_path):
+        assert default_cache_dir() == tmp_path
+    assert default_cache_dir() != tmp_path
+
+
+def test_async_client_defaults():
+    # Arrange
+    osdatahub.configure(async_max_concurrent=8, async_timeout=60, proxies={"https": "http://proxy:8080"})
+
+    # Act
+    client = AsyncHTTPClient()
+    explicit = AsyncHTTPClient(max_concurrent=2, proxies={})
+
+    # Assert
+    assert (client._max_concurrent, client._timeout, client._max_retries) == (8, 60, 3)
+    assert client._proxies == {"https": "http://proxy:8080"}
+    assert (explicit._max_concurrent, explicit._proxies) == (2, {})
+
+
+def test_downloads_use_config(tmp_path):
+    # Arrange
+    url = "https://api.os.uk/downloads/v1/products/test/downloads?fileName=test.zip"
+    content = b"0123456789" * 100
+
+    # Act
+    with override(proxies={"https": "http://proxy:8080"}, timeout=9), requests_mock.Mocker() as m:
+        m.get(url, content=content, headers={"ETag": '"v1"'})
+        _DownloadObj(url, "test.zip", len(content)).download(tmp_path)
+
+    # Assert
+    assert m.last_request.timeout == 9
+    assert m.last_request.proxies == {"https": "http://proxy:8080"}
+    assert m.last_request.headers["User-Agent"] == "osdatahub-python"
+
+
+def test_async_api_defaults():
+    # Arrange
+    osdatahub.configure(async_max_concurrent=8, async_request_delay=0, proxies={"https": "http://proxy:8080"})
+
+    # Act
+    ngd = AsyncNGD("test-key", "test-collection")
+    engine = AsyncDownloadEngine()
+
+    # Assert
+    assert (ngd._max_concurrent, ngd._request_delay, ngd._max_retries) == (8, 0, 3)
+    assert ngd._get_client()._proxies == {"https": "http://proxy:8080"}
+    assert engine._read_timeout == 30
+    assert engine._get_proxy("https://api.os.uk/downloads") == "http://proxy:8080"
+    assert engine._get_proxy("http://example.com") is None
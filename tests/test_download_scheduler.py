@@ -0,0 +1,159 @@
+import threading
+import time
+
+import pytest
+import requests_mock
+
+from osdatahub.DownloadsAPI.downloads_api import _DownloadObj
+from osdatahub.DownloadsAPI.scheduler import DownloadScheduler, get_scheduler
+
+
+def run_in_order(scheduler, jobs):
+    """Queues jobs behind a blocking job, then releases it and returns the order the jobs ran in"""
+    started, release, order = threading.Event(), threading.Event(), []
+    scheduler.submit(lambda: (started.set(), release.wait()), group="blocker")
+    started.wait()
+    futures = [scheduler.submit(order.append, name, size=size, group=group) for name, size, group in jobs]
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    return order
+
+
+@pytest.mark.parametrize("order, expected", [
+    ("largest", ["a_large", "b_large", "a_medium", "b_small", "a_small"]),
+    ("smallest", ["a_small", "b_small", "a_medium", "b_large", "a_large"]),
+])
+def test_order(order, expected):
+    # Arrange
+    scheduler = DownloadScheduler(max_connections=1, order=order)
+    jobs = [("a_small", 1, "a"), ("a_large", 100, "a"), ("a_medium", 50, "a"), ("b_small", 2, "b"),
+            ("b_large", 200, "b")]
+
+    # Act
+    ran = run_in_order(scheduler, jobs)
+
+    # Assert
+    assert ran == expected
+
+
+def test_max_running():
+    # Arrange
+    scheduler = DownloadScheduler(max_connections=4)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def job():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    # Act
+    futures = [scheduler.submit(job, group="a", max_running=2) for _ in range(8)]
+    for future in futures:
+        future.result(timeout=5)
+
+    # Assert
+    assert peak[0] == 2
+
+
+def test_exception_propagates():
+    scheduler = DownloadScheduler()
+    future = scheduler.submit(lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        future.result(timeout=5)
+
+
+def test_pause():
+    # Arrange
+    scheduler = DownloadScheduler(max_connections=8)
+
+    # Act
+    scheduler.pause(0.2)
+    start = time.monotonic()
+    with scheduler.connection():
+        waited = time.monotonic() - start
+
+    # Assert
+    assert waited >= 0.15
+    assert scheduler.connection_limit == 5
+
+
+def test_throttle():
+    # Arrange
+    scheduler = DownloadScheduler(max_bandwidth=10000)
+
+    # Act
+    start = time.monotonic()
+    for _ in range(4):
+        scheduler.throttle(5000)
+    elapsed = time.monotonic() - start
+
+    # Assert
+    assert elapsed >= 0.9
+
+
+@pytest.mark.asyncio
+async def test_async_connection_shares_limits():
+    # Arrange
+    scheduler = DownloadScheduler(max_connections=1, max_bandwidth=10000)
+    scheduler.pause(0.2)
+    start = time.monotonic()
+
+    # Act
+    async with scheduler.async_connection():
+        waited = time.monotonic() - start
+        connected_elsewhere = threading.Thread(target=lambda: scheduler.connection().__enter__(), daemon=True)
+        connected_elsewhere.start()
+        connected_elsewhere.join(0.1)
+        blocked = connected_elsewhere.is_alive()
+        for _ in range(3):
+            await scheduler.async_throttle(5000)
+    elapsed = time.monotonic() - start
+
+    # Assert
+    assert waited >= 0.15
+    assert blocked
+    assert elapsed >= 0.15 + 0.4
+
+
+@pytest.mark.parametrize("max_bandwidth, expected", [((), 10000), ((None,), None), ((0,), None), ((500,), 500)])
+def test_configure_bandwidth(max_bandwidth, expected):
+    # Arrange
+    scheduler = DownloadScheduler(max_bandwidth=10000)
+
+    # Act
+    scheduler.configure(4, *max_bandwidth)
+
+    # Assert
+    assert scheduler.max_connections == 4
+    assert scheduler.max_bandwidth == expected
+
+
+@pytest.mark.parametrize("max_connections, max_bandwidth, order", [(0, None, None), (1, -1, None), (1, None, "x")])
+def test_configure_invalid(max_connections, max_bandwidth, order):
+    with pytest.raises(ValueError):
+        DownloadScheduler().configure(max_connections, max_bandwidth, order)
+
+
+def test_download_429_pauses_scheduler(tmp_path, monkeypatch):
+    # Arrange
+    scheduler = DownloadScheduler()
+    monkeypatch.setattr("osdatahub.DownloadsAPI.downloads_api.get_scheduler", lambda: scheduler)
+    url = "https://api.os.uk/downloads/v1/products/test/downloads?fileName=test.zip"
+
+    # Act
+    with requests_mock.Mocker() as m:
+        m.get(url, [{"status_code": 429, "headers": {"Retry-After": "0.1"}},
+                    {"content": b"data", "headers": {"Content-Length": "4"}}])
+        path = _DownloadObj(url, "test.zip", 4).download(tmp_path)
+
+    # Assert
+    assert open(path, "rb").read() == b"data"
+    assert scheduler.connection_limit == 5
+
+
+def test_get_scheduler():
+    assert get_scheduler() is get_scheduler()
@@ -0,0 +1,162 @@
+import io
+import json
+import time
+
+import pytest
+import requests_mock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from tqdm import tqdm
+
+from osdatahub.DownloadsAPI import DownloadTelemetry
+from osdatahub.DownloadsAPI.async_downloads import AsyncDownloadEngine
+from osdatahub.DownloadsAPI.downloads_api import _DownloadObj
+from osdatahub.DownloadsAPI.scheduler import DownloadScheduler
+from osdatahub.DownloadsAPI.telemetry import FileStats, TqdmReporter
+
+URL = "https://api.os.uk/downloads/v1/products/test/downloads?fileName=test.zip"
+CONTENT = bytes(range(256)) * 40
+
+
+@pytest.fixture()
+def scheduler(monkeypatch):
+    scheduler = DownloadScheduler()
+    monkeypatch.setattr("osdatahub.DownloadsAPI.downloads_api.get_scheduler", lambda: scheduler)
+    return scheduler
+
+
+def test_download(tmp_path, scheduler):
+    # Arrange
+    events = []
+    telemetry = DownloadTelemetry(lambda event, stats: events.append(event))
+
+    # Act
+    with requests_mock.Mocker() as m:
+        m.get(URL, content=CONTENT, headers={"Content-Length": str(len(CONTENT))})
+        path = _DownloadObj(URL, "test.zip", len(CONTENT)).download(tmp_path, telemetry=telemetry)
+
+    # Assert
+    stats = telemetry.files[URL]
+    assert stats.received == stats.position == len(CONTENT)
+    assert stats.requests == 1
+    assert stats.path == path
+    assert stats.time_to_first_byte is not None
+    assert events[:2] == ["first_byte", "start"]
+    assert events[-1] == "finish"
+
+
+def test_resume_counts_only_received_bytes(tmp_path, scheduler):
+    # Arrange
+    (tmp_path / "test.zip.part").write_bytes(CONTENT[:1000])
+    (tmp_path / "test.zip.part.json").write_text(json.dumps({"url": URL, "etag": '"v1"', "size": len(CONTENT)}))
+    telemetry = DownloadTelemetry()
+
+    # Act
+    with requests_mock.Mocker() as m:
+        m.get(URL, content=CONTENT[1000:], status_code=206,
+              headers={"ETag": '"v1"', "Content-Range": f"bytes 1000-{len(CONTENT) - 1}/{len(CONTENT)}"})
+        _DownloadObj(URL, "test.zip", len(CONTENT)).download(tmp_path, telemetry=telemetry)
+
+    # Assert
+    stats = telemetry.files[URL]
+    assert stats.position == len(CONTENT)
+    assert stats.received == len(CONTENT) - 1000
+
+
+def test_throttled(tmp_path, scheduler):
+    # Arrange
+    telemetry = DownloadTelemetry()
+
+    # Act
+    with requests_mock.Mocker() as m:
+        m.get(URL, [{"status_code": 429, "headers": {"Retry-After": "0.1"}},
+                    {"content": b"data", "headers": {"Content-Length": "4"}}])
+        _DownloadObj(URL, "test.zip", 4).download(tmp_path, telemetry=telemetry)
+
+    # Assert
+    summary = telemetry.summary()
+    assert summary["throttled"] == 1
+    assert summary["throttle_wait"] == pytest.approx(0.1)
+    assert summary["requests"] == 2
+    assert summary["completed"] == 1
+    assert summary["failed"] == 0
+
+
+def test_summary():
+    # Arrange
+    telemetry = DownloadTelemetry()
+    now = time.monotonic()
+    for name, received, first_byte in [("a", 1000, 0.1), ("b", 3000, 0.3)]:
+        stats = telemetry.file(name, received)
+        stats.received, stats.started, stats.finished = received, now - 2, now
+        stats.first_byte_times.append(first_byte)
+
+    # Act
+    summary = telemetry.summary()
+
+    # Assert
+    assert summary["files"] == summary["completed"] == 2
+    assert summary["bytes_received"] == 4000
+    assert summary["bytes_per_second"] == pytest.approx(2000)
+    assert summary["time_to_first_byte"] == pytest.approx(0.2)
+
+
+def test_same_file_name(tmp_path, scheduler):
+    # Arrange
+    other_url = "https://api.os.uk/downloads/v1/products/other/downloads?fileName=test.zip"
+    (tmp_path / "test").mkdir()
+    (tmp_path / "other").mkdir()
+    telemetry = DownloadTelemetry()
+
+    # Act
+    with requests_mock.Mocker() as m:
+        m.get(URL, content=CONTENT)
+        m.get(other_url, content=b"data")
+        _DownloadObj(URL, "test.zip", len(CONTENT)).download(tmp_path / "test", telemetry=telemetry)
+        _DownloadObj(f"{other_url}&key=secret", "test.zip", 4).download(tmp_path / "other", telemetry=telemetry)
+
+    # Assert
+    assert telemetry.summary()["completed"] == 2
+    assert telemetry.files[URL].received == len(CONTENT)
+    assert telemetry.files[other_url].received == 4
+    assert telemetry.files[other_url].file_name == "test.zip"
+
+
+def test_tqdm_reporter():
+    # Arrange
+    pbar = tqdm(total=300, file=io.StringIO())
+    reporter = TqdmReporter(pbar)
+    a, b = FileStats("a", 100, position=40), FileStats("b", 200, position=0)
+
+    # Act
+    reporter("start", a)
+    reporter("start", b)
+    a.position, b.position = 100, 150
+    reporter("progress", a)
+    reporter("progress", b)
+
+    # Assert
+    assert pbar.n == 250
+
+
+@pytest.mark.asyncio
+async def test_async_download(tmp_path):
+    # Arrange
+    async def handler(request):
+        return web.Response(body=CONTENT)
+
+    app = web.Application()
+    app.router.add_get("/test.zip", handler)
+    telemetry = DownloadTelemetry()
+
+    # Act
+    async with TestServer(app) as server:
+        url = str(server.make_url("/test.zip"))
+        await AsyncDownloadEngine().download([_DownloadObj(url, "test.zip", len(CONTENT))], str(tmp_path),
+                                             telemetry=telemetry)
+
+    # Assert
+    stats = telemetry.files[url]
+    assert stats.received == len(CONTENT)
+    assert stats.finished is not None
+    assert stats.time_to_first_byte is not None
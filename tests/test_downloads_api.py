@@ -1,3 +1,5 @@
+import hashlib
+import json
 import os
 import tempfile
 import unittest.mock as mock
@@ -6,8 +8,9 @@ import dotenv
 dotenv.load_dotenv()
 
 import pytest
+import requests_mock
 from osdatahub import OpenDataDownload, DataPackageDownload
-from osdatahub.DownloadsAPI.downloads_api import _DownloadObj
+from osdatahub.DownloadsAPI.downloads_api import _DownloadObj, _Manifest
 
 from tests.data import downloads_data as data
 
@@ -32,8 +35,7 @@ class TestOpenData:
         open_data_download.product_list(file_name=file_name, file_format=file_format, file_subformat=file_subformat,
                                         area=area, return_downloadobj=return_downloadobj)
         request_mocked.assert_called_with(url=expected_url,
-                                          params=expected_params,
-                                          proxies={})
+                                          params=expected_params)
 
         assert type(return_downloadobj) == bool
 
@@ -117,3 +119,311 @@ class TestOpenData:
 #     def download_fail(self):
 #         # TODO: implement _DownloadObje download fail
 #         pass
+
+
+class TestResumableDownload:
+    URL = "https://api.os.uk/downloads/v1/products/test/downloads?fileName=test.zip"
+    CONTENT = bytes(range(256)) * 40
+
+    def serve(self, m, etag='"v1"', ranges=True):
+        def callback(request, context):
+            context.headers["ETag"] = etag
+            byte_range = request.headers.get("Range")
+            if ranges and byte_range and request.headers.get("If-Range", etag) == etag:
+                start, end = byte_range.split("=")[1].split("-")
+                start, end = int(start), int(end or len(self.CONTENT) - 1)
+                context.status_code = 206
+                context.headers["Content-Range"] = f"bytes {start}-{end}/{len(self.CONTENT)}"
+                return self.CONTENT[start:end + 1]
+            context.headers["Content-Length"] = str(len(self.CONTENT))
+            return self.CONTENT
+
+        m.get(self.URL, content=callback)
+
+    def write_part(self, tmp_path, length, etag='"v1"'):
+        (tmp_path / "test.zip.part").write_bytes(self.CONTENT[:length])
+        (tmp_path / "test.zip.part.json").write_text(
+            json.dumps({"url": self.URL, "etag": etag, "size": len(self.CONTENT)}))
+
+    def test_download(self, tmp_path):
+        with requests_mock.Mocker() as m:
+            self.serve(m)
+            path = _DownloadObj(self.URL, "test.zip", len(self.CONTENT)).download(tmp_path)
+
+        assert open(path, "rb").read() == self.CONTENT
+        assert sorted(os.listdir(tmp_path)) == [".osdatahub_manifest.json", ".osdatahub_manifest.json.lock", "test.zip"]
+
+    @pytest.mark.parametrize("part_etag", ['"v1"', '"v0"'], ids=["unchanged", "changed_on_server"])
+    def test_resume(self, tmp_path, part_etag):
+        # Arrange
+        self.write_part(tmp_path, 1000, etag=part_etag)
+
+        # Act
+        with requests_mock.Mocker() as m:
+            self.serve(m)
+            path = _DownloadObj(self.URL, "test.zip", len(self.CONTENT)).download(tmp_path)
+
+        # Assert
+        assert m.last_request.headers["Range"] == "bytes=1000-"
+        assert m.last_request.headers["If-Range"] == part_etag
+        assert open(path, "rb").read() == self.CONTENT
+        assert sorted(os.listdir(tmp_path)) == [".osdatahub_manifest.json", ".osdatahub_manifest.json.lock", "test.zip"]
+
+    def test_incomplete_file_downloaded_again(self, tmp_path):
+        # Arrange
+        (tmp_path / "test.zip").write_bytes(self.CONTENT[:10])
+
+        # Act
+        with requests_mock.Mocker() as m:
+            self.serve(m)
+            path = _DownloadObj(self.URL, "test.zip", len(self.CONTENT)).download(tmp_path, overwrite=False)
+
+        # Assert
+        assert m.call_count == 1
+        assert open(path, "rb").read() == self.CONTENT
+
+    def test_complete_file_skipped(self, tmp_path):
+        (tmp_path / "test.zip").write_bytes(self.CONTENT)
+        with requests_mock.Mocker() as m:
+            _DownloadObj(self.URL, "test.zip", len(self.CONTENT)).download(tmp_path, overwrite=False)
+        assert m.call_count == 0
+
+    def test_truncated_response_resumed(self, tmp_path):
+        # Arrange
+        truncated = {"content": self.CONTENT[:500], "status_code": 200,
+                     "headers": {"ETag": '"v1"', "Content-Length": str(len(self.CONTENT))}}
+        rest = {"content": self.CONTENT[500:], "status_code": 206,
+                "headers": {"ETag": '"v1"', "Content-Range": f"bytes 500-{len(self.CONTENT) - 1}/{len(self.CONTENT)}"}}
+
+        # Act
+        with requests_mock.Mocker() as m:
+            m.get(self.URL, [truncated, rest])
+            path = _DownloadObj(self.URL, "test.zip", len(self.CONTENT)).download(tmp_path)
+
+        # Assert
+        assert m.call_count == 2
+        assert m.last_request.headers["Range"] == "bytes=500-"
+        assert open(path, "rb").read() == self.CONTENT
+
+    def test_segmented_download(self, tmp_path):
+        # Act
+        with requests_mock.Mocker() as m:
+            self.serve(m)
+            path = _DownloadObj(self.URL, "test.zip", len(self.CONTENT)).download(tmp_path, segments=3,
+                                                                                  segment_size=1000)
+
+        # Assert
+        ranges = sorted(request.headers["Range"] for request in m.request_history)
+        assert len(ranges) == 11
+        assert "bytes=10000-10239" in ranges
+        assert open(path, "rb").read() == self.CONTENT
+        assert sorted(os.listdir(tmp_path)) == [".osdatahub_manifest.json", ".osdatahub_manifest.json.lock", "test.zip"]
+
+    def test_segmented_resume(self, tmp_path):
+        # Arrange
+        part = bytearray(len(self.CONTENT))
+        part[1000:3000] = self.CONTENT[1000:3000]
+        (tmp_path / "test.zip.part").write_bytes(part)
+        (tmp_path / "test.zip.part.json").write_text(json.dumps(
+            {"url": self.URL, "etag": '"v1"', "size": len(self.CONTENT), "segment_size": 1000,
+             "completed": [1000, 2000]}))
+
+        # Act
+        with requests_mock.Mocker() as m:
+            self.serve(m)
+            path = _DownloadObj(self.URL, "test.zip", len(self.CONTENT)).download(tmp_path, segments=2,
+                                                                                  segment_size=1000)
+
+        # Assert
+        ranges = {request.headers["Range"] for request in m.request_history}
+        assert len(ranges) == 9
+        assert "bytes=1000-1999" not in ranges
+        assert open(path, "rb").read() == self.CONTENT
+
+    def test_segmented_without_range_support(self, tmp_path):
+        # Act
+        with requests_mock.Mocker() as m:
+            self.serve(m, ranges=False)
+            path = _DownloadObj(self.URL, "test.zip", len(self.CONTENT)).download(tmp_path, segments=2,
+                                                                                  segment_size=1000)
+
+        # Assert
+        assert "Range" not in m.last_request.headers
+        assert open(path, "rb").read() == self.CONTENT
+        assert sorted(os.listdir(tmp_path)) == [".osdatahub_manifest.json", ".osdatahub_manifest.json.lock", "test.zip"]
+
+    @pytest.mark.parametrize("segments", [1, 3])
+    def test_checksum(self, tmp_path, segments):
+        # Arrange
+        md5 = hashlib.md5(self.CONTENT).hexdigest()
+        download_obj = _DownloadObj(self.URL, "test.zip", len(self.CONTENT), md5=md5.upper())
+
+        # Act
+        with requests_mock.Mocker() as m:
+            self.serve(m)
+            download_obj.download(tmp_path, segments=segments, segment_size=1000)
+            requests_made = m.call_count
+            download_obj.download(tmp_path, segments=segments, segment_size=1000)
+
+        # Assert
+        assert m.call_count == requests_made
+        manifest = json.loads((tmp_path / ".osdatahub_manifest.json").read_text())
+        assert manifest["files"]["test.zip"] == {"size": len(self.CONTENT), "md5": md5}
+
+    def test_resumed_checksum(self, tmp_path):
+        # Arrange
+        self.write_part(tmp_path, 1000)
+        md5 = hashlib.md5(self.CONTENT).hexdigest()
+
+        # Act
+        with requests_mock.Mocker() as m:
+            self.serve(m)
+            _DownloadObj(self.URL, "test.zip", len(self.CONTENT), md5=md5).download(tmp_path)
+
+        # Assert
+        assert m.call_count == 1
+
+    @pytest.mark.parametrize("segments", [1, 3])
+    def test_checksum_mismatch(self, tmp_path, segments):
+        # Arrange
+        download_obj = _DownloadObj(self.URL, "test.zip", len(self.CONTENT), md5="0" * 32)
+
+        # Act
+        with requests_mock.Mocker() as m:
+            self.serve(m)
+            with pytest.raises(IOError, match="checksum mismatch"):
+                download_obj.download(tmp_path, segments=segments, segment_size=1000)
+
+        # Assert
+        assert os.listdir(tmp_path) == []
+
+
+class TestManifest:
+    def read(self, tmp_path):
+        return json.loads((tmp_path / _Manifest.FILE_NAME).read_text())["files"]
+
+    def test_add_written_immediately(self, tmp_path):
+        _Manifest.of(tmp_path).add("a.zip", 1, "md5")
+        assert self.read(tmp_path) == {"a.zip": {"size": 1, "md5": "md5"}}
+
+    def test_batch(self, tmp_path):
+        # Arrange
+        manifest = _Manifest.of(tmp_path)
+
+        # Act
+        with mock.patch("json.dump", wraps=json.dump) as dump:
+            with manifest.batch():
+                for i in range(250):
+                    manifest.add(f"{i}.zip", i, "md5")
+                    if i == 150:
+                        written_during = len(self.read(tmp_path))
+                with manifest.batch():
+                    manifest.add("nested.zip", 1, "md5")
+                written_nested = len(self.read(tmp_path))
+
+        # Assert
+        assert dump.call_count == 3
+        assert written_during == 100
+        assert written_nested == 200
+        assert len(self.read(tmp_path)) == 251
+        assert len(_Manifest.of(tmp_path).files()) == 251
+
+    def test_merges_other_processes(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / _Manifest.FILE_NAME)
+        ours, theirs = _Manifest(path), _Manifest(path)
+        ours._reload()
+        theirs._reload()
+
+        # Act
+        ours.add("a.zip", 1, "md5")
+        theirs.add("b.zip", 2, "md5")
+        ours.add("c.zip", 3, "md5")
+
+        # Assert
+        assert sorted(self.read(tmp_path)) == ["a.zip", "b.zip", "c.zip"]
+        assert sorted(ours.files()) == ["a.zip", "b.zip", "c.zip"]
+
+
+class TestSync:
+    FILES = {"a.zip": b"a" * 100, "b.zip": b"b" * 100, "b2.zip": b"B" * 120, "c.zip": b"c" * 50, "d.zip": b"d" * 10}
+    VERSIONS = {
+        "1": ("Full", {"a.zip": "a.zip", "b.zip": "b.zip"}),
+        "2": ("Full", {"a.zip": "a.zip", "b.zip": "b2.zip", "c.zip": "c.zip"}),
+        "3": ("Change Only Update", {"d.zip": "d.zip"}),
+    }
+
+    def product_list(self, version_id, return_downloadobj=False):
+        supply_type, files = self.VERSIONS[version_id]
+        downloads = [{"fileName": name, "url": f"https://api.os.uk/downloads/v1/files/{source}", "size":
+                      len(self.FILES[source]), "md5": hashlib.md5(self.FILES[source]).hexdigest()}
+                     for name, source in files.items()]
+        return {"id": version_id, "supplyType": supply_type, "downloads": downloads}
+
+    @pytest.fixture()
+    def data_package(self):
+        versions = [{"id": version_id, "createdOn": f"2024-0{version_id}-01"} for version_id in self.VERSIONS]
+        with mock.patch.object(DataPackageDownload, "versions", new_callable=mock.PropertyMock,
+                               return_value=versions), \
+                mock.patch.object(DataPackageDownload, "product_list", side_effect=self.product_list):
+            yield DataPackageDownload("test_key", "test_id")
+
+    def test_sync(self, tmp_path, data_package):
+        # Act
+        with requests_mock.Mocker() as m:
+            for name, content in self.FILES.items():
+                m.get(f"https://api.os.uk/downloads/v1/files/{name}", content=content,
+                      headers={"Content-Length": str(len(content))})
+            data_package.sync(tmp_path, "1")
+            first_sync = m.call_count
+            data_package.sync(tmp_path, "1")
+            second_sync = m.call_count
+            data_package.sync(tmp_path, "2", processes=2)
+            third_sync = m.call_count
+            synced = data_package.sync(tmp_path)
+
+        # Assert
+        assert (first_sync, second_sync, third_sync, m.call_count) == (2, 2, 4, 5)
+        assert [os.path.basename(path) for path in synced] == ["d.zip"]
+        assert (tmp_path / "2" / "b.zip").read_bytes() == self.FILES["b2.zip"]
+        assert (tmp_path / "1" / "b.zip").read_bytes() == self.FILES["b.zip"]
+        assert os.path.samefile(tmp_path / "1" / "a.zip", tmp_path / "2" / "a.zip")
+
+    @pytest.mark.parametrize("match_names, expected_calls", [(False, 2), (True, 0)])
+    def test_sync_without_checksums(self, tmp_path, data_package, match_names, expected_calls):
+        # Arrange
+        changed = b"x" * 100
+        with requests_mock.Mocker() as m:
+            for name, content in self.FILES.items():
+                m.get(f"https://api.os.uk/downloads/v1/files/{name}", content=content,
+                      headers={"Content-Length": str(len(content))})
+            data_package.sync(tmp_path, "1")
+        listing = self.product_list("1")
+        for download in listing["downloads"]:
+            download["md5"] = None
+        listing["downloads"][1]["url"] = "https://api.os.uk/downloads/v1/files/changed.zip"
+
+        # Act
+        with requests_mock.Mocker() as m, \
+                mock.patch.object(DataPackageDownload, "product_list", return_value=listing):
+            m.get("https://api.os.uk/downloads/v1/files/a.zip", content=self.FILES["a.zip"])
+            m.get("https://api.os.uk/downloads/v1/files/changed.zip", content=changed)
+            data_package.sync(tmp_path, "2", match_names=match_names)
+
+        # Assert
+        assert m.call_count == expected_calls
+        assert (tmp_path / "2" / "b.zip").read_bytes() == (self.FILES["b.zip"] if match_names else changed)
+
+    def test_sync_apply_changes(self, tmp_path, data_package):
+        # Act
+        with requests_mock.Mocker() as m:
+            for name, content in self.FILES.items():
+                m.get(f"https://api.os.uk/downloads/v1/files/{name}", content=content,
+                      headers={"Content-Length": str(len(content))})
+            data_package.sync(tmp_path, "2")
+            synced = data_package.sync(tmp_path, "3", apply_changes=True)
+
+        # Assert
+        assert sorted(os.path.basename(path) for path in synced) == ["a.zip", "b.zip", "c.zip", "d.zip"]
+        assert os.path.samefile(tmp_path / "2" / "c.zip", tmp_path / "3" / "c.zip")
+        assert m.call_count == 4
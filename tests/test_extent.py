@@ -1,6 +1,11 @@
+import json
+
 import pytest
 import requests_mock
 from osdatahub import Extent
+from osdatahub.ons_api import ID_ENDPOINT
+import numpy as np
+from shapely.geometry import MultiPolygon, Point, box
 
 from tests.data import extent_data as data
 
@@ -71,6 +76,19 @@ class TestExtent:
         # Assert
         assert json == expected_result
 
+    @pytest.mark.parametrize(*data.test_split())
+    def test_split(self, polygon, rows, cols, expected_count):
+        # Arrange
+        extent = Extent(polygon, "EPSG:27700")
+
+        # Act
+        parts = extent.split(rows, cols)
+
+        # Assert
+        assert len(parts) == expected_count
+        assert all(part.crs == extent.crs for part in parts)
+        assert sum(part.polygon.area for part in parts) == pytest.approx(extent.polygon.area)
+
 
 @pytest.mark.parametrize(*data.test_from_ons_code())
 def test_from_ons_code(ons_code, ons_mock_response, expected_result):
@@ -100,3 +118,159 @@ def test_from_ons_code_error(ons_code, ons_mock_response):
         m.register_uri("GET", endpoint, text=ons_mock_response)
         with pytest.raises(ValueError):
             Extent.from_ons_code(ons_code)
+
+
+def ons_response(geometry):
+    return json.dumps({"type": "FeatureCollection", "features": [{"type": "Feature", "geometry": geometry}]})
+
+
+def test_from_ons_code_cached():
+    # Arrange
+    geometry = {"type": "Polygon", "coordinates": [[[0, 0], [1, 1], [2, 0], [0, 0]]]}
+
+    # Act
+    with requests_mock.Mocker() as m:
+        m.register_uri("GET", f"{ID_ENDPOINT}E0100001", text=ons_response(geometry))
+        first = Extent.from_ons_code("E0100001")
+        second = Extent.from_ons_code("E0100001")
+        uncached = Extent.from_ons_code("E0100001", cache=False)
+
+    # Assert
+    assert first == second == uncached
+    assert m.call_count == 2
+
+
+def test_from_ons_code_multipolygon():
+    # Arrange
+    geometry = {"type": "MultiPolygon", "coordinates": [[[[0, 0], [0, 1], [1, 1], [0, 0]]],
+                                                        [[[2, 2], [2, 3], [3, 3], [2, 2]]]]}
+
+    # Act
+    with requests_mock.Mocker() as m:
+        m.register_uri("GET", f"{ID_ENDPOINT}E0100001", text=ons_response(geometry))
+        extent = Extent.from_ons_code("E0100001")
+
+    # Assert
+    assert isinstance(extent.polygon, MultiPolygon)
+    assert [tuple(part.bbox) for part in extent.parts] == [(0, 0, 1, 1), (2, 2, 3, 3)]
+    assert extent.to_json()["type"] == "MultiPolygon"
+    with pytest.raises(ValueError):
+        extent.xml_coords
+
+
+def test_from_ons_codes():
+    # Arrange
+    codes = [f"E010000{i}" for i in range(5)]
+
+    # Act
+    with requests_mock.Mocker() as m:
+        for i, code in enumerate(codes):
+            geometry = {"type": "Polygon", "coordinates": [[[i, 0], [i, 1], [i + 1, 1], [i, 0]]]}
+            m.register_uri("GET", f"{ID_ENDPOINT}{code}", text=ons_response(geometry))
+        extents = Extent.from_ons_codes(codes + codes[:2], max_workers=3)
+
+    # Assert
+    assert list(extents) == codes
+    assert [extent.bbox.west for extent in extents.values()] == list(range(5))
+    assert m.call_count == 5
+
+
+def test_parts_polygon():
+    extent = Extent.from_bbox((0, 0, 1, 1), "EPSG:27700")
+    assert extent.parts == [extent]
+
+
+def test_multipolygon_to_json_4326():
+    extent = Extent(MultiPolygon([box(0, 50, 1, 51), box(2, 52, 3, 53)]), "EPSG:4326")
+    assert extent.to_json()["coordinates"][1][0][0] == (52.0, 3.0)
+
+
+def feature_collection(geometries, crs="EPSG:27700"):
+    return {"type": "FeatureCollection", "crs": crs,
+            "features": [{"type": "Feature", "geometry": geometry, "properties": {"id": i}}
+                         for i, geometry in enumerate(geometries)]}
+
+
+@pytest.mark.parametrize("predicate, expected_ids", [
+    ("intersects", [0, 2, 3, 5]),
+    ("contains", [0, 3, 5]),
+    ("within", []),
+])
+def test_filter(predicate, expected_ids):
+    # Arrange
+    extent = Extent(MultiPolygon([box(0, 0, 10, 10), box(20, 0, 30, 10)]), "EPSG:27700")
+    features = feature_collection([
+        {"type": "Point", "coordinates": [5, 5]},
+        {"type": "Point", "coordinates": [15, 5]},
+        {"type": "LineString", "coordinates": [[5, 5], [15, 5]]},
+        {"type": "Polygon", "coordinates": [[[21, 1], [22, 1], [22, 2], [21, 1]]]},
+        None,
+        {"type": "MultiPoint", "coordinates": [[1, 1], [25, 5]]},
+    ])
+
+    # Act
+    filtered = extent.filter(features, predicate)
+    mask = extent.filter(features, predicate, mask=True)
+
+    # Assert
+    assert [feature["properties"]["id"] for feature in filtered["features"]] == expected_ids
+    assert filtered["crs"] == "EPSG:27700"
+    assert np.flatnonzero(mask).tolist() == expected_ids
+
+
+def test_filter_geometries():
+    # Arrange
+    extent = Extent.from_bbox((0, 0, 10, 10), "EPSG:27700")
+    geometries = [Point(5, 5), Point(15, 5), box(8, 8, 12, 12)]
+
+    # Act
+    as_list = extent.filter(geometries, "contains")
+    as_array = extent.filter(np.array(geometries, dtype=object), "intersects")
+
+    # Assert
+    assert as_list == [geometries[0]]
+    assert list(as_array) == [geometries[0], geometries[2]]
+
+
+def test_filter_transforms_extent():
+    # Arrange
+    extent = Extent.from_bbox((529000, 180000, 531000, 181000), "EPSG:27700")
+    features = feature_collection([{"type": "Point", "coordinates": [-0.128, 51.508]},
+                                   {"type": "Point", "coordinates": [-0.1, 51.508]}], crs="CRS84")
+
+    # Act
+    filtered = extent.filter(features)
+
+    # Assert
+    assert [feature["properties"]["id"] for feature in filtered["features"]] == [0]
+
+
+def test_filter_invalid_predicate():
+    with pytest.raises(ValueError):
+        Extent.from_bbox((0, 0, 1, 1), "EPSG:27700").filter([], predicate="equals")
+
+
+def test_to_crs():
+    # Arrange
+    extent = Extent.from_bbox((529000, 180000, 531000, 181000), "EPSG:27700")
+
+    # Act
+    transformed = extent.to_crs("EPSG:4326")
+    round_trip = transformed.to_crs("EPSG:27700")
+
+    # Assert
+    assert transformed.crs == "EPSG:4326"
+    assert -0.2 < transformed.bbox.west < transformed.bbox.east < 0
+    assert 51.4 < transformed.bbox.south < transformed.bbox.north < 51.6
+    assert round_trip.polygon.equals_exact(extent.polygon, tolerance=0.01)
+
+
+def test_to_crs_max_segment_length():
+    extent = Extent.from_bbox((529000, 180000, 531000, 181000), "EPSG:27700")
+    assert len(extent.to_crs("EPSG:3857", max_segment_length=100).polygon.exterior.coords) == 61
+
+
+def test_from_grid_reference():
+    extent = Extent.from_grid_reference("su 3720 1551")
+    assert extent.crs == "EPSG:27700"
+    assert tuple(extent.bbox) == (437200, 115510, 437210, 115520)
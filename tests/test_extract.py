@@ -0,0 +1,181 @@
+import io
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests_mock
+
+from osdatahub import OpenDataDownload
+from osdatahub.DownloadsAPI.downloads_api import _DownloadObj
+from osdatahub.DownloadsAPI.extract import StreamingZipExtractor, extract_archive, member_filter
+
+MEMBERS = {"data/roads.gpkg": os.urandom(5000) + b"road" * 5000, "docs/readme.txt": b"hello " * 100,
+           "empty.txt": b""}
+
+
+class _Unseekable(io.RawIOBase):
+    """A write-only stream, which makes zipfile write data descriptors after each member"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+
+def make_zip(data_descriptors=False, members=MEMBERS):
+    stream = _Unseekable() if data_descriptors else io.BytesIO()
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return bytes(stream.buffer) if data_descriptors else stream.getvalue()
+
+
+def feed(extractor, content, chunk_size=777):
+    for start in range(0, len(content), chunk_size):
+        extractor.feed(content[start:start + chunk_size])
+    return extractor.close()
+
+
+@pytest.mark.parametrize("extract, expected", [
+    (True, ["data/roads.gpkg", "docs/readme.txt", "empty.txt"]),
+    ("*.gpkg", ["data/roads.gpkg"]),
+    (["docs/*", "*.gpkg"], ["data/roads.gpkg", "docs/readme.txt"]),
+])
+def test_streaming_extract(tmp_path, extract, expected):
+    # Arrange
+    extractor = StreamingZipExtractor(tmp_path, member_filter(extract))
+
+    # Act
+    streamed = feed(extractor, make_zip())
+
+    # Assert
+    assert streamed
+    assert sorted(os.path.relpath(path, tmp_path).replace(os.sep, "/") for path in extractor.extracted) == expected
+    for name in expected:
+        assert (tmp_path / name).read_bytes() == MEMBERS[name]
+
+
+def test_streaming_extract_data_descriptors(tmp_path):
+    extractor = StreamingZipExtractor(tmp_path, member_filter(True))
+    assert not feed(extractor, make_zip(data_descriptors=True))
+    assert list(tmp_path.rglob("*.part")) == []
+
+
+def test_streaming_extract_outside_destination(tmp_path):
+    extractor = StreamingZipExtractor(tmp_path / "out", member_filter(True))
+    assert not feed(extractor, make_zip(members={"../evil.txt": b"evil"}))
+    assert not (tmp_path / "evil.txt").exists()
+
+
+def test_streaming_extract_truncated(tmp_path):
+    extractor = StreamingZipExtractor(tmp_path, member_filter(True))
+    assert not feed(extractor, make_zip()[:3000])
+
+
+def test_member_filter():
+    assert member_filter(False) is None
+    assert member_filter("*.txt")("a/b.txt")
+    assert not member_filter(["*.gpkg"])("a/b.txt")
+
+
+def test_extract_archive(tmp_path):
+    # Arrange
+    archive_path = tmp_path / "product.zip"
+    archive_path.write_bytes(make_zip(data_descriptors=True))
+
+    # Act
+    with ThreadPoolExecutor(2) as executor:
+        futures = extract_archive(archive_path, member_filter(True), executor, workers=2)
+        extracted = [path for future in futures for path in future.result()]
+
+    # Assert
+    assert len(futures) == 2
+    assert len(extracted) == 3
+    assert (tmp_path / "product" / "docs" / "readme.txt").read_bytes() == MEMBERS["docs/readme.txt"]
+
+
+@pytest.mark.parametrize("data_descriptors", [False, True])
+def test_download_extract(tmp_path, data_descriptors):
+    # Arrange
+    content = make_zip(data_descriptors)
+    urls = [f"https://api.os.uk/downloads/v1/products/test/downloads?fileName=test{i}.zip" for i in range(2)]
+    download_list = [_DownloadObj(url, f"test{i}.zip", len(content)) for i, url in enumerate(urls)]
+
+    # Act
+    with requests_mock.Mocker() as m, \
+            mock.patch.object(OpenDataDownload, "product_list", return_value=download_list):
+        for url in urls:
+            m.get(url, content=content, headers={"Content-Length": str(len(content))})
+        OpenDataDownload("test").download(tmp_path, download_multiple=True, extract="*.txt", processes=2)
+
+    # Assert
+    for i in range(2):
+        assert (tmp_path / f"test{i}" / "docs" / "readme.txt").read_bytes() == MEMBERS["docs/readme.txt"]
+        assert not (tmp_path / f"test{i}" / "data").exists()
+
+
+def serve_ranges(m, url, content):
+    def callback(request, context):
+        context.headers["ETag"] = '"v1"'
+        byte_range = request.headers.get("Range")
+        if byte_range:
+            start, end = byte_range.split("=")[1].split("-")
+            start, end = int(start), int(end or len(content) - 1)
+            context.status_code = 206
+            context.headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+            return content[start:end + 1]
+        context.headers["Content-Length"] = str(len(content))
+        return content
+
+    m.get(url, content=callback)
+
+
+@pytest.mark.parametrize("segments, resumed_from", [(3, 0), (1, 0), (1, 4000)],
+                         ids=["segmented", "single_stream", "resumed"])
+def test_download_extract_streamed(tmp_path, segments, resumed_from):
+    # Arrange
+    content = make_zip()
+    url = "https://api.os.uk/downloads/v1/products/test/downloads?fileName=test.zip"
+    if resumed_from:
+        (tmp_path / "test.zip.part").write_bytes(content[:resumed_from])
+        (tmp_path / "test.zip.part.json").write_text(json.dumps({"url": url, "etag": '"v1"', "size": len(content)}))
+    extractor = StreamingZipExtractor(tmp_path / "test", member_filter(True))
+
+    # Act
+    with requests_mock.Mocker() as m:
+        serve_ranges(m, url, content)
+        _DownloadObj(url, "test.zip", len(content)).download(tmp_path, segments=segments, segment_size=1000,
+                                                             extractor=extractor)
+
+    # Assert
+    assert extractor.close()
+    assert (tmp_path / "test" / "data" / "roads.gpkg").read_bytes() == MEMBERS["data/roads.gpkg"]
+
+
+def test_download_extract_not_repeated(tmp_path):
+    # Arrange
+    content = make_zip()
+    url = "https://api.os.uk/downloads/v1/products/test/downloads?fileName=test.zip"
+    download_list = [_DownloadObj(url, "test.zip", len(content))]
+
+    # Act
+    with requests_mock.Mocker() as m, \
+            mock.patch.object(OpenDataDownload, "product_list", return_value=download_list), \
+            mock.patch("osdatahub.DownloadsAPI.downloads_api.extract_archive") as extract_mocked:
+        m.get(url, content=content, headers={"Content-Length": str(len(content))})
+        OpenDataDownload("test").download(tmp_path, extract=True)
+        OpenDataDownload("test").download(tmp_path, extract=True)
+        (tmp_path / "test" / "docs" / "readme.txt").unlink()
+        OpenDataDownload("test").download(tmp_path, extract=True)
+
+    # Assert
+    assert m.call_count == 1
+    assert extract_mocked.call_count == 1
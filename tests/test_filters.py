@@ -1,5 +1,7 @@
 import pytest
+from osdatahub import Extent
 from osdatahub.filters import is_between, single_attribute_filter, intersects
+from shapely.geometry import MultiPolygon, box
 
 from tests.data import filters_data as data
 
@@ -31,6 +33,18 @@ class TestFiltering:
         # Assert
         assert extent_filter == expected_result
 
+    def test_intersects_multipolygon(self):
+        # Arrange
+        extent = Extent(MultiPolygon([box(0, 0, 1, 1), box(2, 2, 3, 3)]), "EPSG:27700")
+
+        # Act
+        extent_filter = intersects(extent).xml
+
+        # Assert
+        assert extent_filter.count("<gml:polygonMember>") == 2
+        assert "<gml:MultiPolygon xmlns:gml='http://www.opengis.net/gml' srsName='EPSG:27700'>" in extent_filter
+        assert "<gml:Polygon><gml:outerBoundaryIs>" in extent_filter
+
     @pytest.mark.parametrize(*data.test_logical())
     def test_logical(self, filter1, filter2, filter3, op1, op2, op3, expected_result):
         # Act
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from osdatahub import Extent
+from osdatahub.codes import AREA_CODES
+from osdatahub.grid_reference import decode, encode, squares, tile
+
+
+@pytest.mark.parametrize("easting, northing, digits, expected", [
+    (437293, 115541, 4, "SU 3729 1554"),
+    (437293, 115541, 0, "SU"),
+    (437293, 115541, 1, "SU 3 1"),
+    (651409, 313177, 5, "TG 51409 13177"),
+    (0, 0, 3, "SV 000 000"),
+    (465000, 1210000, 2, "HP 65 10"),
+    (325100, 673400, 3, "NT 251 734"),
+])
+def test_encode(easting, northing, digits, expected):
+    assert encode(easting, northing, digits) == expected
+
+
+def test_encode_arrays():
+    references = encode(np.array([437293, 651409]), np.array([115541, 313177]), digits=1, separator="")
+    assert references.tolist() == ["SU31", "TG51"]
+
+
+@pytest.mark.parametrize("easting, northing", [(-1, 0), (0, 1300000), (700000, 0)])
+def test_encode_outside_grid(easting, northing):
+    with pytest.raises(ValueError):
+        encode(easting, northing)
+
+
+def test_decode():
+    # Act
+    eastings, northings, sizes = decode(["SU 3720 1551", "tg51", "HP", "NT251734"])
+
+    # Assert
+    np.testing.assert_array_equal(eastings, [437200, 650000, 400000, 325100])
+    np.testing.assert_array_equal(northings, [115510, 310000, 1200000, 673400])
+    np.testing.assert_array_equal(sizes, [10, 10000, 100000, 100])
+
+
+def test_decode_centre():
+    eastings, northings, _ = decode("SU31", centre=True)
+    assert (eastings[0], northings[0]) == (435000, 115000)
+
+
+@pytest.mark.parametrize("grid_reference", ["SU3", "SI12", "XX11", "SU3A", "S", "SU 12345 123456", "ÅU12"])
+def test_decode_invalid(grid_reference):
+    with pytest.raises(ValueError):
+        decode(["SU12", grid_reference])
+
+
+def test_round_trip():
+    # Arrange
+    rng = np.random.default_rng(0)
+    eastings, northings = rng.integers(0, 700000, 1000), rng.integers(0, 1300000, 1000)
+
+    # Act
+    decoded_eastings, decoded_northings, _ = decode(encode(eastings, northings, digits=5))
+
+    # Assert
+    np.testing.assert_array_equal(decoded_eastings, eastings)
+    np.testing.assert_array_equal(decoded_northings, northings)
+
+
+def test_squares():
+    # Arrange
+    extent = Extent.from_bbox((395000, 105000, 410000, 112000), "EPSG:27700")
+
+    # Act
+    references = squares(extent, size=10000)
+    areas = squares(extent, size=100000)
+
+    # Assert
+    # squares only touching the extent's edge, such as SU10, aren't included
+    assert references == ["ST90", "SU00", "ST91", "SU01"]
+    assert areas == ["ST", "SU"]
+    assert set(areas) <= AREA_CODES
+
+
+def test_tile():
+    # Arrange
+    extent = Extent.from_radius((405000, 105000), 7000, "EPSG:27700")
+
+    # Act
+    clipped = tile(extent, size=10000)
+    squares_ = tile(extent, size=10000, clip=False)
+
+    # Assert
+    assert [reference for reference, _ in clipped] == ["SZ09", "ST90", "SU00", "SU10", "SU01"]
+    assert sum(part.polygon.area for _, part in clipped) == pytest.approx(extent.polygon.area)
+    assert all(square.polygon.area == 10000 ** 2 for _, square in squares_)
+
+
+def test_tile_other_crs():
+    # Arrange
+    extent = Extent.from_grid_reference("SU31").to_crs("EPSG:4326")
+
+    # Act
+    tiles = tile(extent, size=10000)
+
+    # Assert
+    reference, largest = max(tiles, key=lambda t: t[1].polygon.area)
+    assert reference == "SU31"
+    assert largest.crs == "EPSG:27700"
@@ -0,0 +1,55 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import osdatahub
+
+# third party modules that are slow to import, and osdatahub modules that import several of them
+TRACKED_MODULES = ["aiohttp", "geojson", "numpy", "pyproj", "requests", "shapely", "tqdm", "typeguard",
+                   "osdatahub.DownloadsAPI.data_package", "osdatahub.NGD.ngd_api", "osdatahub.extent"]
+
+
+def imported_modules(statement):
+    """Runs an import statement in a fresh interpreter and returns which of the tracked modules it imported"""
+    code = f"import json, sys\n{statement}\nprint(json.dumps([m for m in {TRACKED_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout))
+
+
+def test_import_is_lazy():
+    assert imported_modules("import osdatahub") == set()
+
+
+@pytest.mark.parametrize("statement, unexpected", [
+    ("from osdatahub import PlacesAPI", {"aiohttp", "tqdm", "pyproj", "osdatahub.DownloadsAPI.data_package",
+                                         "osdatahub.NGD.ngd_api"}),
+    ("from osdatahub import OpenDataDownload", {"aiohttp", "shapely", "pyproj", "osdatahub.extent"}),
+    ("from osdatahub import Extent", {"aiohttp", "tqdm", "typeguard", "pyproj"}),
+    ("from osdatahub.DownloadsAPI import ContentStore", {"requests", "tqdm", "typeguard", "shapely"}),
+])
+def test_imports_only_what_is_used(statement, unexpected):
+    assert imported_modules(statement).isdisjoint(unexpected)
+
+
+def test_lazy_names():
+    # Arrange
+    from osdatahub.NGD.ngd_api import NGD
+    from osdatahub.PlacesAPI.places_api import PlacesAPI
+
+    # Assert
+    assert osdatahub.PlacesAPI is PlacesAPI
+    assert osdatahub.NGD is NGD
+    assert {"Extent", "PlacesAPI", "get"} <= set(dir(osdatahub))
+    assert "PlacesAPI" in osdatahub.__all__
+
+
+def test_submodule_attribute():
+    assert osdatahub.filters.intersects is not None
+
+
+def test_missing_attribute():
+    with pytest.raises(AttributeError):
+        osdatahub.NotAnAPI
+    assert not hasattr(osdatahub.PlacesAPI, "NotAnAPI")
@@ -1,6 +1,12 @@
+import threading
+import unittest.mock as mock
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from osdatahub import LinkedIdentifiersAPI
 from osdatahub.LinkedIdentifiersAPI.linked_identifier_options import Options
+from osdatahub.rate_limiter import ThreadedRateLimiter
+from requests.exceptions import HTTPError
 
 from tests.data import linked_identifiers_api_data as data
 
@@ -49,3 +55,186 @@ class TestOptions:
                 f"'option4' is not a valid test options, "
                 + f"please choose from one of the following:\n- option1\n- option2\n- option3"
         )
+
+
+class TestQueryMany:
+    @staticmethod
+    def fake_get(endpoint):
+        identifier = endpoint.split("?")[0].split("/")[-1]
+        if identifier == "404":
+            return mock.Mock(status_code=404)
+        return mock.Mock(status_code=200, **{"json.return_value": {"linkedIdentifier": {"identifier": identifier}}})
+
+    @mock.patch('osdatahub.get')
+    def test_query_many(self, request_mocked):
+        # Arrange
+        request_mocked.side_effect = self.fake_get
+        li_api = LinkedIdentifiersAPI("KEY")
+
+        # Act
+        results = li_api.query_many([1, "1", 2, "404"], identifier_type="UPRN", request_delay=0)
+
+        # Assert
+        assert request_mocked.call_count == 3
+        assert results == {1: {"linkedIdentifier": {"identifier": "1"}},
+                           2: {"linkedIdentifier": {"identifier": "2"}},
+                           "404": None}
+
+    @mock.patch('osdatahub.get')
+    def test_query_many_cached(self, request_mocked, tmp_path):
+        # Arrange
+        request_mocked.side_effect = self.fake_get
+        li_api = LinkedIdentifiersAPI("KEY")
+        cache = tmp_path / "links.sqlite"
+
+        # Act
+        li_api.query_many([1, 2], cache=cache, request_delay=0)
+        results = li_api.query_many([1, 2, 3], cache=cache, request_delay=0)
+        li_api.query_many([1], feature_type="BLPU", cache=cache, request_delay=0)
+
+        # Assert
+        assert request_mocked.call_count == 4
+        assert list(results) == [1, 2, 3]
+
+    @mock.patch('osdatahub.get')
+    def test_query_many_error(self, request_mocked):
+        request_mocked.return_value = mock.Mock(status_code=401, url="url")
+        with pytest.raises(HTTPError):
+            LinkedIdentifiersAPI("KEY").query_many([1], request_delay=0)
+
+    @mock.patch('osdatahub.get')
+    def test_query_many_error_keeps_cached_results(self, request_mocked, tmp_path):
+        # Arrange
+        def fake_get(endpoint):
+            if "/500?" in endpoint:
+                return mock.Mock(status_code=500, url="url")
+            return self.fake_get(endpoint)
+
+        request_mocked.side_effect = fake_get
+        li_api = LinkedIdentifiersAPI("KEY")
+        cache = tmp_path / "links.sqlite"
+
+        # Act
+        with pytest.raises(HTTPError):
+            li_api.query_many([1, 500, 2, 3], cache=cache, request_delay=0)
+        request_mocked.side_effect = self.fake_get
+        li_api.query_many([1, 2, 3, 500], cache=cache, request_delay=0)
+
+        # Assert
+        assert request_mocked.call_count == 5
+
+    @mock.patch('osdatahub.get')
+    def test_query_many_bounded_in_flight(self, request_mocked):
+        # Arrange
+        request_mocked.side_effect = self.fake_get
+        in_flight, most_in_flight = [0], [0]
+        lock = threading.Lock()
+
+        class CountingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                def done(_):
+                    with lock:
+                        in_flight[0] -= 1
+
+                with lock:
+                    in_flight[0] += 1
+                    most_in_flight[0] = max(most_in_flight[0], in_flight[0])
+                future = super().submit(fn, *args, **kwargs)
+                future.add_done_callback(done)
+                return future
+
+        # Act
+        with mock.patch("osdatahub.LinkedIdentifiersAPI.linked_identifiers_api.ThreadPoolExecutor", CountingExecutor):
+            results = LinkedIdentifiersAPI("KEY").query_many(range(200), max_concurrent=2, request_delay=0)
+
+        # Assert
+        assert len(results) == 200
+        assert most_in_flight[0] <= 8
+
+    def test_query_many_invalid_type(self):
+        with pytest.raises(ValueError):
+            LinkedIdentifiersAPI("KEY").query_many([1], identifier_type="NOT_A_TYPE")
+
+
+class TestTraverse:
+    LINKS = {
+        "100": [("BLPU_UPRN_TopographicArea_TOID_5", "TopographicArea", "TOID", ["osgb1"]),
+                ("BLPU_UPRN_Street_USRN_11", "Street", "USRN", ["200"])],
+        "osgb1": [("BLPU_UPRN_TopographicArea_TOID_5", "BLPU", "UPRN", ["100", "101"]),
+                  ("RoadLink_TOID_TopographicArea_TOID_2", "RoadLink", "TOID", ["osgb2"])],
+        "101": [("BLPU_UPRN_TopographicArea_TOID_5", "TopographicArea", "TOID", ["osgb1"])],
+        "osgb2": [("RoadLink_TOID_Street_USRN_8", "Street", "USRN", ["200"])],
+        "200": [("BLPU_UPRN_Street_USRN_11", "BLPU", "UPRN", ["100"])],
+    }
+
+    def fake_get(self, endpoint):
+        identifier = endpoint.split("?")[0].split("/")[-1]
+        correlations = [{"correlationMethodIdentifier": method,
+                         "correlatedFeatureType": feature_type,
+                         "correlatedIdentifierType": identifier_type,
+                         "correlatedIdentifiers": [{"identifier": linked} for linked in linked_identifiers]}
+                        for method, feature_type, identifier_type, linked_identifiers in self.LINKS[identifier]]
+        return mock.Mock(status_code=200, **{"json.return_value": {"linkedIdentifier": {"identifier": identifier},
+                                                                   "correlations": correlations}})
+
+    @pytest.mark.parametrize("depth, expected_nodes, expected_requests", [
+        (1, {"100", "osgb1", "200"}, 1),
+        (2, {"100", "osgb1", "200", "101", "osgb2"}, 3),
+        (3, {"100", "osgb1", "200", "101", "osgb2"}, 5),
+    ])
+    @mock.patch('osdatahub.get')
+    def test_traverse(self, request_mocked, depth, expected_nodes, expected_requests):
+        # Arrange
+        request_mocked.side_effect = self.fake_get
+        li_api = LinkedIdentifiersAPI("KEY")
+
+        # Act
+        graph = li_api.traverse([100], depth=depth, identifier_type="UPRN", request_delay=0)
+
+        # Assert
+        assert set(graph.nodes) == expected_nodes
+        assert request_mocked.call_count == expected_requests
+        assert graph.nodes["osgb1"] == {"identifierType": "TOID", "featureType": "TopographicArea", "depth": 1}
+        assert graph.edges["100"] == {"osgb1": "BLPU_UPRN_TopographicArea_TOID_5", "200": "BLPU_UPRN_Street_USRN_11"}
+
+    @mock.patch('osdatahub.get')
+    def test_traverse_target(self, request_mocked):
+        # Arrange
+        request_mocked.side_effect = self.fake_get
+        li_api = LinkedIdentifiersAPI("KEY")
+
+        # Act
+        graph = li_api.traverse(["100"], depth=5, target_identifier_type="USRN",
+                                methods=["BLPU_UPRN_Street_USRN_11"], request_delay=0)
+
+        # Assert
+        assert graph.find("USRN") == ["200"]
+        assert graph.neighbours("100") == ["200"]
+        assert request_mocked.call_count == 1
+
+    @mock.patch('osdatahub.get')
+    def test_traverse_level_looked_up_together(self, request_mocked):
+        # Arrange
+        # osgb1 and 200 have different feature types, so are only looked up at the same time if the groups overlap
+        barrier = threading.Barrier(2, timeout=2)
+
+        def fake_get(endpoint):
+            if endpoint.split("?")[0].split("/")[-1] in ("osgb1", "200"):
+                barrier.wait()
+            return self.fake_get(endpoint)
+
+        request_mocked.side_effect = fake_get
+        module = "osdatahub.LinkedIdentifiersAPI.linked_identifiers_api"
+
+        # Act
+        with mock.patch(f"{module}.ThreadedRateLimiter", wraps=ThreadedRateLimiter) as limiter_mocked:
+            graph = LinkedIdentifiersAPI("KEY").traverse([100], depth=2, identifier_type="UPRN", max_concurrent=2,
+                                                         request_delay=0)
+
+        # Assert
+        assert set(graph.nodes) == {"100", "osgb1", "200", "101", "osgb2"}
+        assert limiter_mocked.call_count == 1
+
+    def test_traverse_invalid_depth(self):
+        with pytest.raises(ValueError):
+            LinkedIdentifiersAPI("KEY").traverse([1], depth=0)
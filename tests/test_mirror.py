@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+
+import requests_mock
+
+from osdatahub import OpenDataDownload
+from osdatahub.DownloadsAPI import ContentStore
+
+CONTENT = bytes(range(256)) * 40
+MD5 = hashlib.md5(CONTENT).hexdigest()
+LISTING = "https://api.os.uk/downloads/v1/products/OpenRoads/downloads"
+URL = "https://api.os.uk/downloads/v1/products/OpenRoads/downloads?fileName=roads.zip"
+
+
+def test_add_and_materialise(tmp_path):
+    # Arrange
+    store = ContentStore(tmp_path / "store")
+    (tmp_path / "a.zip").write_bytes(CONTENT)
+
+    # Act
+    added = store.add(tmp_path / "a.zip", MD5, len(CONTENT))
+    materialised = store.materialise(MD5, len(CONTENT), tmp_path / "b.zip")
+
+    # Assert
+    assert added and materialised
+    assert store.has(MD5, len(CONTENT))
+    assert (tmp_path / "b.zip").read_bytes() == CONTENT
+    assert store.object_path(MD5, len(CONTENT)).name == f"{MD5}-{len(CONTENT)}"
+
+
+def test_add_checksum_mismatch(tmp_path):
+    store = ContentStore(tmp_path / "store")
+    (tmp_path / "a.zip").write_bytes(CONTENT)
+    assert not store.add(tmp_path / "a.zip", "0" * 32, len(CONTENT))
+    assert not store.has("0" * 32, len(CONTENT))
+    assert not store.materialise("0" * 32, len(CONTENT), tmp_path / "b.zip")
+
+
+def test_copied_without_links(tmp_path, monkeypatch):
+    # Arrange
+    def no_links(source, destination):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr(os, "link", no_links)
+    store = ContentStore(tmp_path / "store")
+    (tmp_path / "a.zip").write_bytes(CONTENT)
+
+    # Act
+    store.add(tmp_path / "a.zip", MD5, len(CONTENT))
+    store.materialise(MD5, len(CONTENT), tmp_path / "b.zip")
+
+    # Assert
+    assert (tmp_path / "b.zip").read_bytes() == CONTENT
+
+
+def test_download_mirror(tmp_path):
+    # Arrange
+    store = ContentStore(tmp_path / "store")
+
+    # Act
+    with requests_mock.Mocker() as m:
+        m.get(LISTING, json=[{"url": URL, "fileName": "roads.zip", "size": len(CONTENT), "md5": MD5}])
+        m.get(URL, content=CONTENT, headers={"Content-Length": str(len(CONTENT))})
+        OpenDataDownload("OpenRoads").download(tmp_path / "project_a", mirror=store)
+        OpenDataDownload("OpenRoads").download(tmp_path / "project_b", mirror=store)
+
+    # Assert
+    assert [request.url for request in m.request_history].count(URL) == 1
+    assert (tmp_path / "project_b" / "roads.zip").read_bytes() == CONTENT
+    manifest = json.loads((tmp_path / "project_b" / ".osdatahub_manifest.json").read_text())
+    assert manifest["files"]["roads.zip"] == {"size": len(CONTENT), "md5": MD5}
@@ -1,8 +1,11 @@
+import json
 import unittest.mock as mock
 from os import environ
 
 import pytest
 from osdatahub.NamesAPI.names_api import NamesAPI
+from osdatahub.NamesAPI.typeahead import NamesTypeahead
+from osdatahub.utils import addresses_to_geojson
 
 from tests.data import names_data as data
 
@@ -21,8 +24,7 @@ class TestFind:
                        expected_url, expected_params):
         names.find(text, limit=limit, bounds=bounds, bbox_filter=bbox_filter, local_type=local_type)
         request_mocked.assert_called_with(expected_url,
-                                          params=expected_params,
-                                          proxies={})
+                                          params=expected_params)
 
     @pytest.mark.parametrize(*data.test_find_fail())
     @pytest.mark.usefixtures("names")
@@ -66,8 +68,7 @@ class TestNearest:
     def test_nearest_pass(self, request_mocked, names, point, radius, local_type, expected_url, expected_params):
         names.nearest(point=point, radius=radius, local_type=local_type)
         request_mocked.assert_called_with(expected_url,
-                                          params=expected_params,
-                                          proxies={})
+                                          params=expected_params)
 
     @pytest.mark.parametrize(*data.test_nearest_fail())
     @pytest.mark.usefixtures("names")
@@ -95,3 +96,103 @@ class TestFormatFq:
         # Act
         with pytest.raises(expected_result):
             fq_args = names._NamesAPI__format_fq(bbox_filter=bbox, local_type=local_type)
+
+
+class TestTypeahead:
+    @staticmethod
+    def entry(entry_id, name, local_type="City", name2=None):
+        entry = {"ID": entry_id, "NAME1": name, "LOCAL_TYPE": local_type, "GEOMETRY_X": 1.0, "GEOMETRY_Y": 2.0}
+        if name2:
+            entry["NAME2"] = name2
+        return entry
+
+    @pytest.fixture()
+    def names_api(self):
+        names_api = mock.Mock()
+        names_api.find.return_value = addresses_to_geojson(
+            [self.entry("1", "Southampton"), self.entry("2", "South Shields", "Town"),
+             self.entry("3", "Cardiff", name2="Caerdydd")], "EPSG:27700")
+        yield names_api
+
+    def test_search_miss_then_hit(self, names_api, tmp_path):
+        # Arrange
+        typeahead = NamesTypeahead(names_api, path=tmp_path / "index.json")
+
+        # Act
+        first = typeahead.search("south")
+        second = typeahead.search("SOUTH ")
+
+        # Assert
+        assert names_api.find.call_count == 1
+        assert [f["properties"]["NAME1"] for f in first["features"]] == ["South Shields", "Southampton"]
+        assert second == first
+
+    def test_search_persisted(self, names_api, tmp_path):
+        # Arrange
+        with NamesTypeahead(names_api, path=tmp_path / "index.json") as typeahead:
+            typeahead.search("cae")
+
+        # Act
+        typeahead = NamesTypeahead(names_api, path=tmp_path / "index.json")
+        results = typeahead.search("caer")
+
+        # Assert
+        assert len(typeahead) == 3
+        assert names_api.find.call_count == 1
+        assert [f["properties"]["ID"] for f in results["features"]] == ["3"]
+
+    def test_saves_batched(self, names_api, tmp_path):
+        # Arrange
+        names_api.find.return_value = addresses_to_geojson([], "EPSG:27700")
+        path = tmp_path / "index.json"
+
+        # Act
+        with mock.patch.object(NamesTypeahead, "SAVE_EVERY", 2), NamesTypeahead(names_api, path=path) as typeahead:
+            typeahead.search("a")
+            saved_after_one = path.exists()
+            typeahead.search("b")
+            saved_after_two = path.exists()
+            typeahead.search("c")
+        saved = json.loads(path.read_text())
+
+        # Assert
+        assert not saved_after_one
+        assert saved_after_two
+        assert sorted(prefix for prefix, _ in saved["queried"]) == ["a", "b", "c"]
+
+    def test_lookup_local_type(self, names_api):
+        # Arrange
+        typeahead = NamesTypeahead()
+        typeahead.add(names_api.find.return_value)
+
+        # Assert
+        assert [e["ID"] for e in typeahead.lookup("south", local_type="town")] == ["2"]
+        assert [e["ID"] for e in typeahead.lookup("s", limit=1)] == ["2"]
+        with pytest.raises(ValueError):
+            typeahead.lookup("south", local_type="not_a_type")
+
+    def test_add_renamed_entry(self):
+        # Arrange
+        typeahead = NamesTypeahead()
+        typeahead.add([self.entry("a", "Oldtown"), self.entry("b", "Newbury")])
+
+        # Act
+        typeahead.add([self.entry("a", "Newtown")])
+
+        # Assert
+        assert len(typeahead) == 2
+        assert typeahead.lookup("old") == []
+        assert [e["NAME1"] for e in typeahead.lookup("new")] == ["Newbury", "Newtown"]
+
+    def test_search_no_results_not_repeated(self, names_api):
+        # Arrange
+        names_api.find.return_value = addresses_to_geojson([], "EPSG:27700")
+        typeahead = NamesTypeahead(names_api)
+
+        # Act
+        typeahead.search("zzz")
+        results = typeahead.search("zzz")
+
+        # Assert
+        assert results["features"] == []
+        assert names_api.find.call_count == 1
@@ -38,8 +38,7 @@ class TestNGDQuery:
 
         request_mocked.assert_called_with(expected_url,
                                           headers=expected_headers,
-                                          params={"limit": 100, "offset": 0},
-                                          proxies={})
+                                          params={"limit": 100, "offset": 0})
 
     @pytest.mark.parametrize(*query_data.test_ngd_query())
     @mock.patch('osdatahub.get')
@@ -60,8 +59,7 @@ class TestNGDQuery:
                   )
         request_mocked.assert_called_with(expected_url,
                                           params=expected_params,
-                                          headers={"key": "API-KEY"},
-                                          proxies={})
+                                          headers={"key": "API-KEY"})
 
     @pytest.mark.parametrize(*query_data.test_ngd_query_fail())
     def test_ngd_api_call_fail(self, extent, crs, start_datetime, end_datetime, cql_filter, filter_crs,
@@ -120,8 +118,7 @@ class TestNGDGetCollections:
         request_mocked.return_value.configure_mock(json=lambda: {})
         NGD.get_collections()
 
-        request_mocked.assert_called_with("https://api.os.uk/features/ngd/ofa/v1/collections",
-                                          proxies={})
+        request_mocked.assert_called_with("https://api.os.uk/features/ngd/ofa/v1/collections")
 
 
 class TestNGDQueryFeature:
@@ -135,8 +132,7 @@ class TestNGDQueryFeature:
 
         request_mocked.assert_called_with(expected_url,
                                           params=expected_params,
-                                          headers={"key": "api_key"},
-                                          proxies={})
+                                          headers={"key": "api_key"})
 
 
 class TestMergeGeojsons:
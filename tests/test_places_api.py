@@ -1,7 +1,11 @@
+import unittest.mock as mock
 from os import environ
 
 import pytest
+from osdatahub import Extent
+from osdatahub.address_table import AddressTable
 from osdatahub.PlacesAPI.places_api import PlacesAPI
+from shapely.geometry import MultiPolygon, Point, box, shape
 
 from tests.data import places_data as data
 
@@ -36,3 +40,171 @@ class TestFormatFq:
                 classification_code=classification_codes,
                 logical_status_code=logical_states,
             )
+
+
+class TestQueryTiles:
+    @staticmethod
+    def fake_post(url, headers, json, params):
+        polygon = shape(json)
+        addresses = [address for address in data.fake_addresses()
+                     if polygon.intersects(Point(address["X_COORDINATE"], address["Y_COORDINATE"]))]
+        page = addresses[params["offset"]:params["offset"] + params["maxresults"]]
+        response = mock.Mock()
+        response.json.return_value = {"header": {"totalresults": len(addresses)},
+                                      "results": [{"DPA": address} for address in page]}
+        return response
+
+    @pytest.mark.parametrize(*data.test_query_tiles())
+    @mock.patch('osdatahub.post')
+    def test_query_tiles(self, request_mocked, max_tile_results, limit, expected_length):
+        # Arrange
+        request_mocked.side_effect = self.fake_post
+        places = PlacesAPI("test")
+        extent = Extent.from_bbox((0, 0, 1000, 1000), "EPSG:27700")
+
+        # Act
+        results = places.query(extent, limit=limit, max_tile_results=max_tile_results, processes=2)
+
+        # Assert
+        uprns = [feature["properties"]["UPRN"] for feature in results["features"]]
+        assert len(uprns) == expected_length
+        assert len(set(uprns)) == expected_length
+
+    @pytest.mark.parametrize("max_tile_results", [None, 5])
+    @mock.patch('osdatahub.post')
+    def test_query_multipolygon(self, request_mocked, max_tile_results):
+        # Arrange
+        request_mocked.side_effect = self.fake_post
+        polygon = MultiPolygon([box(0, 0, 400, 1000), box(600, 0, 1000, 1000)])
+        extent = Extent(polygon, "EPSG:27700")
+        expected = {address["UPRN"] for address in data.fake_addresses()
+                    if polygon.intersects(Point(address["X_COORDINATE"], address["Y_COORDINATE"]))}
+
+        # Act
+        results = PlacesAPI("test").query(extent, limit=1000, max_tile_results=max_tile_results, processes=2)
+
+        # Assert
+        uprns = [feature["properties"]["UPRN"] for feature in results["features"]]
+        assert sorted(uprns) == sorted(expected)
+        assert all(shape(kwargs["json"]).geom_type == "Polygon" for _, kwargs in request_mocked.call_args_list)
+
+    @staticmethod
+    def fake_post_both_datasets(url, headers, json, params):
+        polygon = shape(json)
+        records = [record for address in data.fake_addresses()
+                   if polygon.intersects(Point(address["X_COORDINATE"], address["Y_COORDINATE"]))
+                   for record in ({"DPA": address}, {"LPI": {**address, "LPI_KEY": address["UPRN"] + "L"}})]
+        response = mock.Mock()
+        response.json.return_value = {"header": {"totalresults": len(records)},
+                                      "results": records[params["offset"]:params["offset"] + params["maxresults"]]}
+        return response
+
+    @pytest.mark.parametrize("max_tile_results", [None, 20, 1])
+    @mock.patch('osdatahub.post')
+    def test_query_tiles_limit_merged(self, request_mocked, max_tile_results):
+        # Arrange
+        request_mocked.side_effect = self.fake_post_both_datasets
+        extent = Extent.from_bbox((0, 0, 1000, 1000), "EPSG:27700")
+
+        # Act
+        results = PlacesAPI("test").query(extent, limit=30, dataset=["LPI", "DPA"], merge_datasets=True,
+                                          max_tile_results=max_tile_results, processes=2)
+
+        # Assert
+        properties = [feature["properties"] for feature in results["features"]]
+        assert len(properties) == 15
+        assert all(p["DPA"] is not None and p["LPI"] is not None for p in properties)
+
+    @pytest.mark.parametrize("max_tile_results", [None, 20])
+    @mock.patch('osdatahub.post')
+    def test_query_table_filled_as_results_arrive(self, request_mocked, max_tile_results):
+        # Arrange
+        request_mocked.side_effect = self.fake_post
+        extent = Extent.from_bbox((0, 0, 1000, 1000), "EPSG:27700")
+        expected = PlacesAPI("test").query(extent, limit=1000, max_tile_results=max_tile_results, processes=2)
+        batches = []
+        extend = AddressTable.extend
+
+        def record_extend(table, addresses):
+            batches.append(len(addresses))
+            extend(table, addresses)
+
+        # Act
+        with mock.patch.object(AddressTable, "extend", record_extend):
+            table = PlacesAPI("test").query(extent, limit=1000, max_tile_results=max_tile_results, processes=2,
+                                            output_as_table=True)
+
+        # Assert
+        assert table.to_geojson() == expected
+        assert sum(batches) == 51
+        assert max(batches) <= (max_tile_results or 100)
+
+    @mock.patch('osdatahub.post')
+    def test_query_tiles_stops_at_limit(self, request_mocked):
+        # Arrange
+        request_mocked.side_effect = self.fake_post
+        polygon = MultiPolygon([box(10 * i - 2, 890, 10 * i + 2, 910) for i in range(41, 51)])
+
+        # Act
+        results = PlacesAPI("test").query(Extent(polygon, "EPSG:27700"), limit=3, processes=2)
+
+        # Assert
+        queried = {shape(kwargs["json"]).wkt for _, kwargs in request_mocked.call_args_list}
+        assert len(results["features"]) == 3
+        assert len(queried) <= 4
+        assert all(kwargs["params"]["maxresults"] <= 3 for _, kwargs in request_mocked.call_args_list)
+
+    def test_query_tiles_invalid(self):
+        with pytest.raises(ValueError):
+            PlacesAPI("test").query(Extent.from_bbox((0, 0, 1, 1), "EPSG:27700"), max_tile_results=0)
+
+
+class TestOutputAsTable:
+    @mock.patch('osdatahub.get')
+    def test_find_table_filled_per_page(self, request_mocked):
+        # Arrange
+        addresses = [{"UPRN": str(i), "X_COORDINATE": float(i), "Y_COORDINATE": float(i)} for i in range(150)]
+        request_mocked.side_effect = lambda url, params: mock.Mock(**{"json.return_value": {
+            "results": [{"DPA": a} for a in addresses[params["offset"]:params["offset"] + params["maxresults"]]]}})
+        batches = []
+        extend = AddressTable.extend
+
+        def record_extend(table, page):
+            batches.append(len(page))
+            extend(table, page)
+
+        # Act
+        with mock.patch.object(AddressTable, "extend", record_extend):
+            table = PlacesAPI("test").find("HIGH STREET", limit=1000, output_as_table=True)
+
+        # Assert
+        assert batches == [100, 50, 0]
+        assert table["UPRN"] == [a["UPRN"] for a in addresses]
+
+
+class TestMergeDatasets:
+    @pytest.mark.parametrize(*data.test_merge_datasets())
+    @mock.patch('osdatahub.get')
+    def test_merge_datasets(self, request_mocked, pages, expected_result):
+        # Arrange
+        responses = iter([mock.Mock(**{"json.return_value": {"results": page}}) for page in pages]
+                         + [mock.Mock(**{"json.return_value": {}})])
+        offsets = []
+
+        def fake_get(url, params):
+            offsets.append(params["offset"])
+            return next(responses)
+
+        request_mocked.side_effect = fake_get
+        places = PlacesAPI("test")
+
+        # Act
+        results = places.find("HIGH STREET", dataset=["LPI", "DPA"], merge_datasets=True)
+
+        # Assert
+        assert [feature["properties"] for feature in results["features"]] == expected_result
+        assert offsets == [0] + [sum(len(page) for page in pages[:i + 1]) for i in range(len(pages))]
+
+    def test_merge_datasets_invalid(self):
+        with pytest.raises(ValueError):
+            PlacesAPI("test").find("HIGH STREET", dataset="DPA", merge_datasets=True)
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from osdatahub.rate_limiter import ThreadedRateLimiter
+
+
+def test_delay_between_requests():
+    # Arrange
+    limiter = ThreadedRateLimiter(max_concurrent=4, request_delay=0.1)
+    starts = []
+
+    def request():
+        with limiter:
+            starts.append(time.monotonic())
+
+    # Act
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    starts.sort()
+    assert all(later - earlier >= 0.09 for earlier, later in zip(starts, starts[1:]))
+
+
+def test_waiting_does_not_hold_lock():
+    # Arrange
+    limiter = ThreadedRateLimiter(max_concurrent=2, request_delay=0)
+    limiter.pause(0.5)
+    waiting = threading.Thread(target=lambda: limiter.__enter__())
+    waiting.start()
+    time.sleep(0.05)
+
+    # Act
+    start = time.monotonic()
+    limiter.pause(0)
+    elapsed = time.monotonic() - start
+    waiting.join()
+
+    # Assert
+    assert elapsed < 0.2
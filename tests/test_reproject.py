@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from geojson import Feature, FeatureCollection, Point
+from shapely.geometry import LineString
+from shapely.geometry import Point as ShapelyPoint
+
+from osdatahub import reproject
+from osdatahub.reproject import get_transformer, transform, transform_features, transform_geometry
+
+ENGINES = ["builtin", pytest.param("pyproj", marks=pytest.mark.skipif(reproject._pyproj() is None,
+                                                                      reason="pyproj is not installed"))]
+# Trafalgar Square and Edinburgh Castle
+LONS, LATS = [-0.1281, -3.2009], [51.5080, 55.9486]
+
+
+def test_projection_worked_example():
+    # the worked example from the Ordnance Survey's guide to coordinate systems in Great Britain
+    lat, lon = np.radians(52 + 39 / 60 + 27.2531 / 3600), np.radians(1 + 43 / 60 + 4.5177 / 3600)
+    easting, northing = reproject._project(lon, lat)
+    assert easting == pytest.approx(651409.903, abs=1e-3)
+    assert northing == pytest.approx(313177.270, abs=1e-3)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_wgs84_to_bng(engine):
+    eastings, northings = transform(LONS, LATS, "EPSG:4326", "EPSG:27700", engine=engine)
+    # grid references TQ 300 804 and NT 251 734
+    np.testing.assert_allclose(eastings, [530000, 325100], atol=100)
+    np.testing.assert_allclose(northings, [180400, 673400], atol=100)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("crs", ["EPSG:27700", "EPSG:3857", "CRS84"])
+def test_round_trip(engine, crs):
+    x, y = transform(LONS, LATS, "EPSG:4326", crs, engine=engine)
+    lons, lats = transform(x, y, crs, "epsg:4326", engine=engine)
+    np.testing.assert_allclose(lons, LONS, atol=1e-6)
+    np.testing.assert_allclose(lats, LATS, atol=1e-6)
+
+
+def test_web_mercator():
+    x, y = transform(180, 0, "EPSG:4326", "EPSG:3857", engine="builtin")
+    assert x == pytest.approx(20037508.342789244)
+    assert y == pytest.approx(0, abs=1e-6)
+
+
+def test_transformer_cached():
+    assert get_transformer("EPSG:4326", "EPSG:27700") is get_transformer("EPSG:4326", "EPSG:27700")
+
+
+def test_unsupported_crs():
+    with pytest.raises(ValueError):
+        transform(0, 0, "EPSG:4326", "EPSG:2157")
+
+
+def test_transform_geometry_keeps_heights():
+    # Arrange
+    geometries = np.array([ShapelyPoint(-0.1281, 51.5080, 12.5), LineString(zip(LONS, LATS))])
+
+    # Act
+    transformed = transform_geometry(geometries, "EPSG:4326", "EPSG:27700", engine="builtin")
+
+    # Assert
+    assert transformed[0].z == 12.5
+    assert transformed[0].x == pytest.approx(530000, abs=100)
+    assert len(transformed[1].coords) == 2
+
+
+def test_transform_features():
+    # Arrange
+    features = FeatureCollection([Feature(geometry=Point((LONS[0], LATS[0])), properties={"name": "a"}),
+                                  Feature(geometry=None, properties={"name": "b"})], crs="EPSG:4326")
+
+    # Act
+    transformed = transform_features(features, "EPSG:27700", engine="builtin")
+
+    # Assert
+    assert transformed["crs"] == "EPSG:27700"
+    assert transformed["features"][0]["geometry"]["coordinates"][0] == pytest.approx(530000, abs=100)
+    assert transformed["features"][1]["geometry"] is None
+    assert features["features"][0]["geometry"]["coordinates"] == [LONS[0], LATS[0]]
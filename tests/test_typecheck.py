@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import unittest.mock as mock
+
+import pytest
+from typeguard import TypeCheckError
+
+import osdatahub
+from osdatahub.NamesAPI.names_api import NamesAPI
+from osdatahub.PlacesAPI.places_api import PlacesAPI
+from osdatahub.typecheck import typecheck_enabled
+
+
+@pytest.fixture()
+def typecheck_off():
+    osdatahub.configure(typecheck=False)
+    yield
+    osdatahub.configure(typecheck=True)
+
+
+def empty_response(*args, **kwargs):
+    return mock.Mock(**{"json.return_value": {"header": {"totalresults": 0}, "results": []}})
+
+
+@mock.patch("osdatahub.get", side_effect=empty_response)
+def test_typecheck_on(request_mocked):
+    assert typecheck_enabled()
+    with pytest.raises(TypeCheckError):
+        PlacesAPI("test").find("HIGH STREET", output_crs=27700)
+
+
+@pytest.mark.usefixtures("typecheck_off")
+@mock.patch("osdatahub.get", side_effect=empty_response)
+def test_typecheck_off(request_mocked):
+    # Act
+    results = PlacesAPI("test").find("HIGH STREET", output_crs=27700)
+
+    # Assert
+    assert not typecheck_enabled()
+    assert results["features"] == []
+
+
+@pytest.mark.usefixtures("typecheck_off")
+@pytest.mark.parametrize("call", [
+    lambda: PlacesAPI("test").find(123),
+    lambda: PlacesAPI("test").postcode("SO16 0AS", limit="100"),
+    lambda: PlacesAPI("test").query((0, 0, 1, 1)),
+    lambda: NamesAPI("test").nearest([437293, 115515]),
+])
+def test_explicit_validation(call):
+    with pytest.raises(TypeError):
+        call()
+
+
+def test_switch_replaces_methods():
+    # Arrange
+    checked = vars(PlacesAPI)["find"]
+
+    # Act
+    osdatahub.configure(typecheck=False)
+    unchecked = vars(PlacesAPI)["find"]
+    unchecked_fq = vars(PlacesAPI)["_PlacesAPI__format_fq"]
+    osdatahub.configure(typecheck=True)
+
+    # Assert
+    assert unchecked is not checked
+    assert vars(PlacesAPI)["find"] is checked
+    assert isinstance(unchecked_fq, staticmethod)
+
+
+def test_environment_variable():
+    # Act
+    code = ("import sys\nfrom osdatahub import PlacesAPI\nfrom osdatahub.typecheck import typecheck_enabled\n"
+            "print(typecheck_enabled(), 'typeguard' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            env={**os.environ, "OSDATAHUB_TYPECHECK": "0"})
+
+    # Assert
+    assert result.stdout.split() == ["False", "False"]